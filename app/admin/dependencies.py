@@ -0,0 +1,23 @@
+import hmac
+from typing import Optional
+
+from fastapi import Header
+
+from app.admin.exceptions import AdminDisabled, AdminAccessDenied
+from app.core.dependencies import get_settings
+
+
+def is_admin_token(token: Optional[str]) -> bool:
+    admin_token = get_settings().ADMIN_TOKEN
+    if admin_token is None or not token:
+        return False
+
+    return hmac.compare_digest(token.encode("utf-8"), admin_token.get_secret_value().encode("utf-8"))
+
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    if get_settings().ADMIN_TOKEN is None:
+        raise AdminDisabled()
+
+    if not is_admin_token(x_admin_token):
+        raise AdminAccessDenied()
@@ -0,0 +1,16 @@
+from app.core.base_exception import AppError
+
+
+class AdminDisabled(AppError):
+    status_code = 404
+    detail = "Not Found"
+
+
+class AdminAccessDenied(AppError):
+    status_code = 403
+    detail = "Admin token is missing or invalid"
+
+
+class ProfileNotFound(AppError):
+    status_code = 404
+    detail = "Profile not found (expired or recorded by another worker)"
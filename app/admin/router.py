@@ -0,0 +1,86 @@
+from typing import List
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.admin.dependencies import require_admin
+from app.admin.exceptions import ProfileNotFound
+from app.core import profiling
+from app.core.admission import admission_exempt
+from app.db import slow_query
+from app.schemas import ApiResponse
+
+
+admin_router = APIRouter(prefix="/admin", tags=['admin'], dependencies=[Depends(require_admin)])
+
+
+@admin_router.get(path="/slow-queries", response_model=ApiResponse[List[dict]], status_code=200)
+@admission_exempt
+async def slow_queries() -> ApiResponse[List[dict]]:
+    """
+        Latest slow queries, newest first (ring buffer of this worker).
+
+        Headers:
+        - X-Admin-Token: must match ADMIN_TOKEN.
+
+        Returns:
+        - 200: Statement, parameters, duration, calling repository method and the
+          EXPLAIN (ANALYZE, BUFFERS) plan when it was sampled.
+
+        Errors:
+        - 403: Admin token is missing or invalid.
+        - 404: Admin endpoints are disabled (ADMIN_TOKEN is not set).
+    """
+    recorder = slow_query.recorder
+    entries: List[dict] = recorder.snapshot() if recorder is not None else []
+
+    return ApiResponse(data=entries)
+
+
+@admin_router.get(path="/profiles", response_model=ApiResponse[List[str]], status_code=200)
+@admission_exempt
+async def list_profiles() -> ApiResponse[List[str]]:
+    """
+        Ids of the profiles kept by this worker, newest first.
+
+        Headers:
+        - X-Admin-Token: must match ADMIN_TOKEN.
+
+        Returns:
+        - 200: Profile ids (the X-Profile-Id values of profiled requests).
+
+        Errors:
+        - 403: Admin token is missing or invalid.
+        - 404: Admin endpoints are disabled (ADMIN_TOKEN is not set).
+    """
+    store = profiling.store
+    ids: List[str] = store.ids() if store is not None else []
+
+    return ApiResponse(data=ids)
+
+
+@admin_router.get(path="/profiles/{profile_id}", response_class=PlainTextResponse, status_code=200)
+@admission_exempt
+async def read_profile(profile_id: str) -> PlainTextResponse:
+    """
+        pstats report of one profiled request.
+
+        Args:
+        - profile_id: Value of the X-Profile-Id response header.
+
+        Headers:
+        - X-Admin-Token: must match ADMIN_TOKEN.
+
+        Returns:
+        - 200: Plain-text report sorted by cumulative and by own time.
+
+        Errors:
+        - 403: Admin token is missing or invalid.
+        - 404: Admin endpoints are disabled, or the profile expired / belongs to another worker.
+    """
+    store = profiling.store
+    report = store.get(profile_id) if store is not None else None
+    if report is None:
+        raise ProfileNotFound()
+
+    return PlainTextResponse(report)
@@ -0,0 +1,74 @@
+"""
+    bcrypt cost calibration: times hash_secret on this host for a range of costs and suggests
+    the highest BCRYPT_ROUNDS whose median hash time stays within the target.
+
+    Run it on the production hardware (inside the container, with its CPU quota), since the
+    result is only as good as the host it was measured on. Each +1 doubles the time.
+
+    Run: python -m app.auth.calibrate [--target-ms 250] [--min-rounds 10] [--max-rounds 15] [--runs 5]
+"""
+import argparse
+import statistics
+import time
+from typing import Dict, List, Optional
+
+import bcrypt
+
+SAMPLE_PASSWORD = b"calibration-password"
+
+
+def measure(rounds: int, runs: int) -> float:
+    """Median wall time of one hash at `rounds`, in milliseconds."""
+    timings: List[float] = []
+    for _ in range(runs):
+        started: float = time.perf_counter()
+        bcrypt.hashpw(SAMPLE_PASSWORD, bcrypt.gensalt(rounds=rounds))
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(target_ms: float, min_rounds: int, max_rounds: int, runs: int) -> Dict[int, float]:
+    results: Dict[int, float] = {}
+    for rounds in range(min_rounds, max_rounds + 1):
+        results[rounds] = measure(rounds=rounds, runs=runs)
+        # Costs above this one only get slower; no point waiting for them.
+        if results[rounds] > target_ms * 2:
+            break
+    return results
+
+
+def recommend(results: Dict[int, float], target_ms: float) -> Optional[int]:
+    within: List[int] = [rounds for rounds, ms in results.items() if ms <= target_ms]
+    return max(within) if within else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target-ms", type=float, default=250.0, help="hash time budget per signin")
+    parser.add_argument("--min-rounds", type=int, default=10)
+    parser.add_argument("--max-rounds", type=int, default=15)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    results: Dict[int, float] = calibrate(
+        target_ms=args.target_ms,
+        min_rounds=args.min_rounds,
+        max_rounds=args.max_rounds,
+        runs=args.runs,
+    )
+
+    print(f"{'rounds':>6}  {'median ms':>10}")
+    for rounds, ms in results.items():
+        print(f"{rounds:>6}  {ms:>10.1f}")
+
+    rounds: Optional[int] = recommend(results=results, target_ms=args.target_ms)
+    if rounds is None:
+        print(f"\nno cost >= {args.min_rounds} fits {args.target_ms:.0f} ms; lower --min-rounds or raise the target")
+        return
+
+    print(f"\nBCRYPT_ROUNDS={rounds}  (median {results[rounds]:.1f} ms per hash, target {args.target_ms:.0f} ms)")
+    print("existing users are rehashed to the new cost on their next signin")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from fastapi import Depends, Cookie
 from sqlalchemy.ext.asyncio.session import AsyncSession
@@ -23,9 +23,11 @@ def get_refresh_token_from_cookie(refresh_token: Optional[str] = Cookie(default=
     return refresh_token
 
 
-def get_current_user_id(token: str = Depends(get_access_token_from_cookie)) -> int:
-    payload = JwtService().verify_access_token(token=token)
+def get_access_token_payload(token: str = Depends(get_access_token_from_cookie)) -> Dict[str, Any]:
+    return JwtService().verify_access_token(token=token)
 
+
+def get_current_user_id(payload: Dict[str, Any] = Depends(get_access_token_payload)) -> int:
     try:
         sub = int(payload.get("sub"))
     except (TypeError, ValueError):
@@ -36,6 +38,15 @@ def get_current_user_id(token: str = Depends(get_access_token_from_cookie)) -> i
     return sub
 
 
+def get_current_session_id(payload: Dict[str, Any] = Depends(get_access_token_payload)) -> int:
+    try:
+        sid = int(payload.get("sid"))
+    except (TypeError, ValueError):
+        raise InvalidToken(token_type='access')
+
+    return sid
+
+
 async def get_current_user(
         session: AsyncSession = Depends(get_db),
         user_id: int = Depends(get_current_user_id)
@@ -1,10 +1,14 @@
-from fastapi import Response, APIRouter, Depends
+from fastapi import Response, APIRouter, BackgroundTasks, Depends
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
 from app.auth.services import RegistrationService, AuthenticationService, JwtService
 
-from app.auth.dependencies import get_current_user, get_refresh_token_from_cookie
+from app.auth.dependencies import get_current_user, get_current_session_id, get_refresh_token_from_cookie
 from app.auth.schemas import UserCredentialsSchema, AuthTokensDTO, TokenDTO
+from app.core.admission import concurrency_limit
+from app.core.deadline import time_budget
+from app.core.query_budget import query_budget
+from app.core.rate_limit import Rate, body_email, rate_limit
 from app.db.session import get_db
 from app.db.models import User
 from app.schemas import ApiResponse
@@ -12,8 +16,24 @@ from app.schemas import ApiResponse
 
 auth_router = APIRouter(prefix="/auth", tags=['auth'])
 
+# bcrypt runs on the event loop; admit only a few hashing requests per worker at a time.
+AUTH_CONCURRENCY = 4
 
-@auth_router.post(path="/signup", response_model=ApiResponse[str], status_code=201)
+# Each signup/signin costs a bcrypt; over-limit requests are rejected before it.
+SIGNUP_PER_IP = Rate(limit=10, period=3600)
+SIGNIN_PER_IP = Rate(limit=30, period=60)
+SIGNIN_PER_EMAIL = Rate(limit=5, period=60)
+
+
+@auth_router.post(
+    path="/signup",
+    response_model=ApiResponse[str],
+    status_code=201,
+    dependencies=[Depends(rate_limit("signup:ip", SIGNUP_PER_IP))],
+)
+@query_budget(1)
+@concurrency_limit(AUTH_CONCURRENCY)
+@time_budget(3.0)
 async def signup(
         data: UserCredentialsSchema,
         session: AsyncSession = Depends(get_db)
@@ -31,16 +51,29 @@ async def signup(
         Errors:
         - 400: Validation error (e.g., weak password, invalid email format).
         - 409: The user already exists.
+        - 429: Too many signups from this IP (Retry-After).
     """
     await RegistrationService(session=session).register_user(data=data)
 
     return ApiResponse(data='User successfully registered')
 
 
-@auth_router.post(path="/signin", response_model=ApiResponse[str], status_code=200)
+@auth_router.post(
+    path="/signin",
+    response_model=ApiResponse[str],
+    status_code=200,
+    dependencies=[
+        Depends(rate_limit("signin:ip", SIGNIN_PER_IP)),
+        Depends(rate_limit("signin:email", SIGNIN_PER_EMAIL, key=body_email)),
+    ],
+)
+@query_budget(4)
+@concurrency_limit(AUTH_CONCURRENCY)
+@time_budget(3.0)
 async def signin(
         response: Response,
         data: UserCredentialsSchema,
+        background_tasks: BackgroundTasks,
         session: AsyncSession = Depends(get_db),
 ) -> ApiResponse[str]:
     """
@@ -48,6 +81,7 @@ async def signin(
 
         Args:
         - data: User credentials (email, password).
+        - background_tasks: Runs the password rehash after the response when the bcrypt cost changed.
         - session: Async database session.
 
         Returns:
@@ -56,8 +90,12 @@ async def signin(
         Errors:
         - 400: Validation error (e.g., weak password, invalid email format).
         - 401: User does not exist or invalid email or password.
+        - 429: Too many signins from this IP or for this email (Retry-After).
     """
-    tokens: AuthTokensDTO = await AuthenticationService(session=session).authenticate_user(data=data)
+    tokens: AuthTokensDTO = await AuthenticationService(session=session).authenticate_user(
+        data=data,
+        background_tasks=background_tasks
+    )
     refresh_token: TokenDTO = tokens.refresh_token
     access_token: TokenDTO = tokens.access_token
 
@@ -84,6 +122,9 @@ async def signin(
 
 
 @auth_router.post(path="/refresh", response_model=ApiResponse[str], status_code=200)
+@query_budget(1)
+@concurrency_limit(AUTH_CONCURRENCY)
+@time_budget(2.0)
 async def change_token(
         response: Response,
         refresh_token: str = Depends(get_refresh_token_from_cookie),
@@ -118,16 +159,20 @@ async def change_token(
 
 
 @auth_router.post(path="/logout", response_model=ApiResponse[str], status_code=200)
+@query_budget(2)
+@time_budget(2.0)
 async def logout(
         response: Response,
         user: User = Depends(get_current_user),
+        session_id: int = Depends(get_current_session_id),
         session: AsyncSession = Depends(get_db)
 ) -> ApiResponse[str]:
     """
-        Logout.
+        Logout from the current device; the user's other sessions stay active.
 
         Args:
         - user: User data from the database.
+        - session_id: Session id (sid) from the access token.
         - session: Async database session.
 
         Returns:
@@ -136,9 +181,38 @@ async def logout(
         Errors:
         - 401: User does not exist or missing ... token.
     """
-    await AuthenticationService(session=session).logout_user(user=user)
+    await AuthenticationService(session=session).logout_user(user=user, session_id=session_id)
+
+    response.delete_cookie(key="rt", path="/auth/refresh", samesite="lax")
+    response.delete_cookie(key="at", path="/", samesite="lax")
+
+    return ApiResponse(data='OK')
+
+
+@auth_router.post(path="/logout-all", response_model=ApiResponse[str], status_code=200)
+@query_budget(2)
+@time_budget(2.0)
+async def logout_all(
+        response: Response,
+        user: User = Depends(get_current_user),
+        session: AsyncSession = Depends(get_db)
+) -> ApiResponse[str]:
+    """
+        Logout from every device.
+
+        Args:
+        - user: User data from the database.
+        - session: Async database session.
+
+        Returns:
+        - 200: OK. (all refresh tokens of the user are revoked).
+
+        Errors:
+        - 401: User does not exist or missing ... token.
+    """
+    await AuthenticationService(session=session).logout_user_everywhere(user=user)
 
     response.delete_cookie(key="rt", path="/auth/refresh", samesite="lax")
     response.delete_cookie(key="at", path="/", samesite="lax")
 
-    return ApiResponse(data='OK')
\ No newline at end of file
+    return ApiResponse(data='OK')
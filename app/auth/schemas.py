@@ -17,6 +17,7 @@ class UserSessionSchema(BaseModel):
 
 class TokenSubjectDTO(BaseModel):
     sub: str
+    sid: str
 
 
 class TokenDTO(BaseModel):
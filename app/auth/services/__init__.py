@@ -1,3 +1,4 @@
 from .authentication import AuthenticationService
 from .registration import RegistrationService
-from .jwt_service import JwtService
\ No newline at end of file
+from .jwt_service import JwtService
+from .session_cleanup import SessionCleanupService
\ No newline at end of file
@@ -1,20 +1,29 @@
+import asyncio
+import logging
 from typing import Optional
 
+from fastapi import BackgroundTasks
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
 from app.auth.exceptions import UserDoesNotExist, InvalidCredentials
 from app.auth.schemas import UserCredentialsSchema, UserSessionSchema, AuthTokensDTO, TokenDTO, TokenSubjectDTO
+from app.config import Settings
 from app.core.base_service import BaseService
+from app.core.dependencies import get_settings
 from app.db.models import User, UserSession
 from app.repositories import AuthenticationRepository
-from app.auth.utils import verify_secret, hash_token
+from app.auth.utils import verify_secret, hash_token, hash_secret, needs_rehash
 from app.auth.services.jwt_service import JwtService
+from app.db.session import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
 
 
 class AuthenticationService(BaseService):
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session)
         self.user_repo = AuthenticationRepository(self.session)
+        self.settings: Settings = get_settings()
 
     async def _verified_credentials(
             self,
@@ -32,14 +41,8 @@ class AuthenticationService(BaseService):
         ):
             raise InvalidCredentials()
 
-    async def _revoke_session(self, user: User) -> None:
-        active_session: UserSession = await self.user_repo.read_active_session_by_user_id(user_id=user.id)
-
-        if active_session:
-            await self.user_repo.revoke_session(user_session=active_session)
-
-    async def _create_tokens(self, user: User) -> AuthTokensDTO:
-        token_subject = TokenSubjectDTO(sub=str(user.id))
+    async def _create_tokens(self, user: User, user_session: UserSession) -> AuthTokensDTO:
+        token_subject = TokenSubjectDTO(sub=str(user.id), sid=str(user_session.id))
 
         jwt_service = JwtService()
         access_token: TokenDTO = await jwt_service.create_access_token(data=token_subject)
@@ -50,13 +53,28 @@ class AuthenticationService(BaseService):
             refresh_token=refresh_token
         )
 
-    async def authenticate_user(self, data: UserCredentialsSchema) -> AuthTokensDTO:
+    async def authenticate_user(
+            self,
+            data: UserCredentialsSchema,
+            background_tasks: BackgroundTasks
+    ) -> AuthTokensDTO:
         user: Optional[User] = await self.user_repo.read_user_for_email(email=data.email) # noqa
 
         await self._verified_credentials(user=user, password=data.password)
-        await self._revoke_session(user=user)
 
-        tokens: AuthTokensDTO = await self._create_tokens(user=user)
+        if needs_rehash(hashed_value=user.password, rounds=self.settings.BCRYPT_ROUNDS):
+            # Runs after the response is sent; the plaintext is only available at signin.
+            background_tasks.add_task(
+                rehash_password,
+                user_id=user.id,  # noqa
+                current_password=user.password,
+                password=data.password,
+                rounds=self.settings.BCRYPT_ROUNDS,
+            )
+
+        # Every signin is a new device session; the oldest ones beyond the cap are revoked.
+        user_session: UserSession = await self.user_repo.open_user_session(user_id=user.id)  # noqa
+        tokens: AuthTokensDTO = await self._create_tokens(user=user, user_session=user_session)
 
         _hash_token: bytes = hash_token(token=tokens.refresh_token.token)
         new_token_data: UserSessionSchema = UserSessionSchema(
@@ -65,11 +83,42 @@ class AuthenticationService(BaseService):
             expires_at=tokens.refresh_token.expires_at
         )
 
-        await self.user_repo.create_user_session(data=new_token_data)
+        await self.user_repo.activate_user_session(
+            user_session=user_session,
+            data=new_token_data,
+            max_sessions=self.settings.MAX_SESSIONS_PER_USER
+        )
 
         return tokens
 
-    async def logout_user(self, user: User):
-        user_session: Optional[UserSession] = await self.user_repo.read_active_session_by_user_id(user_id=user.id)
-        if user_session:
-            await self.user_repo.revoke_session(user_session=user_session)
+    async def logout_user(self, user: User, session_id: int) -> None:
+        await self.user_repo.revoke_sessions(user_id=user.id, session_id=session_id)
+
+    async def logout_user_everywhere(self, user: User) -> int:
+        return await self.user_repo.revoke_sessions(user_id=user.id)
+
+
+async def rehash_password(user_id: int, current_password: bytes, password: str, rounds: int) -> None:
+    """
+        Re-hashes a just-verified password at the configured BCRYPT_ROUNDS, in a worker thread
+        so the event loop keeps serving, and stores it unless the password changed meanwhile.
+    """
+    try:
+        new_password: bytes = await asyncio.to_thread(hash_secret, password, rounds)
+
+        async with AsyncSessionLocal() as session:
+            replaced: bool = await AuthenticationRepository(session=session).replace_password(
+                user_id=user_id,
+                current_password=current_password,
+                password=new_password
+            )
+    except asyncio.CancelledError:
+        # Not an Exception: would otherwise vanish without a trace (e.g. on shutdown).
+        logger.warning("password rehash cancelled for user %s", user_id)
+        raise
+    except Exception:
+        logger.exception("password rehash failed for user %s", user_id)
+        return
+
+    if replaced:
+        logger.info("rehashed password of user %s to bcrypt cost %s", user_id, rounds)
@@ -1,5 +1,5 @@
 from datetime import datetime, timezone, timedelta
-from typing import Literal, Dict, Any, Optional
+from typing import Literal, Dict, Any, Optional, Tuple
 
 from jose import jwt, ExpiredSignatureError, JWTError
 from sqlalchemy.ext.asyncio.session import AsyncSession
@@ -8,6 +8,8 @@ from app.auth.exceptions import InvalidToken, NotAuthenticated
 from app.auth.schemas import TokenDTO, TokenSubjectDTO
 from app.config import Settings
 from app.core.dependencies import get_settings
+from app.core.metrics import CRYPTO_SECONDS
+from app.core.timing import timed
 from app.db.models import UserSession
 from app.repositories import AuthenticationRepository
 
@@ -25,11 +27,12 @@ class JwtService:
             payload: Dict[str, str | datetime]
     ) -> str:
 
-        token: str = jwt.encode(
-            claims=payload,
-            key=secret_key,
-            algorithm=jwt_algorithm
-        )
+        with timed("auth"), CRYPTO_SECONDS.time("jwt_encode"):
+            token: str = jwt.encode(
+                claims=payload,
+                key=secret_key,
+                algorithm=jwt_algorithm
+            )
 
         return token
 
@@ -44,6 +47,7 @@ class JwtService:
 
         payload: Dict[str, str | datetime] = {
             'sub': data.sub,
+            'sid': data.sid,
             'type': token_type,
             'exp': exp
         }
@@ -73,6 +77,7 @@ class JwtService:
 
         payload: Dict[str, str | datetime] = {
             'sub': data.sub,
+            'sid': data.sid,
             'type': token_type,
             'exp': exp
         }
@@ -94,7 +99,9 @@ class JwtService:
 
     async def refresh_access_token(self, token: str, session: AsyncSession) -> TokenDTO:
         verify_token: Dict[str, Any] = await self.verify_refresh_token(token=token, session=session)
-        access_token: TokenDTO = await self.create_access_token(data=TokenSubjectDTO(sub=verify_token['sub']))
+        access_token: TokenDTO = await self.create_access_token(
+            data=TokenSubjectDTO(sub=verify_token['sub'], sid=verify_token['sid'])
+        )
 
         return access_token
 
@@ -107,11 +114,12 @@ class JwtService:
         try:
              secret_key: str = self.settings.jwt_access_key if token_type == 'access' else self.settings.jwt_refresh_key
 
-             payload: Dict[str, Any] = jwt.decode(
-                token,
-                secret_key,
-                algorithms=self.settings.JWT_ALGORITHM,
-            )
+             with timed("auth"), CRYPTO_SECONDS.time("jwt_decode"):
+                 payload: Dict[str, Any] = jwt.decode(
+                    token,
+                    secret_key,
+                    algorithms=self.settings.JWT_ALGORITHM,
+                 )
         except (ExpiredSignatureError, JWTError):
             raise InvalidToken(token_type=token_type)
 
@@ -120,16 +128,27 @@ class JwtService:
 
         return payload
 
+    @staticmethod
+    def _token_ids(payload: Dict[str, Any], token_type: TokenType) -> Tuple[int, int]:
+        """(user id, session id) from the `sub` and `sid` claims."""
+        try:
+            user_id: int = int(payload["sub"])
+            session_id: int = int(payload["sid"])
+        except (KeyError, TypeError, ValueError):
+            raise InvalidToken(token_type=token_type)
+
+        return user_id, session_id
+
     async def verify_refresh_token(self, token: str, session: AsyncSession) -> Dict[str, Any]:
         payload: Dict[str, Any] = self._verify_token(
             token=token,
             token_type='refresh'
         )
-        user_id: int = int(payload["sub"])
+        user_id, session_id = self._token_ids(payload=payload, token_type='refresh')
 
         active_session: Optional[UserSession] = await AuthenticationRepository(
             session=session
-        ).read_active_session_by_user_id(user_id=user_id)
+        ).read_active_session(session_id=session_id, user_id=user_id)
 
         if not active_session:
             raise NotAuthenticated()
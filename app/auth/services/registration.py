@@ -20,7 +20,6 @@ class RegistrationService(BaseService):
 
         try:
             await self.user_repo.create_user(
-                session=self.session,
                 email=email,
                 password=hashed_password
             )
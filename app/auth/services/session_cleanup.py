@@ -0,0 +1,35 @@
+import logging
+
+from sqlalchemy.ext.asyncio.session import AsyncSession
+
+from app.core.base_service import BaseService
+from app.db.session import AsyncSessionLocal
+from app.repositories import AuthenticationRepository
+
+logger = logging.getLogger(__name__)
+
+
+class SessionCleanupService(BaseService):
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session)
+        self.user_repo = AuthenticationRepository(self.session)
+
+    async def delete_stale_batch(self, batch_size: int) -> int:
+        return await self.user_repo.delete_stale_sessions(batch_size=batch_size)
+
+
+def session_cleanup_step(batch_size: int, throttle: float, interval: float):
+    """
+        BackgroundWorker step: delete one batch of revoked/expired sessions. A full batch means
+        more are waiting, so come back after `throttle`; otherwise idle for `interval`.
+    """
+    async def step() -> float:
+        async with AsyncSessionLocal() as session:
+            deleted: int = await SessionCleanupService(session=session).delete_stale_batch(batch_size=batch_size)
+
+        if deleted:
+            logger.info("deleted %s stale user sessions", deleted)
+
+        return throttle if deleted >= batch_size else interval
+
+    return step
@@ -1,8 +1,12 @@
-from typing import Union
+from typing import Optional, Union
 
 import bcrypt
 import hashlib
 
+from app.core.dependencies import get_settings
+from app.core.metrics import CRYPTO_SECONDS
+from app.core.timing import timed
+
 
 BytesLike = Union[str, bytes]
 
@@ -11,14 +15,26 @@ def _to_bytes(value: BytesLike) -> bytes:
     return value.encode("utf-8") if isinstance(value, str) else value
 
 
-def hash_secret(value: BytesLike) -> bytes:
+def hash_secret(value: BytesLike, rounds: Optional[int] = None) -> bytes:
     raw: bytes = _to_bytes(value)
-    return bcrypt.hashpw(raw, bcrypt.gensalt())
+    salt: bytes = bcrypt.gensalt(rounds=rounds or get_settings().BCRYPT_ROUNDS)
+    with timed("auth"), CRYPTO_SECONDS.time("bcrypt_hash"):
+        return bcrypt.hashpw(raw, salt)
 
 
 def verify_secret(hashed_value: bytes, value: BytesLike) -> bool:
     raw: bytes = _to_bytes(value)
-    return bcrypt.checkpw(raw, hashed_value)
+    with timed("auth"), CRYPTO_SECONDS.time("bcrypt_verify"):
+        return bcrypt.checkpw(raw, hashed_value)
+
+
+def bcrypt_rounds(hashed_value: bytes) -> int:
+    """Cost factor of a bcrypt hash: b"$2b$12$..." -> 12."""
+    return int(hashed_value[4:6])
+
+
+def needs_rehash(hashed_value: bytes, rounds: Optional[int] = None) -> bool:
+    return bcrypt_rounds(hashed_value) != (rounds or get_settings().BCRYPT_ROUNDS)
 
 
 def hash_token(token: str) -> bytes:
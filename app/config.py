@@ -1,3 +1,5 @@
+from typing import Literal, Optional
+
 from pydantic import SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -8,11 +10,85 @@ class Settings(BaseSettings):
     DB_USER: str
     DB_PASSWORD: str
     DB_NAME: str
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 5.0
+    DB_CONNECTION_BUDGET: Optional[int] = None
+    # Full SQLAlchemy URL; overrides the DB_* parts (e.g. the test suite's SQLite database).
+    DATABASE_URL: Optional[str] = None
+
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    WEB_CONCURRENCY: Optional[int] = None
+    FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+    GRACEFUL_TIMEOUT: int = 30
+    WARMUP_ENABLED: bool = True
+    WARMUP_CONNECTIONS: int = 2
+
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_MAX_IN_FLIGHT: Optional[int] = None
+    ADMISSION_MAX_POOL_WAITERS: Optional[int] = None
+    ADMISSION_QUEUE_TIMEOUT: float = 0.5
+    ADMISSION_RETRY_AFTER: int = 1
+
+    DEADLINES_ENABLED: bool = True
+    REQUEST_TIME_BUDGET: float = 10.0
+    DB_LOCK_TIMEOUT_MS: int = 2000
+
+    BCRYPT_ROUNDS: int = 12
+    MAX_SESSIONS_PER_USER: int = 5
+
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_MAX_KEYS: int = 100_000
+
+    IDEMPOTENCY_TTL: float = 86400.0
+    IDEMPOTENCY_LOCK_TIMEOUT: float = 10.0
+    IDEMPOTENCY_CLEANUP_ENABLED: bool = True
+    IDEMPOTENCY_CLEANUP_INTERVAL: float = 600.0
+    IDEMPOTENCY_CLEANUP_BATCH_SIZE: int = 500
+    IDEMPOTENCY_CLEANUP_THROTTLE: float = 0.2
+
+    OUTBOX_ENABLED: bool = True
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_INTERVAL: float = 1.0
+    OUTBOX_MAX_ATTEMPTS: int = 10
+    OUTBOX_BACKOFF_BASE: float = 1.0
+    OUTBOX_BACKOFF_MAX: float = 300.0
+
+    POST_VIEWS_ENABLED: bool = True
+    POST_VIEWS_FLUSH_INTERVAL: float = 5.0
+
+    SESSION_CLEANUP_ENABLED: bool = True
+    SESSION_CLEANUP_INTERVAL: float = 300.0
+    SESSION_CLEANUP_BATCH_SIZE: int = 500
+    SESSION_CLEANUP_THROTTLE: float = 0.2
 
     JWT_ACCESS_SECRET_KEY: SecretStr
     JWT_REFRESH_SECRET_KEY: SecretStr
     JWT_ALGORITHM: str
 
+    LOG_LEVEL: str = "INFO"
+    SERVER_TIMING_ENABLED: bool = False
+    METRICS_ENABLED: bool = True
+    # Set by app.server: workers share their metrics through this directory.
+    METRICS_MULTIPROC_DIR: Optional[str] = None
+    METRICS_SNAPSHOT_INTERVAL: float = 1.0
+    QUERY_BUDGET_MODE: Literal["off", "warn", "strict"] = "off"
+    QUERY_DUPLICATE_THRESHOLD: int = 2
+
+    SLOW_QUERY_LOG_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.0
+    SLOW_QUERY_BUFFER_SIZE: int = 100
+    SLOW_QUERY_LOG_PARAMETERS: bool = False
+
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_BUFFER_SIZE: int = 20
+
+    ADMIN_TOKEN: Optional[SecretStr] = None
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_prefix="",
@@ -20,6 +96,8 @@ class Settings(BaseSettings):
 
     @property
     def database_url(self):
+        if self.DATABASE_URL:
+            return self.DATABASE_URL
         return (
             f"postgresql+asyncpg://{self.DB_USER}:"
             f"{self.DB_PASSWORD}@"
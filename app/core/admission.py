@@ -0,0 +1,165 @@
+import asyncio
+import logging
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.routing import BaseRoute, Router
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.asgi import send_app_error
+from app.core.base_exception import ServiceOverloaded
+from app.core.metrics import REGISTRY, CallbackMetric, Counter
+from app.core.routing import resolve_route
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+REQUESTS_SHED: Counter = REGISTRY.register(Counter(
+    "http_requests_shed_total", "Requests rejected with 503 by admission control.", ("route", "reason"),
+))
+
+
+def concurrency_limit(max_in_flight: int) -> Callable[[F], F]:
+    """Cap concurrent requests of one route (per worker), on top of the global in-flight limit."""
+    def decorator(endpoint: F) -> F:
+        endpoint.__concurrency_limit__ = max_in_flight
+        return endpoint
+
+    return decorator
+
+
+def admission_exempt(endpoint: F) -> F:
+    """Cheap routes (health, metrics) that must answer even when the worker is saturated."""
+    endpoint.__admission_exempt__ = True
+    return endpoint
+
+
+class _Gate:
+    """Semaphore that knows how many requests are inside and how many are queued."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.in_flight: int = 0
+        self.waiting: int = 0
+        self._semaphore = asyncio.Semaphore(limit)
+
+    async def acquire(self, timeout: float) -> bool:
+        if self.waiting >= self.limit:
+            return False
+
+        self.waiting += 1
+        acquired: bool = False
+        try:
+            # asyncio.timeout, not wait_for: no inner task that can win the permit after the
+            # timeout fired and keep it.
+            async with asyncio.timeout(timeout):
+                acquired = await self._semaphore.acquire()
+        except BaseException as exc:
+            # Granted just as the timeout or a cancellation hit: give the permit back.
+            if acquired:
+                self._semaphore.release()
+            if isinstance(exc, TimeoutError):
+                return False
+            raise
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._semaphore.release()
+
+
+class AdmissionMiddleware:
+    """
+        Sheds load before routing, dependencies and pool checkout, answering 503 with
+        Retry-After instead of letting requests sit in the pool queue until DB_POOL_TIMEOUT.
+
+        A request is rejected when more requests already wait for a pool connection than
+        `max_pool_waiters`, or when it cannot enter the global gate and its route gate
+        (@concurrency_limit) within `queue_timeout` seconds. Routes marked
+        @admission_exempt and unmatched paths bypass all checks.
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            router: Router,
+            engine: AsyncEngine,
+            max_in_flight: int,
+            max_pool_waiters: int,
+            queue_timeout: float,
+            retry_after: int,
+    ) -> None:
+        self.app = app
+        self.router = router
+        self.engine = engine
+        self.max_pool_waiters = max_pool_waiters
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.global_gate = _Gate(limit=max_in_flight)
+        self.route_gates: Dict[str, _Gate] = {}
+
+        REGISTRY.register(CallbackMetric(
+            "http_requests_admitted", "Requests inside (in_flight) or queued at (waiting) the global gate.",
+            lambda: iter((
+                (("in_flight",), self.global_gate.in_flight),
+                (("waiting",), self.global_gate.waiting),
+            )),
+            ("state",),
+        ))
+
+    def _route_gate(self, route: BaseRoute) -> Optional[_Gate]:
+        limit: Optional[int] = getattr(getattr(route, "endpoint", None), "__concurrency_limit__", None)
+        if limit is None:
+            return None
+
+        path: str = getattr(route, "path", "")
+        gate: Optional[_Gate] = self.route_gates.get(path)
+        if gate is None:
+            gate = self.route_gates[path] = _Gate(limit=limit)
+        return gate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route: Optional[BaseRoute] = resolve_route(self.router.routes, scope)
+        if route is None or getattr(getattr(route, "endpoint", None), "__admission_exempt__", False):
+            await self.app(scope, receive, send)
+            return
+
+        if self.engine.sync_engine.pool.waiters >= self.max_pool_waiters:
+            await self._shed(scope, route, send, reason="pool")
+            return
+
+        if not await self.global_gate.acquire(timeout=self.queue_timeout):
+            await self._shed(scope, route, send, reason="in_flight")
+            return
+
+        route_gate: Optional[_Gate] = self._route_gate(route)
+        try:
+            if route_gate is not None and not await route_gate.acquire(timeout=self.queue_timeout):
+                await self._shed(scope, route, send, reason="route")
+                return
+
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                if route_gate is not None:
+                    route_gate.release()
+        finally:
+            self.global_gate.release()
+
+    async def _shed(self, scope: Scope, route: BaseRoute, send: Send, reason: str) -> None:
+        path: str = getattr(route, "path", "unmatched")
+        # Lets MetricsMiddleware label the 503 with the route the router never reached.
+        scope["route"] = route
+        REQUESTS_SHED.inc(path, reason)
+        logger.warning("shed %s %s (%s)", scope["method"], path, reason)
+
+        await send_app_error(send, ServiceOverloaded(headers={"Retry-After": str(self.retry_after)}))
@@ -0,0 +1,31 @@
+import json
+from typing import List, Tuple
+
+from starlette.types import Send
+
+from app.core.base_exception import AppError
+
+
+async def send_app_error(send: Send, exc: AppError) -> None:
+    """
+        Render an AppError from pure ASGI middleware, which runs outside FastAPI's exception
+        handlers; same body shape as app_error_handler.
+    """
+    body: bytes = json.dumps({
+        "status": "error",
+        "error": {
+            "detail": exc.detail,
+        },
+    }).encode("utf-8")
+
+    headers: List[Tuple[bytes, bytes]] = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode("latin-1")),
+    ]
+    headers.extend(
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in (exc.headers or {}).items()
+    )
+
+    await send({"type": "http.response.start", "status": exc.status_code, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
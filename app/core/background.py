@@ -0,0 +1,45 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Returns how many seconds to sleep before the next call.
+Step = Callable[[], Awaitable[float]]
+
+
+class BackgroundWorker:
+    """
+        Runs `step` in a loop on the worker's event loop for the app's lifetime (started and
+        stopped by the lifespan). A failing step is logged and retried after `error_delay`.
+    """
+
+    def __init__(self, name: str, step: Step, error_delay: float = 30.0) -> None:
+        self.name = name
+        self.step = step
+        self.error_delay = error_delay
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run(), name=self.name)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                delay: float = await self.step()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("background worker %s failed", self.name)
+                delay = self.error_delay
+
+            await asyncio.sleep(delay)
@@ -1,11 +1,19 @@
+from typing import Dict
+
 from fastapi import HTTPException
 
 class AppError(HTTPException):
     status_code: int = 400
     detail: str = "Application error"
 
-    def __init__(self, detail: str | None = None):
+    def __init__(self, detail: str | None = None, headers: Dict[str, str] | None = None):
         super().__init__(
             status_code=self.status_code,
             detail=detail or self.detail,
-        )
\ No newline at end of file
+            headers=headers,
+        )
+
+
+class ServiceOverloaded(AppError):
+    status_code = 503
+    detail = "Service is overloaded, retry later"
\ No newline at end of file
@@ -0,0 +1,229 @@
+import asyncio
+import logging
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Callable, Optional, TypeVar
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session, SessionTransaction
+from starlette.routing import Router
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.asgi import send_app_error
+from app.core.base_exception import AppError
+from app.core.routing import resolve_route
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+QUERY_CANCELED = "57014"
+LOCK_NOT_AVAILABLE = "55P03"
+
+# Gives the server-side statement_timeout (routes with their own lock timeout) the first
+# chance to fire, so a slow query surfaces as QueryTimeout rather than as a cancelled request.
+CANCEL_GRACE_SECONDS = 0.25
+
+SET_TIMEOUTS = text(
+    "SELECT set_config('statement_timeout', :statement_timeout, true), "
+    "set_config('lock_timeout', :lock_timeout, true)"
+)
+
+
+class QueryTimeout(AppError):
+    status_code = 504
+    detail = "Request exceeded its time budget"
+
+
+class LockTimeout(AppError):
+    status_code = 503
+    detail = "Resource is busy, retry later"
+
+
+@dataclass(slots=True)
+class Deadline:
+    expires_at: float
+    lock_timeout_ms: int
+
+    def remaining_ms(self) -> int:
+        return int((self.expires_at - monotonic()) * 1000)
+
+
+_current: ContextVar[Optional[Deadline]] = ContextVar("deadline", default=None)
+_connection_lock_timeout_ms: Optional[int] = None
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Deadline of the request being handled, None outside a time_budget."""
+    return _current.get()
+
+
+def time_budget(seconds: float, lock_timeout_ms: Optional[int] = None) -> Callable[[F], F]:
+    """
+        Wall-clock budget of a route, dependencies included, enforced by cancelling the request
+        (and its in-flight query). A route with its own lock_timeout_ms also gets SET LOCAL
+        statement_timeout = the time left and lock_timeout (capped by it) in every transaction:
+        one more query, counted by @query_budget.
+    """
+    def decorator(endpoint: F) -> F:
+        endpoint.__time_budget__ = seconds
+        endpoint.__lock_timeout_ms__ = lock_timeout_ms
+        return endpoint
+
+    return decorator
+
+
+def _set_transaction_timeouts(session: Session, transaction: SessionTransaction, connection: Connection) -> None:
+    deadline: Optional[Deadline] = _current.get()
+    if deadline is None:
+        return
+
+    remaining_ms: int = deadline.remaining_ms()
+    if remaining_ms <= 0:
+        raise QueryTimeout()
+
+    # statement_timeout / lock_timeout are PostgreSQL settings (the test suite may run on SQLite).
+    # The connection already has the default lock_timeout: skip the round trip unless the route differs.
+    if connection.dialect.name != "postgresql" or deadline.lock_timeout_ms == _connection_lock_timeout_ms:
+        return
+
+    connection.execute(
+        SET_TIMEOUTS,
+        {
+            "statement_timeout": str(remaining_ms),
+            "lock_timeout": str(min(deadline.lock_timeout_ms, remaining_ms)),
+        },
+    )
+
+
+def install_deadlines(engine: AsyncEngine, lock_timeout_ms: int) -> None:
+    """
+        Every new PostgreSQL connection starts with lock_timeout = `lock_timeout_ms` (the
+        DeadlineMiddleware default), so only routes with their own lock timeout pay for a
+        per-transaction SET.
+    """
+    global _connection_lock_timeout_ms
+
+    if engine.dialect.name == "postgresql":
+        _connection_lock_timeout_ms = lock_timeout_ms
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def _set_lock_timeout(dbapi_connection, connection_record) -> None:
+            dbapi_connection.run_async(lambda conn: conn.execute(f"SET lock_timeout = {int(lock_timeout_ms)}"))
+
+    event.listen(Session, "after_begin", _set_transaction_timeouts)
+
+
+def timeout_error(exc: DBAPIError) -> Optional[AppError]:
+    """QueryTimeout / LockTimeout for server-side cancellations, None for any other DB error."""
+    sqlstate: Optional[str] = getattr(exc.orig, "sqlstate", None)
+    if sqlstate == QUERY_CANCELED:
+        return QueryTimeout()
+    if sqlstate == LOCK_NOT_AVAILABLE:
+        return LockTimeout(headers={"Retry-After": "1"})
+    return None
+
+
+class DeadlineMiddleware:
+    """
+        Starts the route's time budget (@time_budget, else `default_seconds`) and runs the
+        request under it: the DB enforces it through per-transaction timeouts, and the request
+        task itself is cancelled, asyncpg query included, when the budget runs out or the
+        client disconnects before the response is sent. Once it is sent, BackgroundTasks run
+        to completion without a budget.
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            router: Router,
+            default_seconds: float,
+            default_lock_timeout_ms: int,
+    ) -> None:
+        self.app = app
+        self.router = router
+        self.default_seconds = default_seconds
+        self.default_lock_timeout_ms = default_lock_timeout_ms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route = resolve_route(self.router.routes, scope)
+        endpoint = getattr(route, "endpoint", None)
+        seconds: float = getattr(endpoint, "__time_budget__", None) or self.default_seconds
+        lock_timeout_ms: int = getattr(endpoint, "__lock_timeout_ms__", None) or self.default_lock_timeout_ms
+
+        token = _current.set(Deadline(expires_at=monotonic() + seconds, lock_timeout_ms=lock_timeout_ms))
+        try:
+            await self._run(scope, receive, send, seconds=seconds)
+        finally:
+            _current.reset(token)
+
+    async def _run(self, scope: Scope, receive: Receive, send: Send, seconds: float) -> None:
+        response_started: bool = False
+        response_sent = asyncio.Event()
+        messages: asyncio.Queue = asyncio.Queue()
+
+        async def receive_wrapper() -> Message:
+            message: Message = await messages.get()
+            if message["type"] == "http.disconnect":
+                messages.put_nowait(message)
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                # Set before sending: the server reports http.disconnect as soon as it has the last
+                # chunk. What runs after the response (BackgroundTasks) is not under the budget.
+                _current.set(None)
+                response_sent.set()
+            await send(message)
+
+        async def wait_for_disconnect() -> None:
+            # The only reader of the server's receive(); the app gets the same messages from the
+            # queue, so watching for a disconnect never takes a request message away from it.
+            while True:
+                message: Message = await receive()
+                messages.put_nowait(message)
+                if message["type"] == "http.disconnect":
+                    return
+
+        handler = asyncio.ensure_future(self.app(scope, receive_wrapper, send_wrapper))
+        disconnect = asyncio.ensure_future(wait_for_disconnect())
+        sent = asyncio.ensure_future(response_sent.wait())
+        try:
+            done, _ = await asyncio.wait(
+                {handler, disconnect, sent},
+                timeout=seconds + CANCEL_GRACE_SECONDS,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if handler not in done and response_sent.is_set():
+                # Served: let background tasks finish, however long they take.
+                await asyncio.wait({handler})
+                done = {handler}
+        finally:
+            disconnect.cancel()
+            sent.cancel()
+            if not handler.done():
+                handler.cancel()
+                await asyncio.gather(handler, return_exceptions=True)
+
+        if handler in done:
+            handler.result()
+            return
+
+        if disconnect in done:
+            logger.info("client disconnected, cancelled %s %s", scope["method"], scope["path"])
+            return
+
+        logger.warning("time budget of %.2f s exceeded, cancelled %s %s", seconds, scope["method"], scope["path"])
+        if not response_started:
+            await send_app_error(send, QueryTimeout())
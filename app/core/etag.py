@@ -0,0 +1,33 @@
+import hashlib
+from typing import Iterable, Optional, Tuple
+
+
+def make_post_etag(post_id: int, version: int, likes_count: int) -> str:
+    """`version` changes with edits, likes_count with likes: likes never write the post row."""
+    return f'W/"p{post_id}-v{version}-l{likes_count}"'
+
+
+def make_list_etag(versions: Iterable[Tuple[int, int, int]]) -> str:
+    """`versions`: (post_id, version, likes_count) of each post on the page, in page order."""
+    raw: str = ",".join(f"{post_id}:{version}:{likes_count}" for post_id, version, likes_count in versions)
+    digest: str = hashlib.blake2b(raw.encode("utf-8"), digest_size=12).hexdigest()
+    return f'W/"l{digest}"'
+
+
+def _opaque_tag(etag: str) -> str:
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+        Weak comparison of an If-None-Match header against the current ETag (RFC 9110, 13.1.2).
+    """
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    current: str = _opaque_tag(etag)
+    return any(_opaque_tag(candidate) == current for candidate in if_none_match.split(","))
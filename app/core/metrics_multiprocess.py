@@ -0,0 +1,114 @@
+"""
+    /metrics for all workers of one `app.server` deployment.
+
+    Every worker keeps its own registry and writes a snapshot of it to METRICS_MULTIPROC_DIR
+    (every METRICS_SNAPSHOT_INTERVAL seconds and on each scrape). Whichever worker answers a
+    scrape of the shared port sums the snapshots of the workers that are alive, so the series
+    describe the deployment, not one process. A worker that exits takes its counters with it,
+    which Prometheus handles as a counter reset.
+"""
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.core.background import Step
+from app.core.metrics import REGISTRY, MetricFamily, Registry, render_families
+
+logger = logging.getLogger(__name__)
+
+
+def _alive(pid: int) -> bool:
+    if os.name == "nt":
+        # os.kill(pid, 0) would terminate the process on Windows.
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def merge_families(snapshots: List[List[MetricFamily]]) -> List[MetricFamily]:
+    """Sums samples with the same name and labels; counters, histogram buckets and gauges alike."""
+    headers: Dict[str, MetricFamily] = {}
+    values: Dict[str, Dict[str, float]] = {}
+
+    for families in snapshots:
+        for name, documentation, kind, samples in families:
+            headers.setdefault(name, (name, documentation, kind, []))
+            merged: Dict[str, float] = values.setdefault(name, {})
+            for line in samples:
+                series, _, value = line.rpartition(" ")
+                merged[series] = merged.get(series, 0.0) + float(value)
+
+    return [
+        (name, documentation, kind, [f"{series} {value}" for series, value in values[name].items()])
+        for name, documentation, kind, _ in headers.values()
+    ]
+
+
+class MultiprocessMetrics:
+    def __init__(self, directory: Path, registry: Registry = REGISTRY, pid: Optional[int] = None) -> None:
+        self.directory = directory
+        self.registry = registry
+        self.pid: int = pid if pid is not None else os.getpid()
+
+    @property
+    def path(self) -> Path:
+        return self.directory / f"{self.pid}.json"
+
+    def write(self) -> None:
+        # Written aside and renamed, so a reader never sees half a file.
+        tmp: Path = self.directory / f".{self.pid}.json.tmp"
+        tmp.write_text(json.dumps(self.registry.collect()))
+        os.replace(tmp, self.path)
+
+    def remove(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+    def render(self) -> str:
+        self.write()
+
+        snapshots: List[List[MetricFamily]] = []
+        for path in sorted(self.directory.glob("*.json")):
+            if not _alive(int(path.stem)):
+                path.unlink(missing_ok=True)
+                continue
+            try:
+                snapshots.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                # Removed by its worker's shutdown since the glob.
+                logger.debug("skipping metrics snapshot %s", path)
+
+        return render_families(merge_families(snapshots))
+
+
+_exporter: Optional[MultiprocessMetrics] = None
+
+
+def install_multiprocess_metrics(directory: Optional[str]) -> Optional[MultiprocessMetrics]:
+    """Turns on the shared export for this worker; None keeps /metrics per process."""
+    global _exporter
+    _exporter = MultiprocessMetrics(directory=Path(directory)) if directory else None
+    return _exporter
+
+
+def multiprocess_metrics() -> Optional[MultiprocessMetrics]:
+    return _exporter
+
+
+def render_metrics() -> str:
+    return _exporter.render() if _exporter is not None else REGISTRY.render()
+
+
+def metrics_snapshot_step(exporter: MultiprocessMetrics, interval: float) -> Step:
+    """BackgroundWorker step: keep this worker's snapshot fresh for scrapes other workers answer."""
+    async def step() -> float:
+        exporter.write()
+        return interval
+
+    return step
@@ -0,0 +1,123 @@
+import cProfile
+import io
+import logging
+import pstats
+import random
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.admin.dependencies import is_admin_token
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+STATS_LIMIT = 60
+
+
+class ProfileStore:
+    """Last N profiles of this worker, keyed by request id."""
+
+    def __init__(self, maxlen: int) -> None:
+        self.maxlen = maxlen
+        self._profiles: "OrderedDict[str, str]" = OrderedDict()
+
+    def add(self, request_id: str, report: str) -> None:
+        self._profiles[request_id] = report
+        self._profiles.move_to_end(request_id)
+        while len(self._profiles) > self.maxlen:
+            self._profiles.popitem(last=False)
+
+    def get(self, request_id: str) -> Optional[str]:
+        return self._profiles.get(request_id)
+
+    def ids(self) -> List[str]:
+        return list(reversed(self._profiles))
+
+
+store: Optional[ProfileStore] = None
+
+# cProfile hooks the whole thread, and only one profiler can be active at a time,
+# so each worker profiles at most one request concurrently; the rest run unprofiled.
+_slot = threading.Lock()
+
+
+def _render(profiler: cProfile.Profile, scope: Scope, status_code: int) -> str:
+    buffer = io.StringIO()
+    buffer.write(
+        f"{scope['method']} {scope['path']} -> {status_code} "
+        f"at {datetime.now(timezone.utc).isoformat()}\n"
+    )
+    stats = pstats.Stats(profiler, stream=buffer)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(STATS_LIMIT)
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(STATS_LIMIT)
+    return buffer.getvalue()
+
+
+class ProfilingMiddleware:
+    """
+        Runs cProfile around requests that send X-Profile with a valid X-Admin-Token,
+        or around a sampled fraction of all requests.
+
+        The pstats report (cumulative and own time) is kept in the profile store and
+        its id is returned in X-Profile-Id. The profiler sees everything the event loop
+        runs meanwhile, so profile under low concurrency for clean numbers.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float) -> None:
+        self.app = app
+        self.sample_rate = sample_rate
+
+    def _wants_profile(self, scope: Scope) -> bool:
+        headers = Headers(scope=scope)
+        if PROFILE_HEADER in headers and is_admin_token(headers.get("x-admin-token")):
+            return True
+        return random.random() < self.sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or store is None or not self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        if not _slot.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler or debugger hook already owns this thread.
+            _slot.release()
+            await self.app(scope, receive, send)
+            return
+
+        request_id: str = uuid.uuid4().hex
+        status_code: int = 500
+
+        async def send_with_profile_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append(PROFILE_ID_HEADER, request_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.disable()
+            _slot.release()
+            store.add(request_id, _render(profiler, scope, status_code))
+            logger.info("stored profile %s for %s %s", request_id, scope["method"], scope["path"])
+
+
+def install_profiling(buffer_size: int) -> ProfileStore:
+    global store
+    store = ProfileStore(maxlen=buffer_size)
+    return store
@@ -0,0 +1,23 @@
+"""
+    pytest fixtures for query-count assertions.
+
+    Enable with `pytest_plugins = ["app.core.pytest_plugin"]` in a conftest.py (tests/conftest.py does):
+
+        async def test_read_post(client, query_counter):
+            query_counter.clear()
+            await client.get("/post/1")
+            query_counter.assert_within_budget(read_post)
+            query_counter.assert_no_duplicates()
+"""
+from typing import Iterator
+
+import pytest
+
+from app.core.query_budget import QueryLog, capture_queries
+from app.db.session import engine
+
+
+@pytest.fixture
+def query_counter() -> Iterator[QueryLog]:
+    with capture_queries(engine) as log:
+        yield log
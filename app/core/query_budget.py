@@ -0,0 +1,170 @@
+import functools
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Literal, Optional, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.base_exception import AppError
+
+logger = logging.getLogger(__name__)
+
+BudgetMode = Literal["off", "warn", "strict"]
+
+# Execution option for bookkeeping statements (e.g. per-transaction timeouts) that budgets ignore.
+SKIP_QUERY_BUDGET = "skip_query_budget"
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+
+class QueryBudgetExceeded(AppError):
+    status_code = 500
+    detail = "Query budget exceeded"
+
+
+class QueryLog:
+    def __init__(self) -> None:
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def duplicates(self, threshold: int = 2) -> Dict[str, int]:
+        """Statements executed at least `threshold` times: the usual N+1 signature."""
+        return {
+            statement: times
+            for statement, times in Counter(self.statements).items()
+            if times >= threshold
+        }
+
+    def assert_count(self, expected: int) -> None:
+        assert self.count == expected, self._describe(f"expected {expected} queries, got {self.count}")
+
+    def assert_at_most(self, budget: int) -> None:
+        assert self.count <= budget, self._describe(f"expected at most {budget} queries, got {self.count}")
+
+    def assert_within_budget(self, endpoint: Callable[..., Any]) -> None:
+        budget: Optional[int] = getattr(endpoint, "__query_budget__", None)
+        assert budget is not None, f"{endpoint.__name__} has no @query_budget"
+        self.assert_at_most(budget)
+
+    def assert_no_duplicates(self, threshold: int = 2) -> None:
+        duplicates: Dict[str, int] = self.duplicates(threshold=threshold)
+        assert not duplicates, self._describe(f"duplicate statements: {duplicates}")
+
+    def clear(self) -> None:
+        self.statements.clear()
+
+    def _describe(self, message: str) -> str:
+        return message + "\n" + "\n".join(f"  {i + 1}. {s}" for i, s in enumerate(self.statements))
+
+
+_current: ContextVar[Optional[QueryLog]] = ContextVar("query_log", default=None)
+_mode: BudgetMode = "off"
+_duplicate_threshold: int = 2
+
+
+def _check(log: QueryLog, budget: Optional[int], name: str) -> None:
+    problems: List[str] = []
+
+    if budget is not None and log.count > budget:
+        problems.append(f"{log.count} queries, budget {budget}")
+
+    duplicates: Dict[str, int] = log.duplicates(threshold=_duplicate_threshold)
+    if duplicates:
+        problems.append(f"possible N+1, repeated statements: {duplicates}")
+
+    if not problems:
+        return
+
+    message: str = f"{name}: " + "; ".join(problems)
+    if _mode == "strict":
+        raise QueryBudgetExceeded(detail=message)
+    logger.warning(message)
+
+
+def query_budget(max_queries: int) -> Callable[[F], F]:
+    """
+        Declare how many SQL statements a route may run, dependencies included.
+
+        Checked when the endpoint returns, in the mode set by QUERY_BUDGET_MODE:
+        "warn" logs, "strict" fails the request with QueryBudgetExceeded, "off" is a no-op.
+    """
+    def decorator(endpoint: F) -> F:
+        @functools.wraps(endpoint)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            result: Any = await endpoint(*args, **kwargs)
+
+            log: Optional[QueryLog] = _current.get()
+            if log is not None:
+                _check(log=log, budget=max_queries, name=endpoint.__name__)
+
+            return result
+
+        wrapper.__query_budget__ = max_queries
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def _skipped(context) -> bool:
+    return context is not None and context.execution_options.get(SKIP_QUERY_BUDGET, False)
+
+
+def install_query_budget(engine: AsyncEngine, mode: BudgetMode, duplicate_threshold: int = 2) -> None:
+    global _mode, _duplicate_threshold
+    _mode = mode
+    _duplicate_threshold = duplicate_threshold
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _record_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+        log: Optional[QueryLog] = _current.get()
+        if log is not None and not _skipped(context):
+            log.statements.append(statement)
+
+
+class QueryBudgetMiddleware:
+    """Collects the statements of each request; routes without a budget are still checked for N+1."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        log = QueryLog()
+        token = _current.set(log)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current.reset(token)
+
+        endpoint = scope.get("endpoint")
+        if endpoint is not None and not hasattr(endpoint, "__query_budget__"):
+            try:
+                _check(log=log, budget=None, name=endpoint.__name__)
+            except QueryBudgetExceeded as exc:
+                # The response is already sent; surface it in the logs instead.
+                logger.error(exc.detail)
+
+
+@contextmanager
+def capture_queries(engine: AsyncEngine) -> Iterator[QueryLog]:
+    """Record every statement run on `engine` inside the block (tests, ad-hoc checks)."""
+    log = QueryLog()
+
+    def _record_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+        if not _skipped(context):
+            log.statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _record_statement)
+    try:
+        yield log
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", _record_statement)
@@ -0,0 +1,119 @@
+import json
+import math
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Callable, List, Optional
+
+from fastapi import Depends, Request
+
+from app.core.base_exception import AppError
+from app.core.metrics import REGISTRY, Counter
+
+RATE_LIMITED: Counter = REGISTRY.register(Counter(
+    "http_requests_rate_limited_total", "Requests rejected with 429 by a rate limit.", ("limit",),
+))
+
+
+class RateLimited(AppError):
+    status_code = 429
+    detail = "Too many requests, retry later"
+
+
+@dataclass(frozen=True, slots=True)
+class Rate:
+    """`limit` requests per `period` seconds, with bursts of up to `limit`."""
+    limit: int
+    period: float
+
+    @property
+    def per_second(self) -> float:
+        return self.limit / self.period
+
+
+class RateLimitBackend(ABC):
+    """
+        Token-bucket storage. The in-process backend limits each worker separately; a shared
+        store (e.g. Redis with an atomic script) implements the same `hit` to limit the fleet.
+    """
+
+    @abstractmethod
+    async def hit(self, key: str, rate: Rate) -> float:
+        """Takes one token from `key`'s bucket. Returns 0 if allowed, else seconds until a token is free."""
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+        Per-process buckets, least recently used first out once `max_keys` is reached (an
+        evicted key simply starts again with a full bucket). No awaits inside `hit`, so it is
+        atomic on the event loop without a lock.
+    """
+
+    def __init__(self, max_keys: int) -> None:
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, List[float]] = OrderedDict()
+
+    async def hit(self, key: str, rate: Rate) -> float:
+        now: float = monotonic()
+        bucket: Optional[List[float]] = self._buckets.get(key)
+
+        if bucket is None:
+            bucket = [float(rate.limit), now]
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(float(rate.limit), bucket[0] + (now - bucket[1]) * rate.per_second)
+            bucket[1] = now
+
+        if bucket[0] >= 1.0:
+            bucket[0] -= 1.0
+            return 0.0
+
+        return (1.0 - bucket[0]) / rate.per_second
+
+
+_backend: Optional[RateLimitBackend] = None
+
+
+def install_rate_limiting(backend: Optional[RateLimitBackend]) -> None:
+    """Sets the process-wide backend; None turns every rate_limit dependency into a no-op."""
+    global _backend
+    _backend = backend
+
+
+def client_ip(request: Request) -> Optional[str]:
+    # uvicorn has already applied X-Forwarded-For from FORWARDED_ALLOW_IPS proxies.
+    return request.client.host if request.client else None
+
+
+async def body_email(request: Request) -> Optional[str]:
+    """`email` of an already-parsed JSON body (FastAPI reads it before dependencies run)."""
+    try:
+        body: Any = await request.json()
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+
+    email: Any = body.get("email") if isinstance(body, dict) else None
+    return email.strip().lower() if isinstance(email, str) else None
+
+
+def rate_limit(name: str, rate: Rate, key: Callable[..., Any] = client_ip) -> Callable[..., Any]:
+    """
+        Route dependency: `dependencies=[Depends(rate_limit("signin:ip", Rate(10, 60)))]`.
+        `key` is itself a dependency giving the identity to limit (IP, user id, email); None
+        skips the check. Route-level dependencies run before the endpoint's own, so a
+        rejected request never reaches the DB session or bcrypt.
+    """
+    async def dependency(identity: Any = Depends(key)) -> None:
+        if _backend is None or identity is None:
+            return
+
+        retry_after: float = await _backend.hit(key=f"{name}:{identity}", rate=rate)
+        if retry_after > 0:
+            RATE_LIMITED.inc(name)
+            raise RateLimited(headers={"Retry-After": str(math.ceil(retry_after))})
+
+    return dependency
@@ -0,0 +1,16 @@
+from typing import Optional, Sequence
+
+from starlette.routing import BaseRoute, Match
+from starlette.types import Scope
+
+
+def resolve_route(routes: Sequence[BaseRoute], scope: Scope) -> Optional[BaseRoute]:
+    """
+        Route the router would dispatch `scope` to, for middleware that must decide before
+        routing (and before dependencies run). None for 404/405.
+    """
+    for route in routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route
+    return None
@@ -0,0 +1,45 @@
+from functools import lru_cache
+from typing import Any, Iterable, Mapping, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.core.timing import timed
+
+
+class PreEncodedJSONResponse(Response):
+    """
+        JSON response whose body is already rendered to bytes.
+
+        Returning it from a route skips FastAPI's response_model validation and the
+        stdlib JSON encoder; response_model stays on the route for the OpenAPI schema.
+    """
+    media_type = "application/json"
+
+
+@lru_cache(maxsize=None)
+def get_type_adapter(type_: Any) -> TypeAdapter:
+    return TypeAdapter(type_)
+
+
+def dump_json(type_: Any, value: Any) -> bytes:
+    with timed("serialize"):
+        return get_type_adapter(type_).dump_json(value)
+
+
+def json_response(
+        type_: Any,
+        value: Any,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+) -> PreEncodedJSONResponse:
+    return PreEncodedJSONResponse(
+        content=dump_json(type_=type_, value=value),
+        status_code=status_code,
+        headers=headers,
+    )
+
+
+def warm_type_adapters(types: Iterable[Any]) -> int:
+    """Builds the cached TypeAdapters up front so the first response doesn't pay for schema building."""
+    return len({get_type_adapter(type_) for type_ in types})
@@ -0,0 +1,105 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, Iterator, List, Tuple, TypeVar
+
+from sqlalchemy.exc import DBAPIError
+
+from app.core.deadline import LockTimeout, QueryTimeout, timeout_error
+from app.core.metrics import REGISTRY, CallbackMetric
+
+T = TypeVar("T")
+
+_instances: List["SingleFlight"] = []
+
+
+def _is_deadline_error(exc: BaseException) -> bool:
+    """The leader ran out of its own time budget (or lock wait), which says nothing about ours."""
+    if isinstance(exc, (TimeoutError, QueryTimeout, LockTimeout)):
+        return True
+    return isinstance(exc, DBAPIError) and timeout_error(exc) is not None
+
+
+class SingleFlight:
+    """
+        Per-key request coalescing within one worker.
+
+        The first caller for a key (the leader) runs the load; callers arriving while
+        it is in flight await the same result instead of repeating the work. Nothing
+        is cached: the key is forgotten as soon as the load finishes.
+
+        Followers share the leader's result and errors, except the leader's own deadline:
+        if it was cancelled or timed out, a follower loads again within its own budget.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.leaders: int = 0
+        self.coalesced: int = 0
+        _instances.append(self)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "in_flight": self.in_flight,
+        }
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        future = self._calls.get(key)
+
+        if future is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if future.cancelled():
+                    # The leader's request was cancelled, not ours: load it ourselves.
+                    return await self.do(key, fn)
+                raise
+            except Exception as exc:
+                if _is_deadline_error(exc):
+                    # Not coalesced again: our own deadline bounds this attempt.
+                    return await fn()
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.leaders += 1
+
+        try:
+            result: T = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Followers re-raise it; without any, don't log "exception was never retrieved".
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+
+def _single_flight_samples(counter: str) -> Callable[[], Iterator[Tuple[Tuple[str, ...], float]]]:
+    def samples() -> Iterator[Tuple[Tuple[str, ...], float]]:
+        for instance in _instances:
+            yield (instance.name,), getattr(instance, counter)
+    return samples
+
+
+REGISTRY.register(CallbackMetric(
+    "single_flight_leaders_total", "Loads actually executed by single-flight groups.",
+    _single_flight_samples("leaders"), ("name",), kind="counter",
+))
+REGISTRY.register(CallbackMetric(
+    "single_flight_coalesced_total", "Calls that joined an in-flight load instead of running their own.",
+    _single_flight_samples("coalesced"), ("name",), kind="counter",
+))
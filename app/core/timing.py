@@ -0,0 +1,129 @@
+import json
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Iterator, Literal, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+Phase = Literal["auth", "serialize"]
+
+
+@dataclass(slots=True)
+class RequestTimings:
+    started: float
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    pool_wait_seconds: float = 0.0
+    auth_seconds: float = 0.0
+    serialize_seconds: float = 0.0
+
+    def server_timing(self) -> str:
+        total_ms: float = (perf_counter() - self.started) * 1000
+        return ", ".join((
+            f'db;dur={self.db_seconds * 1000:.2f};desc="{self.db_queries} queries"',
+            f"pool;dur={self.pool_wait_seconds * 1000:.2f}",
+            f"auth;dur={self.auth_seconds * 1000:.2f}",
+            f"serialize;dur={self.serialize_seconds * 1000:.2f}",
+            f"total;dur={total_ms:.2f}",
+        ))
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+@contextmanager
+def timed(phase: Phase) -> Iterator[None]:
+    timings: Optional[RequestTimings] = _current.get()
+    if timings is None:
+        yield
+        return
+
+    started: float = perf_counter()
+    try:
+        yield
+    finally:
+        elapsed: float = perf_counter() - started
+        if phase == "auth":
+            timings.auth_seconds += elapsed
+        else:
+            timings.serialize_seconds += elapsed
+
+
+def record_pool_wait(seconds: float) -> None:
+    timings: Optional[RequestTimings] = _current.get()
+    if timings is not None:
+        timings.pool_wait_seconds += seconds
+
+
+def install_timing_hooks(engine: AsyncEngine) -> None:
+    sync_engine = engine.sync_engine
+
+    # The start time lives on the execution context, which is dropped with the statement:
+    # after_cursor_execute never runs for a failed one, so nothing may be left behind.
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        if context is not None:
+            context._timing_started = perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        started: Optional[float] = getattr(context, "_timing_started", None)
+        timings: Optional[RequestTimings] = _current.get()
+        if timings is not None and started is not None:
+            timings.db_queries += 1
+            timings.db_seconds += perf_counter() - started
+
+
+class ServerTimingMiddleware:
+    """
+        Per-request breakdown (DB, pool wait, auth, serialization) as a Server-Timing
+        header and one structured log line. Only installed when SERVER_TIMING_ENABLED.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings(started=perf_counter())
+        token = _current.set(timings)
+        status_code: int = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append("Server-Timing", timings.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            logger.info(json.dumps({
+                "event": "request_timing",
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status_code,
+                "total_ms": round((perf_counter() - timings.started) * 1000, 3),
+                "db_queries": timings.db_queries,
+                "db_ms": round(timings.db_seconds * 1000, 3),
+                "pool_wait_ms": round(timings.pool_wait_seconds * 1000, 3),
+                "auth_ms": round(timings.auth_seconds * 1000, 3),
+                "serialize_ms": round(timings.serialize_seconds * 1000, 3),
+            }))
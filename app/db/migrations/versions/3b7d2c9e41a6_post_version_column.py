@@ -0,0 +1,28 @@
+"""post version column
+
+Revision ID: 3b7d2c9e41a6
+Revises: fa3163ab7c97
+Create Date: 2026-10-19 10:12:04.118532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7d2c9e41a6'
+down_revision: Union[str, Sequence[str], None] = 'fa3163ab7c97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('post', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('post', 'version')
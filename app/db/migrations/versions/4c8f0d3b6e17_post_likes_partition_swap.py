@@ -0,0 +1,114 @@
+"""post likes partition swap
+
+Revision ID: 4c8f0d3b6e17
+Revises: e7a2c5d91b38
+Create Date: 2026-10-19 21:18:47.905116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c8f0d3b6e17'
+down_revision: Union[str, Sequence[str], None] = 'e7a2c5d91b38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Set on post_likes_new by `python -m app.likes.backfill` once it has verified the copy.
+BACKFILLED = 'backfilled'
+# Without the backfill the swap copies the likes itself, under the lock; only below this size.
+MAX_COPY_UNDER_LOCK = 100_000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+
+    # Fail fast instead of queueing every like request behind a long transaction.
+    op.execute("SET LOCAL lock_timeout = '5s'")
+    op.execute("LOCK TABLE post_likes, post_likes_new IN ACCESS EXCLUSIVE MODE")
+    op.execute("SET LOCAL lock_timeout = DEFAULT")
+
+    backfilled: bool = bind.execute(
+        sa.text("SELECT obj_description(CAST('post_likes_new' AS regclass), 'pg_class')")
+    ).scalar() == BACKFILLED
+    if not backfilled:
+        rows: float = bind.execute(
+            sa.text("SELECT reltuples FROM pg_class WHERE oid = CAST('post_likes' AS regclass)")
+        ).scalar()
+        if rows > MAX_COPY_UNDER_LOCK:
+            raise RuntimeError(
+                f"post_likes has ~{int(rows)} rows: run `python -m app.likes.backfill` "
+                f"before upgrading past e7a2c5d91b38"
+            )
+        op.execute(
+            """
+            INSERT INTO post_likes_new (post_id, user_id, created_at)
+            SELECT post_id, user_id, created_at FROM post_likes
+            ON CONFLICT DO NOTHING
+            """
+        )
+
+    op.execute("DROP TRIGGER post_likes_sync ON post_likes")
+    op.execute("DROP FUNCTION post_likes_sync()")
+    op.drop_table('post_likes')
+    op.rename_table('post_likes_new', 'post_likes')
+    op.execute("ALTER TABLE post_likes RENAME CONSTRAINT post_likes_new_pkey TO post_likes_pkey")
+    op.execute("COMMENT ON TABLE post_likes IS NULL")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Offline: rebuilds the unpartitioned table from the partitioned one, back to the state
+    # after e7a2c5d91b38 (shadow table kept in sync by triggers).
+    op.rename_table('post_likes', 'post_likes_new')
+    op.execute("ALTER TABLE post_likes_new RENAME CONSTRAINT post_likes_pkey TO post_likes_new_pkey")
+
+    op.create_table('post_likes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['post.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user_account.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('post_id', 'user_id')
+    )
+    op.execute(
+        """
+        INSERT INTO post_likes (post_id, user_id, created_at)
+        SELECT post_id, user_id, created_at FROM post_likes_new
+        ORDER BY created_at
+        """
+    )
+    op.create_index(op.f('ix_post_likes_post_id'), 'post_likes', ['post_id'], unique=False)
+    op.execute(f"COMMENT ON TABLE post_likes_new IS '{BACKFILLED}'")
+
+    op.execute(
+        """
+        CREATE FUNCTION post_likes_sync() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                DELETE FROM post_likes_new
+                WHERE post_id = OLD.post_id AND user_id = OLD.user_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO post_likes_new (post_id, user_id, created_at)
+                VALUES (NEW.post_id, NEW.user_id, NEW.created_at)
+                ON CONFLICT DO NOTHING;
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER post_likes_sync
+        AFTER INSERT OR UPDATE OR DELETE ON post_likes
+        FOR EACH ROW EXECUTE FUNCTION post_likes_sync()
+        """
+    )
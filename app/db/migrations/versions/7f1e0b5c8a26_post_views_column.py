@@ -0,0 +1,29 @@
+"""post views column
+
+Revision ID: 7f1e0b5c8a26
+Revises: d2b8f4a61c93
+Create Date: 2026-10-19 19:48:55.120471
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f1e0b5c8a26'
+down_revision: Union[str, Sequence[str], None] = 'd2b8f4a61c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Constant default: PostgreSQL 11+ adds the column without rewriting the table.
+    op.add_column('post', sa.Column('views', sa.BigInteger(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('post', 'views')
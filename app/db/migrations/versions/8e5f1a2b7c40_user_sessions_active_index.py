@@ -0,0 +1,42 @@
+"""user sessions active index
+
+Revision ID: 8e5f1a2b7c40
+Revises: 3b7d2c9e41a6
+Create Date: 2026-10-19 17:20:41.503218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e5f1a2b7c40'
+down_revision: Union[str, Sequence[str], None] = '3b7d2c9e41a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction; it keeps logins/refreshes unblocked while building.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_sessions_user_id_active',
+            'user_sessions',
+            ['user_id'],
+            unique=False,
+            postgresql_where=sa.text('revoked_at IS NULL'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_user_sessions_user_id_active',
+            table_name='user_sessions',
+            postgresql_concurrently=True,
+        )
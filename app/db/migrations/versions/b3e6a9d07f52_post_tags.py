@@ -0,0 +1,63 @@
+"""post tags
+
+Revision ID: b3e6a9d07f52
+Revises: 7f1e0b5c8a26
+Create Date: 2026-10-19 20:21:40.662918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e6a9d07f52'
+down_revision: Union[str, Sequence[str], None] = '7f1e0b5c8a26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('post_tags',
+    sa.Column('tag', sa.String(length=64), nullable=False),
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['post.id'], ),
+    sa.PrimaryKeyConstraint('tag', 'post_id')
+    )
+    op.create_index('ix_post_tags_tag_created_at_post_id', 'post_tags', ['tag', 'created_at', 'post_id'], unique=False)
+    op.create_index('ix_post_tags_post_id', 'post_tags', ['post_id'], unique=False)
+    op.create_table('tag_counts',
+    sa.Column('tag', sa.String(length=64), nullable=False),
+    sa.Column('post_count', sa.BigInteger(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('tag')
+    )
+    op.create_index(op.f('ix_tag_counts_post_count'), 'tag_counts', ['post_count'], unique=False)
+
+    # Backfill live posts; same pattern as app.tags.parsing.extract_tags, without its per-post cap.
+    op.execute(
+        """
+        INSERT INTO post_tags (tag, post_id, created_at)
+        SELECT DISTINCT lower(m[1]), p.id, p.created_at
+        FROM post p
+        CROSS JOIN LATERAL regexp_matches(p.content, '(?:^|[^\\w])#(\\w{1,64})', 'g') AS m
+        WHERE p.deleted_at IS NULL
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO tag_counts (tag, post_count)
+        SELECT tag, count(*) FROM post_tags GROUP BY tag
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_tag_counts_post_count'), table_name='tag_counts')
+    op.drop_table('tag_counts')
+    op.drop_index('ix_post_tags_post_id', table_name='post_tags')
+    op.drop_index('ix_post_tags_tag_created_at_post_id', table_name='post_tags')
+    op.drop_table('post_tags')
@@ -0,0 +1,56 @@
+"""user sessions user_id expires_at index
+
+Revision ID: c4d9e6f3a815
+Revises: 8e5f1a2b7c40
+Create Date: 2026-10-19 18:05:12.417730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d9e6f3a815'
+down_revision: Union[str, Sequence[str], None] = '8e5f1a2b7c40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Serves refresh/logout lookups and the per-user cap eviction (ORDER BY expires_at);
+    # supersedes the user_id-only partial index. Built before the old one is dropped.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_sessions_user_id_expires_at_active',
+            'user_sessions',
+            ['user_id', 'expires_at'],
+            unique=False,
+            postgresql_where=sa.text('revoked_at IS NULL'),
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_user_sessions_user_id_active',
+            table_name='user_sessions',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_sessions_user_id_active',
+            'user_sessions',
+            ['user_id'],
+            unique=False,
+            postgresql_where=sa.text('revoked_at IS NULL'),
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_user_sessions_user_id_expires_at_active',
+            table_name='user_sessions',
+            postgresql_concurrently=True,
+        )
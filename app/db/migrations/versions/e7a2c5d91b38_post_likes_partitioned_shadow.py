@@ -0,0 +1,76 @@
+"""post likes partitioned shadow
+
+Revision ID: e7a2c5d91b38
+Revises: b3e6a9d07f52
+Create Date: 2026-10-19 21:05:12.318740
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a2c5d91b38'
+down_revision: Union[str, Sequence[str], None] = 'b3e6a9d07f52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONS = 16
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Step 1 of 3 (then `python -m app.likes.backfill`, then the swap in 4c8f0d3b6e17):
+    # post_likes_new is the HASH (post_id)-partitioned layout, kept in sync by triggers
+    # while the existing likes are copied online.
+    op.create_table('post_likes_new',
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['post.id'], name='post_likes_post_id_fkey'),
+    sa.ForeignKeyConstraint(['user_id'], ['user_account.id'], name='post_likes_user_id_fkey'),
+    sa.PrimaryKeyConstraint('post_id', 'user_id', name='post_likes_new_pkey'),
+    postgresql_partition_by='HASH (post_id)'
+    )
+    for remainder in range(PARTITIONS):
+        op.execute(
+            f"CREATE TABLE post_likes_p{remainder} PARTITION OF post_likes_new "
+            f"FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})"
+        )
+
+    # Creating the trigger waits for in-flight like writes, so every like committed after
+    # this migration is mirrored, and every earlier one is visible to the backfill.
+    op.execute(
+        """
+        CREATE FUNCTION post_likes_sync() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                DELETE FROM post_likes_new
+                WHERE post_id = OLD.post_id AND user_id = OLD.user_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO post_likes_new (post_id, user_id, created_at)
+                VALUES (NEW.post_id, NEW.user_id, NEW.created_at)
+                ON CONFLICT DO NOTHING;
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER post_likes_sync
+        AFTER INSERT OR UPDATE OR DELETE ON post_likes
+        FOR EACH ROW EXECUTE FUNCTION post_likes_sync()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER post_likes_sync ON post_likes")
+    op.execute("DROP FUNCTION post_likes_sync()")
+    op.drop_table('post_likes_new')
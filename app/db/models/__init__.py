@@ -2,3 +2,6 @@ from .user import User
 from .user_session import UserSession
 from .post import Post
 from .post_likes import PostLikes
+from .idempotency_key import IdempotencyKey
+from .outbox_event import OutboxEvent
+from .post_tag import PostTag, TagCount
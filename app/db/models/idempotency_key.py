@@ -0,0 +1,31 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import String, DateTime, ForeignKey, LargeBinary, UniqueConstraint
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+
+from app.db.session import Base
+
+
+class IdempotencyKey(Base):
+    __tablename__ = 'idempotency_keys'
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey('user_account.id'))
+    key: Mapped[str] = mapped_column(String(255), nullable=False)
+    request_hash: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    # NULL while the first request is still running.
+    response: Mapped[Optional[bytes]] = mapped_column(LargeBinary)
+
+    locked_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True),
+                                                 default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        UniqueConstraint('user_id', 'key'),
+    )
+
+    def __repr__(self) -> str:
+        return f'IdempotencyKey(id={self.id!r}, key={self.key!r})'
@@ -0,0 +1,34 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import BigInteger, Integer, String, Text, DateTime, Index, JSON, text
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+
+from app.db.session import Base
+
+
+class OutboxEvent(Base):
+    __tablename__ = 'outbox_events'
+
+    # SQLite (test suite) only auto-increments an INTEGER primary key.
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    event_type: Mapped[str] = mapped_column(String(64), nullable=False)
+    payload: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
+
+    attempts: Mapped[int] = mapped_column(default=0, server_default=text('0'))
+    last_error: Mapped[Optional[str]] = mapped_column(Text)
+    # Next attempt is not before this (retry backoff).
+    available_at: Mapped[datetime] = mapped_column(DateTime(timezone=True),
+                                                   default=lambda: datetime.now(timezone.utc))
+    # Set once the event ran out of attempts; such rows are kept for inspection, not retried.
+    failed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True),
+                                                 default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        Index('ix_outbox_events_pending', 'available_at', postgresql_where=text('failed_at IS NULL')),
+    )
+
+    def __repr__(self) -> str:
+        return f'OutboxEvent(id={self.id!r}, event_type={self.event_type!r}, attempts={self.attempts!r})'
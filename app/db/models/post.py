@@ -1,7 +1,7 @@
 from datetime import datetime, timezone
 from typing import Optional
 
-from sqlalchemy import String, DateTime, ForeignKey, Text
+from sqlalchemy import String, DateTime, ForeignKey, Text, Integer, BigInteger
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
 
@@ -15,6 +15,9 @@ class Post(Base):
     user_id: Mapped[int] = mapped_column(ForeignKey('user_account.id'))
     title: Mapped[str] = mapped_column(String(255))
     content: Mapped[str] = mapped_column(Text())
+    version: Mapped[int] = mapped_column(Integer, default=1, server_default='1')
+    # Flushed in batches from per-worker counters; deliberately does not bump `version` (ETag).
+    views: Mapped[int] = mapped_column(BigInteger, default=0, server_default='0')
     deleted_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True),
                                                  default=lambda: datetime.now(timezone.utc))
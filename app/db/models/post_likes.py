@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import DateTime, ForeignKey
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
 
@@ -10,17 +10,18 @@ from app.db.session import Base
 class PostLikes(Base):
     __tablename__ = 'post_likes'
 
-    id: Mapped[int] = mapped_column(primary_key=True)
-    post_id: Mapped[int] = mapped_column(ForeignKey('post.id'),
-                                                index=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey("user_account.id"))
+    # Composite primary key: it contains the partition key, so it is enforced per partition,
+    # and its leading post_id also serves the per-post lookups (no separate post_id index).
+    post_id: Mapped[int] = mapped_column(ForeignKey('post.id'), primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("user_account.id"), primary_key=True)
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True),
                                                  default=lambda: datetime.now(timezone.utc))
 
+    # The partitions (post_likes_p0..p15) are created by the migrations.
     __table_args__ = (
-        UniqueConstraint('post_id', 'user_id'),
+        {"postgresql_partition_by": "HASH (post_id)"},
     )
 
     def __repr__(self) -> str:
-        return f'PostLike(id={self.id!r}, created_at={self.created_at!r})'
\ No newline at end of file
+        return f'PostLike(post_id={self.post_id!r}, user_id={self.user_id!r}, created_at={self.created_at!r})'
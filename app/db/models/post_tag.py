@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from sqlalchemy import String, DateTime, ForeignKey, BigInteger, Index
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+
+from app.db.session import Base
+
+
+class PostTag(Base):
+    __tablename__ = 'post_tags'
+
+    tag: Mapped[str] = mapped_column(String(64), primary_key=True)
+    post_id: Mapped[int] = mapped_column(ForeignKey('post.id'), primary_key=True)
+    # The post's created_at, so a tag feed is ordered like the posts themselves.
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index('ix_post_tags_tag_created_at_post_id', 'tag', 'created_at', 'post_id'),
+        Index('ix_post_tags_post_id', 'post_id'),
+    )
+
+    def __repr__(self) -> str:
+        return f'PostTag(tag={self.tag!r}, post_id={self.post_id!r})'
+
+
+class TagCount(Base):
+    __tablename__ = 'tag_counts'
+
+    tag: Mapped[str] = mapped_column(String(64), primary_key=True)
+    post_count: Mapped[int] = mapped_column(BigInteger, default=0, server_default='0', index=True)
+
+    def __repr__(self) -> str:
+        return f'TagCount(tag={self.tag!r}, post_count={self.post_count!r})'
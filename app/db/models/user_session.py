@@ -1,7 +1,7 @@
 from datetime import datetime, timezone
 from typing import Optional
 
-from sqlalchemy import String, DateTime, ForeignKey, LargeBinary
+from sqlalchemy import String, DateTime, ForeignKey, LargeBinary, Index, text
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
 
@@ -20,5 +20,14 @@ class UserSession(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True),
                                                  default=lambda: datetime.now(timezone.utc))
 
+    __table_args__ = (
+        Index(
+            'ix_user_sessions_user_id_expires_at_active',
+            'user_id',
+            'expires_at',
+            postgresql_where=text('revoked_at IS NULL'),
+        ),
+    )
+
     def __repr__(self) -> str:
         return f'UserSession(id={self.id!r}, created_at={self.created_at!r})'
\ No newline at end of file
@@ -0,0 +1,43 @@
+from time import perf_counter
+from typing import Iterator, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.metrics import REGISTRY, CallbackMetric, DB_POOL_CHECKOUT_SECONDS
+from app.core.timing import record_pool_wait
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """
+        AsyncAdaptedQueuePool that reports how long each checkout waited for a connection
+        and how many checkouts are pending right now (`waiters`, read by admission control).
+    """
+
+    waiters: int = 0
+
+    def _do_get(self):
+        started: float = perf_counter()
+        self.waiters += 1
+        try:
+            return super()._do_get()
+        finally:
+            self.waiters -= 1
+            elapsed: float = perf_counter() - started
+            record_pool_wait(elapsed)
+            DB_POOL_CHECKOUT_SECONDS.observe(elapsed)
+
+
+def register_pool_metrics(engine: AsyncEngine) -> None:
+    def _pool_state() -> Iterator[Tuple[Tuple[str, ...], float]]:
+        # Looked up on every scrape: engine.dispose() replaces the pool object.
+        pool = engine.sync_engine.pool
+        yield ("size",), pool.size()
+        yield ("checked_out",), pool.checkedout()
+        yield ("overflow",), max(pool.overflow(), 0)
+        yield ("idle",), pool.checkedin()
+        yield ("waiting",), pool.waiters
+
+    REGISTRY.register(CallbackMetric(
+        "db_pool_connections", "SQLAlchemy pool connections by state.", _pool_state, ("state",),
+    ))
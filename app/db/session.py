@@ -2,14 +2,17 @@ from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, Asyn
 from sqlalchemy.orm import DeclarativeBase
 
 from app.config import Settings
+from app.db.pool import TimedQueuePool
 
 
 settings = Settings()
 engine = create_async_engine(
     url=settings.database_url,
-    echo=True,
-    pool_size=10,
-    max_overflow=20,
+    echo=settings.DB_ECHO,
+    poolclass=TimedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
 )
 
 AsyncSessionLocal = async_sessionmaker(
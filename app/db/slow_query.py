@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import random
+import re
+from collections import deque
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from time import perf_counter
+from types import FrameType
+from typing import Any, Deque, List, Optional, Set
+
+import greenlet
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.query_budget import SKIP_QUERY_BUDGET
+
+logger = logging.getLogger(__name__)
+
+CALLER_PREFIX = "app.repositories"
+EXPLAIN_PREFIX = "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) "
+MAX_CONCURRENT_EXPLAINS = 2
+REDACTED = "<redacted>"
+# Re-running a row-locking SELECT would take its locks again on the EXPLAIN connection.
+LOCKING_CLAUSE = re.compile(r"\bFOR\s+(?:NO\s+KEY\s+)?(?:UPDATE|SHARE|KEY\s+SHARE)\b", re.IGNORECASE)
+
+
+@dataclass(slots=True)
+class SlowQuery:
+    recorded_at: str
+    duration_ms: float
+    statement: str
+    parameters: str
+    caller: Optional[str]
+    plan: Optional[Any] = None
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def _find_caller() -> Optional[str]:
+    """
+        Nearest repository method on the awaiting stack.
+
+        Cursor events run inside SQLAlchemy's greenlet; the coroutine that awaited the
+        query is suspended in the parent greenlet, so walk that frame chain.
+    """
+    current = greenlet.getcurrent()
+    frame: Optional[FrameType] = current.parent.gr_frame if current.parent is not None else None
+
+    while frame is not None:
+        module: str = frame.f_globals.get("__name__", "")
+        if module.startswith(CALLER_PREFIX):
+            return f"{module}.{frame.f_code.co_qualname}"
+        frame = frame.f_back
+
+    return None
+
+
+def _explainable(statement: str, context) -> bool:
+    """Plain SELECTs only: no row locks, nothing tagged SKIP_QUERY_BUDGET (session/bookkeeping statements)."""
+    if context is not None and context.execution_options.get(SKIP_QUERY_BUDGET, False):
+        return False
+    return statement.lstrip()[:6].upper() == "SELECT" and LOCKING_CLAUSE.search(statement) is None
+
+
+class SlowQueryRecorder:
+    """
+        Logs statements slower than the threshold and keeps the latest ones in a ring buffer.
+
+        Bound parameters are redacted unless log_parameters is set: they carry emails, password
+        hashes and token ids. A sampled fraction of slow SELECTs is re-run as EXPLAIN (ANALYZE, BUFFERS) on a
+        separate pooled connection, in a background task, inside a rolled-back transaction.
+    """
+
+    def __init__(
+            self,
+            engine: AsyncEngine,
+            threshold_ms: float,
+            explain_sample_rate: float,
+            buffer_size: int,
+            log_parameters: bool = False,
+    ) -> None:
+        self.engine = engine
+        self.threshold_ms = threshold_ms
+        self.explain_sample_rate = explain_sample_rate
+        self.log_parameters = log_parameters
+        self.entries: Deque[SlowQuery] = deque(maxlen=buffer_size)
+        self._explain_tasks: Set[asyncio.Task] = set()
+
+    def install(self) -> None:
+        sync_engine = self.engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def snapshot(self) -> List[dict]:
+        return [entry.as_dict() for entry in reversed(self.entries)]
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        # On the context, not conn.info: a failed statement never reaches after_cursor_execute.
+        if context is not None:
+            context._slow_query_started = perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        started: Optional[float] = getattr(context, "_slow_query_started", None)
+        if started is None:
+            return
+
+        duration_ms: float = (perf_counter() - started) * 1000
+        if duration_ms < self.threshold_ms or statement.startswith(EXPLAIN_PREFIX):
+            return
+
+        entry = SlowQuery(
+            recorded_at=datetime.now(timezone.utc).isoformat(),
+            duration_ms=round(duration_ms, 3),
+            statement=statement,
+            parameters=repr(parameters) if self.log_parameters else REDACTED,
+            caller=_find_caller(),
+        )
+        self.entries.append(entry)
+        logger.warning(
+            "slow query %.1f ms in %s: %s params=%s",
+            duration_ms, entry.caller, statement, entry.parameters,
+        )
+
+        if (
+                not executemany
+                and _explainable(statement, context)
+                and len(self._explain_tasks) < MAX_CONCURRENT_EXPLAINS
+                and random.random() < self.explain_sample_rate
+        ):
+            task = asyncio.get_running_loop().create_task(self._explain(entry, statement, parameters))
+            self._explain_tasks.add(task)
+            task.add_done_callback(self._explain_tasks.discard)
+
+    async def _explain(self, entry: SlowQuery, statement: str, parameters: Any) -> None:
+        try:
+            async with self.engine.connect() as connection:
+                result = await connection.exec_driver_sql(EXPLAIN_PREFIX + statement, parameters)
+                entry.plan = result.scalar()
+                await connection.rollback()
+        except Exception:
+            logger.exception("EXPLAIN failed for slow query from %s", entry.caller)
+
+
+recorder: Optional[SlowQueryRecorder] = None
+
+
+def install_slow_query_log(
+        engine: AsyncEngine,
+        threshold_ms: float,
+        explain_sample_rate: float,
+        buffer_size: int,
+        log_parameters: bool = False,
+) -> SlowQueryRecorder:
+    global recorder
+    recorder = SlowQueryRecorder(
+        engine=engine,
+        threshold_ms=threshold_ms,
+        explain_sample_rate=explain_sample_rate,
+        buffer_size=buffer_size,
+        log_parameters=log_parameters,
+    )
+    recorder.install()
+    return recorder
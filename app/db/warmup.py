@@ -0,0 +1,64 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from app.db.session import AsyncSessionLocal
+from app.repositories.post_repo import PostRepository
+from app.repositories.user_repo import AuthenticationRepository
+
+logger = logging.getLogger(__name__)
+
+HotQuery = Callable[[AsyncSession], Awaitable[object]]
+
+# Read queries behind /posts, /post/{id}, /posts/lookup and auth. Arguments match nothing;
+# only the statement text matters for SQLAlchemy's compiled cache and asyncpg's per-connection
+# prepared-statement cache.
+HOT_QUERIES: List[HotQuery] = [
+    lambda session: PostRepository(session).get_posts_versions(limit=1, offset=0),
+    lambda session: PostRepository(session).get_posts_versions(limit=1, offset=0, user_id=0),
+    lambda session: PostRepository(session).get_posts(limit=1, offset=0),
+    lambda session: PostRepository(session).get_posts(limit=1, offset=0, user_id=0),
+    lambda session: PostRepository(session).get_posts_by_ids([0]),
+    lambda session: PostRepository(session).get_post_version(0),
+    lambda session: AuthenticationRepository(session).read_user_for_email(""),
+    lambda session: AuthenticationRepository(session).read_active_session(session_id=0, user_id=0),
+]
+
+
+async def _warm_connection(connection: AsyncConnection) -> None:
+    await connection.execute(text("SELECT 1"))
+
+    async with AsyncSessionLocal(bind=connection) as session:
+        for query in HOT_QUERIES:
+            await query(session)
+        await session.rollback()
+
+
+async def warm_pool(engine: AsyncEngine, connections: int) -> int:
+    """
+        Opens `connections` pooled connections at once, validates each and prepares the hot
+        queries on it, then returns them to the pool. Capped at the pool size so no overflow
+        connection is opened only to be discarded. Returns the number of warmed connections.
+    """
+    connections = min(connections, engine.pool.size())
+    if connections <= 0:
+        return 0
+
+    results: list = await asyncio.gather(
+        *(engine.connect().start() for _ in range(connections)),
+        return_exceptions=True,
+    )
+    opened: List[AsyncConnection] = [result for result in results if isinstance(result, AsyncConnection)]
+    try:
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        await asyncio.gather(*(_warm_connection(connection) for connection in opened))
+    finally:
+        for connection in opened:
+            await connection.close()
+
+    return len(opened)
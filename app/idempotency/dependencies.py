@@ -0,0 +1,20 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Header, Request
+
+from app.idempotency.schemas import IdempotencyKeyDTO
+
+
+async def get_idempotency_key(
+        request: Request,
+        idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key", min_length=1, max_length=255),
+) -> Optional[IdempotencyKeyDTO]:
+    if idempotency_key is None:
+        return None
+
+    # Method, path and body: the same key sent with a different request is rejected, not replayed.
+    fingerprint = hashlib.sha256(f"{request.method} {request.url.path}\n".encode("utf-8"))
+    fingerprint.update(await request.body())
+
+    return IdempotencyKeyDTO(key=idempotency_key, request_hash=fingerprint.digest())
@@ -0,0 +1,11 @@
+from app.core.base_exception import AppError
+
+
+class IdempotencyKeyReused(AppError):
+    status_code = 422
+    detail = "Idempotency-Key was already used for a different request"
+
+
+class IdempotencyKeyInUse(AppError):
+    status_code = 409
+    detail = "A request with this Idempotency-Key is still in progress"
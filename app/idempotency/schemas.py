@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+
+class IdempotencyKeyDTO(BaseModel):
+    key: str
+    request_hash: bytes
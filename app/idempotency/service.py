@@ -0,0 +1,147 @@
+import asyncio
+import logging
+from time import monotonic
+from typing import Any, Awaitable, Callable, Optional, Tuple, TypeVar
+
+from sqlalchemy.ext.asyncio.session import AsyncSession
+
+from app.config import Settings
+from app.core.base_service import BaseService
+from app.core.deadline import Deadline, current_deadline
+from app.core.dependencies import get_settings
+from app.core.serialization import get_type_adapter
+from app.db.models import IdempotencyKey
+from app.db.session import AsyncSessionLocal
+from app.idempotency.exceptions import IdempotencyKeyInUse, IdempotencyKeyReused
+from app.idempotency.schemas import IdempotencyKeyDTO
+from app.repositories.idempotency_repo import IdempotencyRepository
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+POLL_MIN_SECONDS = 0.05
+POLL_MAX_SECONDS = 0.5
+# A waiting duplicate answers 409 this long before its route's deadline, instead of a 504.
+DEADLINE_MARGIN_SECONDS = 0.2
+
+
+class IdempotencyService(BaseService):
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session)
+        self.idempotency_repo = IdempotencyRepository(self.session)
+        self.settings: Settings = get_settings()
+
+    async def run(
+            self,
+            *,
+            user_id: int,
+            idempotency_key: Optional[IdempotencyKeyDTO],
+            type_: Any,
+            action: Callable[[], Awaitable[T]]
+    ) -> Tuple[T, bool]:
+        """
+            Runs `action` once per (user, Idempotency-Key) and returns (result, replayed).
+
+            A retry after success gets the stored result back without running `action`;
+            a concurrent duplicate waits for the first request to finish, within its own time
+            budget. Failed requests store nothing, so their retry runs again. Without a key,
+            just runs `action`.
+
+            The response is stored in its own commit after `action` commits: if the process dies
+            in between, the claim goes stale after IDEMPOTENCY_LOCK_TIMEOUT and a retry runs
+            `action` a second time. Actions must tolerate that (create_post makes a second post;
+            like/unlike are idempotent by themselves).
+        """
+        if idempotency_key is None:
+            return await action(), False
+
+        stored: Optional[bytes] = await self._claim_or_wait(user_id=user_id, idempotency_key=idempotency_key)
+        if stored is not None:
+            return get_type_adapter(type_).validate_json(stored), True
+
+        try:
+            result: T = await action()
+        except Exception:
+            await self.idempotency_repo.release_key(user_id=user_id, key=idempotency_key.key)
+            raise
+
+        await self.idempotency_repo.complete_key(
+            user_id=user_id,
+            key=idempotency_key.key,
+            response=get_type_adapter(type_).dump_json(result),
+        )
+        return result, False
+
+    async def _claim_or_wait(self, user_id: int, idempotency_key: IdempotencyKeyDTO) -> Optional[bytes]:
+        """None once this request holds the key, otherwise the stored response of the first one."""
+        lock_timeout: float = self.settings.IDEMPOTENCY_LOCK_TIMEOUT
+        stale_at: float = monotonic() + lock_timeout
+        # The first request may hold the key for its whole time budget; wait no longer than ours.
+        deadline: Optional[Deadline] = current_deadline()
+        give_up_at: float = (
+            stale_at if deadline is None else min(stale_at, deadline.expires_at - DEADLINE_MARGIN_SECONDS)
+        )
+        delay: float = POLL_MIN_SECONDS
+        polling: bool = False
+        takeover_tried: bool = False
+
+        while True:
+            claimed: bool = await self.idempotency_repo.claim_key(
+                user_id=user_id,
+                key=idempotency_key.key,
+                request_hash=idempotency_key.request_hash,
+                ttl=self.settings.IDEMPOTENCY_TTL,
+                lock_timeout=lock_timeout,
+            )
+            if claimed:
+                return None
+
+            # Poll only the row. Claim again when it disappears (the first request failed) or once
+            # its holder has had `lock_timeout` to finish, by which time its lock is stale.
+            while True:
+                row: Optional[IdempotencyKey] = await self.idempotency_repo.read_key(
+                    user_id=user_id,
+                    key=idempotency_key.key,
+                    polling=polling,
+                )
+                polling = True
+
+                if row is None:
+                    break
+                if row.request_hash != idempotency_key.request_hash:
+                    raise IdempotencyKeyReused()
+                if row.response is not None:
+                    return row.response
+                if monotonic() >= give_up_at:
+                    # Out of time before the holder's lock went stale: nothing to take over.
+                    if takeover_tried or give_up_at < stale_at:
+                        raise IdempotencyKeyInUse(headers={"Retry-After": "1"})
+                    takeover_tried = True
+                    break
+
+                await asyncio.sleep(min(delay, max(give_up_at - monotonic(), 0.0)))
+                delay = min(delay * 2, POLL_MAX_SECONDS)
+
+
+class IdempotencyCleanupService(BaseService):
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session)
+        self.idempotency_repo = IdempotencyRepository(self.session)
+
+    async def delete_expired_batch(self, batch_size: int) -> int:
+        return await self.idempotency_repo.delete_expired_keys(batch_size=batch_size)
+
+
+def idempotency_cleanup_step(batch_size: int, throttle: float, interval: float):
+    """BackgroundWorker step: delete one batch of expired idempotency keys (see session_cleanup_step)."""
+    async def step() -> float:
+        async with AsyncSessionLocal() as session:
+            deleted: int = await IdempotencyCleanupService(session=session).delete_expired_batch(batch_size=batch_size)
+
+        if deleted:
+            logger.info("deleted %s expired idempotency keys", deleted)
+
+        return throttle if deleted >= batch_size else interval
+
+    return step
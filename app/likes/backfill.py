@@ -0,0 +1,118 @@
+"""
+    Online backfill of the HASH (post_id)-partitioned post_likes, between the two migrations:
+
+        alembic upgrade e7a2c5d91b38      # post_likes_new + sync triggers (brief lock)
+        python -m app.likes.backfill      # copy existing likes in small batches, then verify
+        alembic upgrade head              # swap the tables under a short exclusive lock
+
+    Likes and unlikes keep working throughout: the triggers mirror them into post_likes_new,
+    and each batch key-share locks its source rows, so an unlike cannot land between a row
+    being read and copied. Safe to rerun; copied rows are skipped.
+
+    Run: python -m app.likes.backfill [--batch-size 5000] [--pause 0.05]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from typing import Optional, Tuple
+
+from sqlalchemy import text
+
+from app.db.session import engine
+
+BACKFILLED = "backfilled"
+
+COPY_BATCH = text(
+    """
+    INSERT INTO post_likes_new (post_id, user_id, created_at)
+    SELECT post_id, user_id, created_at FROM post_likes
+    WHERE id > :after AND id <= :upto
+    FOR KEY SHARE
+    ON CONFLICT DO NOTHING
+    """
+)
+MISSING = text(
+    """
+    SELECT count(*) FROM post_likes l
+    WHERE NOT EXISTS (
+        SELECT 1 FROM post_likes_new n WHERE n.post_id = l.post_id AND n.user_id = l.user_id
+    )
+    """
+)
+EXTRA = text(
+    """
+    SELECT count(*) FROM post_likes_new n
+    WHERE NOT EXISTS (
+        SELECT 1 FROM post_likes l WHERE l.post_id = n.post_id AND l.user_id = n.user_id
+    )
+    """
+)
+
+
+async def copy_likes(batch_size: int, pause: float) -> int:
+    """Copies post_likes into post_likes_new in id ranges, one short transaction each."""
+    async with engine.connect() as conn:
+        bounds: Tuple[Optional[int], Optional[int]] = (
+            await conn.execute(text("SELECT min(id), max(id) FROM post_likes"))
+        ).one()
+    low, high = bounds
+    if high is None:
+        return 0
+
+    copied: int = 0
+    after: int = low - 1
+    started: float = time.perf_counter()
+    while after < high:
+        upto: int = min(after + batch_size, high)
+        async with engine.begin() as conn:
+            result = await conn.execute(COPY_BATCH, {"after": after, "upto": upto})
+        copied += result.rowcount
+        after = upto
+
+        done: float = (after - low + 1) / (high - low + 1)
+        print(f"\r{done:6.1%}  {copied} copied  {time.perf_counter() - started:.0f}s", end="", flush=True)
+        if pause:
+            await asyncio.sleep(pause)
+    print()
+    return copied
+
+
+async def verify() -> bool:
+    """Compares both tables in one snapshot; marks post_likes_new as backfilled when they match."""
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="REPEATABLE READ")
+        async with conn.begin():
+            missing: int = (await conn.execute(MISSING)).scalar_one()
+            extra: int = (await conn.execute(EXTRA)).scalar_one()
+
+    if missing or extra:
+        print(f"mismatch: {missing} likes missing from post_likes_new, {extra} extra")
+        return False
+
+    async with engine.begin() as conn:
+        await conn.execute(text(f"COMMENT ON TABLE post_likes_new IS '{BACKFILLED}'"))
+    print("post_likes_new matches post_likes; run `alembic upgrade head` to swap")
+    return True
+
+
+async def run(batch_size: int, pause: float) -> bool:
+    try:
+        await copy_likes(batch_size=batch_size, pause=pause)
+        return await verify()
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=5000, help="post_likes ids per transaction")
+    parser.add_argument("--pause", type=float, default=0.05, help="seconds between batches")
+    args = parser.parse_args()
+
+    if not asyncio.run(run(batch_size=args.batch_size, pause=args.pause)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,42 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
 from app.db.models import Post
 from app.db.session import get_db
+from app.idempotency.dependencies import get_idempotency_key
+from app.idempotency.schemas import IdempotencyKeyDTO
+from app.idempotency.service import IdempotencyService
 from app.likes.likes_service import LikesService
-from app.post.dependencies import get_post_or_error
-from app.auth.dependencies import get_current_user
+from app.post.dependencies import PostIdPath, get_post_or_error
+from app.auth.dependencies import get_current_user, get_current_user_id
+from app.core.deadline import time_budget
+from app.core.query_budget import query_budget
+from app.core.rate_limit import Rate, rate_limit
 from app.schemas import ApiResponse
 
 
 like_router = APIRouter(tags=['likes'])
 
+LIKES_PER_USER = Rate(limit=120, period=60)
+
 
-@like_router.post(path="/like/{post_id}", response_model=ApiResponse[str], status_code=200)
+@like_router.post(
+    path="/like/{post_id}",
+    response_model=ApiResponse[str],
+    status_code=200,
+    dependencies=[Depends(rate_limit("like:user", LIKES_PER_USER, key=get_current_user_id))],
+)
+@query_budget(7)
+@time_budget(2.0)
 async def like(
-        post_id: int,
+        post_id: PostIdPath,
+        response: Response,
         session: AsyncSession = Depends(get_db),
         post: Post = Depends(get_post_or_error),
-        user=Depends(get_current_user)
+        user=Depends(get_current_user),
+        idempotency_key: Optional[IdempotencyKeyDTO] = Depends(get_idempotency_key)
 ):
     """
         Like a post (idempotent).
@@ -27,6 +46,8 @@ async def like(
             session: Async database session.
             post: Post data from the database.
             user: User data from the database.
+            idempotency_key: Optional Idempotency-Key header; a retry with the same key is
+                answered from the stored response (Idempotent-Replayed: true).
 
         Behavior:
         - If the like does not exist -> creates it.
@@ -38,22 +59,41 @@ async def like(
         Errors:
         - 401: user is not authenticated or invalid token or user does not exist.
         - 404: post does not exist.
+        - 409: a request with the same Idempotency-Key is still in progress.
+        - 422: the Idempotency-Key was used for a different request.
+        - 429: too many likes/unlikes from this user (Retry-After).
 
         Concurrency:
         - Guaranteed by DB unique constraint (post_id, user_id).
     """
 
-    await LikesService(session=session).post_like(post=post, user=user)
+    _, replayed = await IdempotencyService(session=session).run(
+        user_id=user.id,
+        idempotency_key=idempotency_key,
+        type_=None,
+        action=lambda: LikesService(session=session).post_like(post=post, user=user),
+    )
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
 
     return ApiResponse(data='OK')
 
 
-@like_router.delete(path="/like/{post_id}", response_model=ApiResponse[str], status_code=200)
+@like_router.delete(
+    path="/like/{post_id}",
+    response_model=ApiResponse[str],
+    status_code=200,
+    dependencies=[Depends(rate_limit("like:user", LIKES_PER_USER, key=get_current_user_id))],
+)
+@query_budget(7)
+@time_budget(2.0)
 async def unlike(
-        post_id: int,
+        post_id: PostIdPath,
+        response: Response,
         session: AsyncSession = Depends(get_db),
         post: Post = Depends(get_post_or_error),
-        user=Depends(get_current_user)
+        user=Depends(get_current_user),
+        idempotency_key: Optional[IdempotencyKeyDTO] = Depends(get_idempotency_key)
 ):
     """
         Unlike a post (idempotent).
@@ -63,6 +103,8 @@ async def unlike(
             session: Async database session.
             post: Post data from the database.
             user: User data from the database.
+            idempotency_key: Optional Idempotency-Key header; a retry with the same key is
+                answered from the stored response (Idempotent-Replayed: true).
 
         Behavior:
         - If the like does not exist -> no-op.
@@ -74,7 +116,17 @@ async def unlike(
         Errors:
         - 401: user is not authenticated or invalid token or user does not exist.
         - 404: post does not exist.
+        - 409: a request with the same Idempotency-Key is still in progress.
+        - 422: the Idempotency-Key was used for a different request.
+        - 429: too many likes/unlikes from this user (Retry-After).
     """
-    await LikesService(session=session).post_unlike(post=post, user=user)
+    _, replayed = await IdempotencyService(session=session).run(
+        user_id=user.id,
+        idempotency_key=idempotency_key,
+        type_=None,
+        action=lambda: LikesService(session=session).post_unlike(post=post, user=user),
+    )
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
 
     return ApiResponse(data='OK')
@@ -1,22 +1,52 @@
+import logging
+from contextlib import asynccontextmanager
+from time import perf_counter
+from typing import AsyncIterator, List, Optional
+
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
 
-from app.core.base_exception import AppError
+from app.config import Settings
+from app.core.admission import AdmissionMiddleware
+from app.core.background import BackgroundWorker
+from app.core.base_exception import AppError, ServiceOverloaded
+from app.core.deadline import DeadlineMiddleware, install_deadlines, timeout_error
+from app.core.dependencies import get_settings
+from app.core.metrics import MetricsMiddleware
+from app.core.metrics_multiprocess import (
+    MultiprocessMetrics,
+    install_multiprocess_metrics,
+    metrics_snapshot_step,
+    multiprocess_metrics,
+)
+from app.core.profiling import ProfilingMiddleware, install_profiling
+from app.core.query_budget import QueryBudgetMiddleware, install_query_budget
+from app.core.rate_limit import MemoryRateLimitBackend, install_rate_limiting
+from app.core.serialization import warm_type_adapters
+from app.core.timing import ServerTimingMiddleware, install_timing_hooks
+from app.db.pool import register_pool_metrics
+from app.db.session import engine
+from app.db.slow_query import install_slow_query_log
+from app.db.warmup import warm_pool
+from app.admin.router import admin_router
 from app.auth.router import auth_router
-from app.post.router import post_router
+from app.auth.services.session_cleanup import session_cleanup_step
+from app.idempotency.service import idempotency_cleanup_step
+from app.outbox.service import outbox_step
+from app.post.router import post_router, PostsRowResponse, PostRowResponse
+from app.post.views import flush_post_views, install_post_views, post_views_step
 from app.likes.router import like_router
+from app.tags.router import tag_router, TagFeedResponse, TopTagsResponse
+from app.system.router import system_router, health_router
 
-app = FastAPI(
-    docs_url="/api/docs", openapi_url="/api"
-)
+logger = logging.getLogger(__name__)
 
-app.include_router(auth_router)
-app.include_router(post_router)
-app.include_router(like_router)
+# Response types rendered through json_response (FastAPI builds route response_models itself).
+PRE_ENCODED_RESPONSES = (PostsRowResponse, PostRowResponse, TagFeedResponse, TopTagsResponse)
 
 
-@app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     return JSONResponse(
         status_code=400,
@@ -30,12 +60,208 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
-@app.exception_handler(AppError)
 async def app_error_handler(request: Request, exc: AppError):
     return JSONResponse(status_code=exc.status_code,
+                        headers=exc.headers,
                         content={
                             "status": "error",
                             "error": {
                                 "detail": exc.detail,
                             }
                         })
+
+
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    retry_after: int = request.app.state.settings.ADMISSION_RETRY_AFTER
+    return await app_error_handler(request, ServiceOverloaded(headers={"Retry-After": str(retry_after)}))
+
+
+async def db_error_handler(request: Request, exc: DBAPIError):
+    app_error: Optional[AppError] = timeout_error(exc)
+    if app_error is None:
+        raise exc
+    return await app_error_handler(request, app_error)
+
+
+def background_workers(settings: Settings) -> List[BackgroundWorker]:
+    workers: List[BackgroundWorker] = []
+
+    if settings.SESSION_CLEANUP_ENABLED:
+        workers.append(BackgroundWorker(
+            name="session_cleanup",
+            step=session_cleanup_step(
+                batch_size=settings.SESSION_CLEANUP_BATCH_SIZE,
+                throttle=settings.SESSION_CLEANUP_THROTTLE,
+                interval=settings.SESSION_CLEANUP_INTERVAL,
+            ),
+        ))
+
+    if settings.IDEMPOTENCY_CLEANUP_ENABLED:
+        workers.append(BackgroundWorker(
+            name="idempotency_cleanup",
+            step=idempotency_cleanup_step(
+                batch_size=settings.IDEMPOTENCY_CLEANUP_BATCH_SIZE,
+                throttle=settings.IDEMPOTENCY_CLEANUP_THROTTLE,
+                interval=settings.IDEMPOTENCY_CLEANUP_INTERVAL,
+            ),
+        ))
+
+    if settings.OUTBOX_ENABLED:
+        workers.append(BackgroundWorker(
+            name="outbox",
+            step=outbox_step(
+                batch_size=settings.OUTBOX_BATCH_SIZE,
+                interval=settings.OUTBOX_POLL_INTERVAL,
+                max_attempts=settings.OUTBOX_MAX_ATTEMPTS,
+                backoff_base=settings.OUTBOX_BACKOFF_BASE,
+                backoff_max=settings.OUTBOX_BACKOFF_MAX,
+            ),
+        ))
+
+    exporter: Optional[MultiprocessMetrics] = multiprocess_metrics()
+    if exporter is not None:
+        workers.append(BackgroundWorker(
+            name="metrics_snapshot",
+            step=metrics_snapshot_step(exporter=exporter, interval=settings.METRICS_SNAPSHOT_INTERVAL),
+            error_delay=settings.METRICS_SNAPSHOT_INTERVAL,
+        ))
+
+    if settings.POST_VIEWS_ENABLED:
+        workers.append(BackgroundWorker(
+            name="post_views",
+            step=post_views_step(interval=settings.POST_VIEWS_FLUSH_INTERVAL),
+            error_delay=settings.POST_VIEWS_FLUSH_INTERVAL,
+        ))
+
+    return workers
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    settings: Settings = app.state.settings
+    started: float = perf_counter()
+
+    adapters: int = warm_type_adapters(PRE_ENCODED_RESPONSES)
+    connections: int = 0
+    if settings.WARMUP_ENABLED:
+        connections = await warm_pool(engine, connections=settings.WARMUP_CONNECTIONS)
+
+    app.state.warmup_ms = round((perf_counter() - started) * 1000, 3)
+    app.state.ready = True
+    logger.info(
+        "startup warm-up done in %.1f ms (%s connections, %s serializers)",
+        app.state.warmup_ms, connections, adapters,
+    )
+
+    workers: List[BackgroundWorker] = background_workers(settings)
+    for worker in workers:
+        worker.start()
+
+    try:
+        yield
+    finally:
+        app.state.ready = False
+        for worker in workers:
+            await worker.stop()
+        if settings.POST_VIEWS_ENABLED:
+            try:
+                await flush_post_views()
+            except Exception:
+                logger.exception("final flush of post view counts failed")
+        exporter: Optional[MultiprocessMetrics] = multiprocess_metrics()
+        if exporter is not None:
+            exporter.remove()
+        await engine.dispose()
+
+
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    """
+        Builds the application. Pool connections, prepared statements and serializers are
+        warmed in the lifespan; /health/ready answers 200 only after that.
+
+        Engine event hooks and metric callbacks are process-wide, so build one app per process.
+    """
+    settings = settings or get_settings()
+    logging.basicConfig(level=settings.LOG_LEVEL)
+
+    app = FastAPI(
+        docs_url="/api/docs", openapi_url="/api", lifespan=lifespan
+    )
+    app.state.settings = settings
+    app.state.ready = False
+
+    if settings.SERVER_TIMING_ENABLED:
+        install_timing_hooks(engine)
+        app.add_middleware(ServerTimingMiddleware)
+
+    if settings.QUERY_BUDGET_MODE != "off":
+        install_query_budget(
+            engine,
+            mode=settings.QUERY_BUDGET_MODE,
+            duplicate_threshold=settings.QUERY_DUPLICATE_THRESHOLD,
+        )
+        app.add_middleware(QueryBudgetMiddleware)
+
+    if settings.SLOW_QUERY_LOG_ENABLED:
+        install_slow_query_log(
+            engine,
+            threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+            explain_sample_rate=settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+            buffer_size=settings.SLOW_QUERY_BUFFER_SIZE,
+            log_parameters=settings.SLOW_QUERY_LOG_PARAMETERS,
+        )
+
+    if settings.PROFILING_ENABLED:
+        install_profiling(buffer_size=settings.PROFILING_BUFFER_SIZE)
+        app.add_middleware(ProfilingMiddleware, sample_rate=settings.PROFILING_SAMPLE_RATE)
+
+    if settings.DEADLINES_ENABLED:
+        install_deadlines(engine, lock_timeout_ms=settings.DB_LOCK_TIMEOUT_MS)
+        app.add_middleware(
+            DeadlineMiddleware,
+            router=app.router,
+            default_seconds=settings.REQUEST_TIME_BUDGET,
+            default_lock_timeout_ms=settings.DB_LOCK_TIMEOUT_MS,
+        )
+
+    if settings.ADMISSION_ENABLED:
+        pool_capacity: int = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+        app.add_middleware(
+            AdmissionMiddleware,
+            router=app.router,
+            engine=engine,
+            max_in_flight=settings.ADMISSION_MAX_IN_FLIGHT or 2 * pool_capacity,
+            max_pool_waiters=settings.ADMISSION_MAX_POOL_WAITERS or pool_capacity,
+            queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT,
+            retry_after=settings.ADMISSION_RETRY_AFTER,
+        )
+
+    if settings.POST_VIEWS_ENABLED:
+        install_post_views()
+
+    install_rate_limiting(
+        MemoryRateLimitBackend(max_keys=settings.RATE_LIMIT_MAX_KEYS) if settings.RATE_LIMIT_ENABLED else None
+    )
+
+    if settings.METRICS_ENABLED:
+        install_multiprocess_metrics(settings.METRICS_MULTIPROC_DIR)
+        register_pool_metrics(engine)
+        app.add_middleware(MetricsMiddleware)
+        app.include_router(system_router)
+
+    app.include_router(health_router)
+    app.include_router(auth_router)
+    app.include_router(post_router)
+    app.include_router(like_router)
+    app.include_router(tag_router)
+    app.include_router(admin_router)
+
+    app.add_exception_handler(RequestValidationError, validation_exception_handler)
+    app.add_exception_handler(AppError, app_error_handler)
+    app.add_exception_handler(PoolTimeoutError, pool_timeout_handler)
+    app.add_exception_handler(DBAPIError, db_error_handler)
+
+    return app
+
+
+app = create_app()
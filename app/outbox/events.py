@@ -0,0 +1,16 @@
+from typing import Any, Dict
+
+from pydantic import BaseModel
+
+POST_CREATED = "post.created"
+POST_UPDATED = "post.updated"
+POST_DELETED = "post.deleted"
+LIKE_ADDED = "like.added"
+LIKE_REMOVED = "like.removed"
+
+
+class OutboxEventDTO(BaseModel):
+    id: int
+    event_type: str
+    payload: Dict[str, Any]
+    attempts: int
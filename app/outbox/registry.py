@@ -0,0 +1,30 @@
+from collections import defaultdict
+from typing import Awaitable, Callable, DefaultDict, List, TypeVar
+
+from app.outbox.events import OutboxEventDTO
+
+Handler = Callable[[OutboxEventDTO], Awaitable[None]]
+
+H = TypeVar("H", bound=Handler)
+
+_handlers: DefaultDict[str, List[Handler]] = defaultdict(list)
+
+
+def outbox_handler(*event_types: str) -> Callable[[H], H]:
+    """
+        Registers an async handler for the given event types.
+
+        Delivery is at least once: an event is retried until every handler succeeds, so a
+        handler may see the same event (or an event whose sibling handler failed) again and
+        must be idempotent. Handlers open their own DB sessions when they need one.
+    """
+    def decorator(handler: H) -> H:
+        for event_type in event_types:
+            _handlers[event_type].append(handler)
+        return handler
+
+    return decorator
+
+
+def handlers_for(event_type: str) -> List[Handler]:
+    return _handlers.get(event_type, [])
@@ -0,0 +1,120 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from sqlalchemy.ext.asyncio.session import AsyncSession
+
+from app.core.base_service import BaseService
+from app.core.metrics import REGISTRY, Counter
+from app.db.models import OutboxEvent
+from app.db.session import AsyncSessionLocal
+from app.outbox.events import OutboxEventDTO
+from app.outbox.registry import Handler, handlers_for
+from app.repositories.outbox_repo import OutboxRepository
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_EVENTS: Counter = REGISTRY.register(Counter(
+    "outbox_events_total", "Outbox events handled by the in-process worker.", ("event_type", "result"),
+))
+
+
+class OutboxService(BaseService):
+    def __init__(
+            self,
+            session: AsyncSession,
+            max_attempts: int,
+            backoff_base: float,
+            backoff_max: float
+    ) -> None:
+        super().__init__(session)
+        self.outbox_repo = OutboxRepository(self.session)
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def _backoff(self, attempts: int) -> timedelta:
+        return timedelta(seconds=min(self.backoff_base * 2 ** (attempts - 1), self.backoff_max))
+
+    async def process_batch(self, batch_size: int) -> int:
+        """
+            Locks up to `batch_size` due events, runs their handlers and, in one commit, deletes
+            the handled ones (and those of types without handlers) and schedules the failed ones
+            for a retry with exponential backoff (or parks them with failed_at after
+            `max_attempts`). Returns the batch size.
+        """
+        events: List[OutboxEvent] = await self.outbox_repo.lock_pending_events(batch_size=batch_size)
+        done_ids: List[int] = []
+
+        for event in events:
+            handlers: List[Handler] = handlers_for(event.event_type)
+            if not handlers:
+                # Nothing consumes this type (yet): delivered to nobody, not retried.
+                done_ids.append(event.id)
+                OUTBOX_EVENTS.inc(event.event_type, "skipped")
+                continue
+
+            try:
+                await self._dispatch(handlers=handlers, event=OutboxEventDTO(
+                    id=event.id,
+                    event_type=event.event_type,
+                    payload=event.payload,
+                    attempts=event.attempts,
+                ))
+            except Exception as exc:
+                self._schedule_retry(event=event, error=exc)
+                continue
+
+            done_ids.append(event.id)
+            OUTBOX_EVENTS.inc(event.event_type, "done")
+
+        await self.outbox_repo.finish_events(done_ids=done_ids)
+        return len(events)
+
+    @staticmethod
+    async def _dispatch(handlers: List[Handler], event: OutboxEventDTO) -> None:
+        for handler in handlers:
+            await handler(event)
+
+    def _schedule_retry(self, event: OutboxEvent, error: Exception) -> None:
+        now: datetime = datetime.now(timezone.utc)
+        event.attempts += 1
+        event.last_error = repr(error)
+
+        if event.attempts >= self.max_attempts:
+            event.failed_at = now
+            OUTBOX_EVENTS.inc(event.event_type, "failed")
+            logger.error(
+                "outbox event %s (%s) failed %s times, giving up: %r",
+                event.id, event.event_type, event.attempts, error,
+            )
+            return
+
+        event.available_at = now + self._backoff(attempts=event.attempts)
+        OUTBOX_EVENTS.inc(event.event_type, "retry")
+        logger.warning(
+            "outbox event %s (%s) failed, attempt %s, retry at %s: %r",
+            event.id, event.event_type, event.attempts, event.available_at, error,
+        )
+
+
+def outbox_step(
+        batch_size: int,
+        interval: float,
+        max_attempts: int,
+        backoff_base: float,
+        backoff_max: float
+):
+    """BackgroundWorker step: drain one batch; a full batch means more are due, so go again at once."""
+    async def step() -> float:
+        async with AsyncSessionLocal() as session:
+            processed: int = await OutboxService(
+                session=session,
+                max_attempts=max_attempts,
+                backoff_base=backoff_base,
+                backoff_max=backoff_max,
+            ).process_batch(batch_size=batch_size)
+
+        return 0.0 if processed >= batch_size else interval
+
+    return step
@@ -1,27 +1,34 @@
-from fastapi import Depends
+from typing import Annotated
+
+from fastapi import Depends, Path
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
 from app.auth.dependencies import get_current_user
 from app.db.models import Post, User
 from app.db.session import get_db
 from app.post.exceptions import PostDoesNotExist, PostUpdateForbidden
+from app.post.schemas import MAX_POST_ID
 from app.repositories.post_repo import PostRepository
 
+# `post_id` path parameter: out-of-range ids are a 400, not an INTEGER overflow in the driver.
+PostIdPath = Annotated[int, Path(gt=0, le=MAX_POST_ID)]
+
 
 async def get_post_or_error(
-    post_id: int,
+    post_id: PostIdPath,
     session: AsyncSession = Depends(get_db),
 ) -> Post:
     post: Post = await PostRepository(session=session).get_by_id(item_id=post_id)
 
-    if not post:
+    # Soft-deleted posts are gone for writers too: no edits, likes or second delete.
+    if not post or post.deleted_at is not None:
         raise PostDoesNotExist()
 
     return post
 
 
 async def get_post_for_update(
-    post_id: int,
+    post_id: PostIdPath,
     session: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
     post: Post = Depends(get_post_or_error)
@@ -1,26 +1,28 @@
 from datetime import datetime, timezone
-from typing import Optional, List
+from typing import Dict, Optional, List
 
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
+from app.core.etag import make_post_etag, make_list_etag
+from app.core.single_flight import SingleFlight
 from app.post.exceptions import PostDoesNotExist
-from app.post.schemas import PostSchema, PostRequestSchema, PostDTO, AuthorDTO, PostIdDTO
-from app.repositories import AuthenticationRepository
-from app.repositories.like_repo import LikeRepository
+from app.post.schemas import PostSchema, PostRequestSchema, PostLookupSchema, PostIdDTO, PostRow
 from app.core.base_service import BaseService
 from app.db.models import User, Post
 from app.repositories.post_repo import PostRepository
+from app.tags.parsing import extract_tags
+
+
+post_reads = SingleFlight(name="post_reads")
 
 
 class PostService(BaseService):
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session=session)
         self.post_repo = PostRepository(session=self.session)
-        self.like_repo = LikeRepository(session=self.session)
-        self.user_repo = AuthenticationRepository(session=self.session)
 
-    async def get_posts(self, data: PostRequestSchema) -> List[PostDTO]:
-        posts: List[PostDTO] = await self.post_repo.get_posts(
+    async def get_posts(self, data: PostRequestSchema) -> List[PostRow]:
+        posts: List[PostRow] = await self.post_repo.get_posts(
             limit=data.limit,
             offset=data.offset,
             user_id=data.user_id
@@ -28,31 +30,52 @@ class PostService(BaseService):
 
         return posts
 
-    async def get_post(self, post: Post) -> PostDTO:
-        user: Optional[User] = await self.user_repo.get_by_id(item_id=post.user_id)
+    async def get_posts_etag(self, data: PostRequestSchema) -> str:
+        versions: List[tuple[int, int, int]] = await self.post_repo.get_posts_versions(
+            limit=data.limit,
+            offset=data.offset,
+            user_id=data.user_id
+        )
+
+        return make_list_etag(versions=versions)
+
+    async def get_post_etag(self, post_id: int) -> str:
+        state: Optional[tuple[int, int]] = await post_reads.do(
+            key=("version", post_id),
+            fn=lambda: self.post_repo.get_post_version(post_id=post_id),
+        )
 
-        if not user:
+        if state is None:
             raise PostDoesNotExist()
 
-        likes_count: int = await self.like_repo.get_likes_count(post_id=post.id)
+        version, likes_count = state
+        return make_post_etag(post_id=post_id, version=version, likes_count=likes_count)
 
-        author: AuthorDTO = AuthorDTO(
-            id=post.user_id,
-            email=user.email
+    async def get_post(self, post_id: int) -> PostRow:
+        posts: List[PostRow] = await post_reads.do(
+            key=("post", post_id),
+            fn=lambda: self.post_repo.get_posts_by_ids(ids=[post_id]),
         )
 
-        return PostDTO(
-            title=post.title,
-            content=post.content,
-            author=author,
-            likes_count=likes_count,
-        )
+        if not posts:
+            raise PostDoesNotExist()
+
+        return posts[0]
+
+    async def lookup_posts(self, data: PostLookupSchema) -> List[PostRow]:
+        posts: List[PostRow] = await self.post_repo.get_posts_by_ids(ids=data.ids)
+
+        return posts
+
+    async def add_views(self, deltas: Dict[int, int]) -> None:
+        await self.post_repo.add_views(deltas=deltas)
 
     async def create_post(self, data: PostSchema, user: User) -> PostIdDTO:
         new_post: Post = await self.post_repo.create_post(
             title=data.title,
             content=data.content,
-            user_id=user.id)
+            user_id=user.id,
+            tags=extract_tags(data.content))
 
         return PostIdDTO(id=new_post.id)
 
@@ -60,7 +83,8 @@ class PostService(BaseService):
         updated_post: Post = await self.post_repo.update_post(
             post=post,
             title=data.title,
-            content=data.content
+            content=data.content,
+            tags=extract_tags(data.content)
         )
 
         return PostSchema(
@@ -1,72 +1,159 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Response
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
-from app.auth.dependencies import get_current_user
+from app.auth.dependencies import get_current_user, get_current_user_id
+from app.core.etag import etag_matches
+from app.core.deadline import time_budget
+from app.core.query_budget import query_budget
+from app.core.rate_limit import Rate, rate_limit
+from app.core.serialization import json_response
 from app.db.models import Post
 from app.db.session import get_db
+from app.idempotency.dependencies import get_idempotency_key
+from app.idempotency.schemas import IdempotencyKeyDTO
+from app.idempotency.service import IdempotencyService
 from app.post.post_service import PostService
-from app.post.dependencies import get_post_for_update, get_post_or_error
-from app.post.schemas import PostRequestSchema, PostSchema, PostDTO, PostIdDTO
+from app.post.dependencies import PostIdPath, get_post_for_update
+from app.post.views import post_views
+from app.post.schemas import PostRequestSchema, PostLookupSchema, PostSchema, PostDTO, PostIdDTO, PostRow
 from app.schemas import ApiResponse
 
 
 post_router = APIRouter(tags=['posts'])
 
+PostsResponse = ApiResponse[List[Optional[PostDTO]]]
+PostsRowResponse = ApiResponse[List[Optional[PostRow]]]
+PostResponse = ApiResponse[PostDTO]
+PostRowResponse = ApiResponse[PostRow]
 
-@post_router.get(path="/posts", response_model=ApiResponse[List[Optional[PostDTO]]], status_code=200)
+POST_WRITES_PER_USER = Rate(limit=30, period=60)
+POST_EDITS_PER_USER = Rate(limit=60, period=60)
+
+
+@post_router.get(path="/posts", response_model=PostsResponse, status_code=200)
+@query_budget(2)
+@time_budget(2.0)
 async def get_posts(
         params: PostRequestSchema = Depends(),
+        if_none_match: Optional[str] = Header(default=None),
         session: AsyncSession = Depends(get_db)
-) -> ApiResponse[List[Optional[PostDTO]]]:
+) -> Response:
     """
         View all posts or a specific user.
 
         Args:
         - params: Pagination params(limit, offset), user id.
+        - if_none_match: ETag of a previously received page (If-None-Match header).
         - session: Async database session.
 
         Returns:
-        - 200: Posts data.
+        - 200: Posts data (with weak ETag header).
+        - 304: Page has not changed since the given ETag.
 
         Errors:
         - 400: Validation error (e.g., not pagination params).
     """
-    posts_list: List[PostDTO] = await PostService(session=session).get_posts(data=params)
+    post_service = PostService(session=session)
+    etag: str = await post_service.get_posts_etag(data=params)
+
+    if etag_matches(if_none_match=if_none_match, etag=etag):
+        return Response(status_code=304, headers={"ETag": etag})
 
-    return ApiResponse(data=posts_list)
+    posts_list: List[PostRow] = await post_service.get_posts(data=params)
 
+    return json_response(
+        type_=PostsRowResponse,
+        value=PostsRowResponse(data=posts_list),
+        headers={"ETag": etag},
+    )
 
-@post_router.get(path="/post/{post_id}", response_model=ApiResponse[PostDTO], status_code=200)
+
+@post_router.get(path="/post/{post_id}", response_model=PostResponse, status_code=200)
+@query_budget(2)
+@time_budget(1.0)
 async def read_post(
-        post_id: int,
-        post: Post = Depends(get_post_or_error),
+        post_id: PostIdPath,
+        if_none_match: Optional[str] = Header(default=None),
         session: AsyncSession = Depends(get_db)
-) -> ApiResponse[PostDTO]:
+) -> Response:
     """
         View a specific post.
 
         Args:
         - post_id: ID post.
+        - if_none_match: ETag of a previously received post (If-None-Match header).
         - session: Async database session.
 
         Returns:
-        - 200: Post data.
+        - 200: Post data (with weak ETag header).
+        - 304: Post has not changed since the given ETag.
+
+        Both count as a view (buffered per worker, so `views` lags by up to POST_VIEWS_FLUSH_INTERVAL
+        and does not change the ETag).
 
         Errors:
         - 404: Post does not exist.
     """
-    post: PostDTO = await PostService(session=session).get_post(post)
+    post_service = PostService(session=session)
+    etag: str = await post_service.get_post_etag(post_id=post_id)
+    post_views.record(post_id=post_id)
 
-    return ApiResponse(data=post)
+    if etag_matches(if_none_match=if_none_match, etag=etag):
+        return Response(status_code=304, headers={"ETag": etag})
 
+    post: PostRow = await post_service.get_post(post_id=post_id)
+
+    return json_response(
+        type_=PostRowResponse,
+        value=PostRowResponse(data=post),
+        headers={"ETag": etag},
+    )
+
+
+@post_router.post(path="/posts/lookup", response_model=PostsResponse, status_code=200)
+@query_budget(1)
+@time_budget(1.0)
+async def lookup_posts(
+        data: PostLookupSchema,
+        session: AsyncSession = Depends(get_db)
+) -> Response:
+    """
+        View several specific posts in one request.
 
-@post_router.post(path="/post", response_model=ApiResponse[PostIdDTO], status_code=201)
+        Args:
+        - data: Post IDs (1-50), in the order the posts should be returned.
+        - session: Async database session.
+
+        Returns:
+        - 200: Posts data in the requested order (missing or deleted posts are skipped).
+
+        Errors:
+        - 400: Validation error (e.g., empty ids or more than 50 ids).
+    """
+    posts_list: List[PostRow] = await PostService(session=session).lookup_posts(data=data)
+
+    return json_response(
+        type_=PostsRowResponse,
+        value=PostsRowResponse(data=posts_list),
+    )
+
+
+@post_router.post(
+    path="/post",
+    response_model=ApiResponse[PostIdDTO],
+    status_code=201,
+    dependencies=[Depends(rate_limit("post_write:user", POST_WRITES_PER_USER, key=get_current_user_id))],
+)
+@query_budget(8)
+@time_budget(2.0)
 async def write_post(
         data: PostSchema,
+        response: Response,
         session: AsyncSession = Depends(get_db),
-        user=Depends(get_current_user)
+        user=Depends(get_current_user),
+        idempotency_key: Optional[IdempotencyKeyDTO] = Depends(get_idempotency_key)
 ) -> ApiResponse[PostIdDTO]:
     """
         Write post.
@@ -75,6 +162,8 @@ async def write_post(
         - data: data params (title, content).
         - session: Async database session.
         - user: User data from the database and.
+        - idempotency_key: Optional Idempotency-Key header; a retry with the same key returns the
+          first response (Idempotent-Replayed: true) instead of creating another post.
 
         Returns:
         - 201: ID post
@@ -82,16 +171,33 @@ async def write_post(
         Errors:
         - 400: Validation error (e.g., not title or content incorrect number of characters).
         - 401: User does not exist or missing ... token.
+        - 409: A request with the same Idempotency-Key is still in progress.
+        - 422: The Idempotency-Key was used for a different request.
+        - 429: Too many posts from this user (Retry-After).
     """
-    new_post_id: PostIdDTO = await PostService(session=session).create_post(data=data, user=user)
+    new_post_id, replayed = await IdempotencyService(session=session).run(
+        user_id=user.id,
+        idempotency_key=idempotency_key,
+        type_=PostIdDTO,
+        action=lambda: PostService(session=session).create_post(data=data, user=user),
+    )
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
 
     return ApiResponse(data=new_post_id)
 
 
-@post_router.patch(path="/post/{post_id}", response_model=ApiResponse[PostSchema], status_code=200)
+@post_router.patch(
+    path="/post/{post_id}",
+    response_model=ApiResponse[PostSchema],
+    status_code=200,
+    dependencies=[Depends(rate_limit("post_edit:user", POST_EDITS_PER_USER, key=get_current_user_id))],
+)
+@query_budget(8)
+@time_budget(2.0)
 async def update_post(
         data: PostSchema,
-        post_id: int,
+        post_id: PostIdPath,
         session: AsyncSession = Depends(get_db),
         post: Post = Depends(get_post_for_update),
         user=Depends(get_current_user)
@@ -114,15 +220,22 @@ async def update_post(
         - 401: User does not exist or missing ... token.
         - 403: You are not allowed to update a post.
         - 404: Post does not exist.
+        - 429: Too many edits from this user (Retry-After).
     """
     updated_post: PostSchema = await PostService(session=session).update_post(data=data, post=post)
 
     return ApiResponse(data=updated_post)
 
 
-@post_router.delete(path="/post/{post_id}", status_code=204)
+@post_router.delete(
+    path="/post/{post_id}",
+    status_code=204,
+    dependencies=[Depends(rate_limit("post_edit:user", POST_EDITS_PER_USER, key=get_current_user_id))],
+)
+@query_budget(6)
+@time_budget(2.0)
 async def delete_post(
-        post_id: int,
+        post_id: PostIdPath,
         post: Post = Depends(get_post_for_update),
         user=Depends(get_current_user),
         session: AsyncSession = Depends(get_db)
@@ -143,6 +256,7 @@ async def delete_post(
         - 401: User does not exist or missing ... token.
         - 403: You are not allowed to update a post.
         - 404: Post does not exist.
+        - 429: Too many edits from this user (Retry-After).
     """
     await PostService(session=session).delete_post(post=post)
 
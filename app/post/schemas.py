@@ -1,14 +1,26 @@
-from typing import Optional
+from dataclasses import dataclass
+from typing import Annotated, Optional, List
 
 from pydantic import BaseModel, Field
 
 
+MAX_LOOKUP_IDS = 50
+# post.id is an INTEGER column; larger ids would fail in the driver instead of validation.
+MAX_POST_ID = 2 ** 31 - 1
+
+PostId = Annotated[int, Field(gt=0, le=MAX_POST_ID)]
+
+
 class PostRequestSchema(BaseModel):
     user_id: int | None = None
     limit: int = Field(gt=0, le=100)
     offset: int = Field(ge=0)
 
 
+class PostLookupSchema(BaseModel):
+    ids: List[PostId] = Field(min_length=1, max_length=MAX_LOOKUP_IDS)
+
+
 class PostSchema(BaseModel):
     title: str = Field(min_length=1, max_length=255)
     content: str = Field(min_length=1)
@@ -20,15 +32,31 @@ class AuthorDTO(BaseModel):
 
 
 class PostDTO(BaseModel):
+    id: int
     title: str
     content: str
     author: AuthorDTO
     likes_count: Optional[int] = Field(ge=0)
+    views: int = Field(default=0, ge=0)
 
 
 class PostIdDTO(BaseModel):
     id: int
 
 
+@dataclass(slots=True)
+class AuthorRow:
+    """Read-only counterpart of AuthorDTO, built straight from Core rows."""
+    id: int
+    email: Optional[str] = None
 
 
+@dataclass(slots=True)
+class PostRow:
+    """Read-only counterpart of PostDTO, built straight from Core rows (same JSON shape)."""
+    id: int
+    title: str
+    content: str
+    author: AuthorRow
+    likes_count: int
+    views: int
@@ -0,0 +1,78 @@
+import logging
+from typing import Dict, List
+
+from app.db.session import AsyncSessionLocal
+from app.post.post_service import PostService
+
+logger = logging.getLogger(__name__)
+
+# Rows per UPDATE ... FROM (VALUES ...); keeps statements and their lock sets small.
+FLUSH_CHUNK_SIZE = 1000
+
+
+class ViewCounter:
+    """
+        Per-worker view counts accumulated between flushes. `record` is a dict increment on
+        the event loop; a flush takes the whole map at once and puts it back if the write fails,
+        so counts are only lost if the process dies between flushes.
+    """
+
+    def __init__(self) -> None:
+        self.enabled: bool = False
+        self._pending: Dict[int, int] = {}
+
+    def record(self, post_id: int) -> None:
+        if not self.enabled:
+            return
+        self._pending[post_id] = self._pending.get(post_id, 0) + 1
+
+    def drain(self) -> Dict[int, int]:
+        pending, self._pending = self._pending, {}
+        return pending
+
+    def restore(self, deltas: Dict[int, int]) -> None:
+        for post_id, delta in deltas.items():
+            self._pending[post_id] = self._pending.get(post_id, 0) + delta
+
+
+post_views = ViewCounter()
+
+
+def install_post_views() -> None:
+    """Start counting; only call it when the flush worker runs, or the map grows unbounded."""
+    post_views.enabled = True
+
+
+async def flush_post_views() -> int:
+    """Writes the pending view counts; returns how many posts were updated."""
+    deltas: Dict[int, int] = post_views.drain()
+    if not deltas:
+        return 0
+
+    post_ids: List[int] = sorted(deltas)
+    flushed: int = 0
+
+    try:
+        async with AsyncSessionLocal() as session:
+            post_service = PostService(session=session)
+            for start in range(0, len(post_ids), FLUSH_CHUNK_SIZE):
+                chunk: List[int] = post_ids[start:start + FLUSH_CHUNK_SIZE]
+                await post_service.add_views(deltas={post_id: deltas[post_id] for post_id in chunk})
+                flushed += len(chunk)
+    except BaseException:
+        # Chunks already committed stay written; only the rest goes back.
+        post_views.restore({post_id: deltas[post_id] for post_id in post_ids[flushed:]})
+        raise
+
+    return flushed
+
+
+def post_views_step(interval: float):
+    """BackgroundWorker step: flush the pending view counts every `interval` seconds."""
+    async def step() -> float:
+        flushed: int = await flush_post_views()
+        if flushed:
+            logger.debug("flushed view counts of %s posts", flushed)
+        return interval
+
+    return step
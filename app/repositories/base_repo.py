@@ -1,6 +1,7 @@
-from typing import Protocol, TypeVar, Generic, Type, Optional
+from typing import Protocol, TypeVar, Generic, Type, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import select, Row, Executable
+from sqlalchemy.ext.asyncio import AsyncConnection
 from sqlalchemy.ext.asyncio.session import AsyncSession
 from sqlalchemy.orm import Mapped
 
@@ -19,4 +20,15 @@ class BaseRepository(Generic[T]):
     async def get_by_id(self, item_id: int) -> Optional[T]:
         stmt = select(self.model).where(self.model.id == item_id)
         result = await self.session.execute(stmt)
-        return result.scalars().first()
\ No newline at end of file
+        return result.scalars().first()
+
+    async def fetch_rows(self, stmt: Executable) -> Sequence[Row]:
+        """
+            Read-only mode: run a Core select on the session's connection.
+
+            Rows skip ORM loading and the identity map entirely; use it for
+            explicit-column selects whose results are never modified.
+        """
+        connection: AsyncConnection = await self.session.connection()
+        result = await connection.execute(stmt)
+        return result.all()
@@ -0,0 +1,148 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.query_budget import SKIP_QUERY_BUDGET
+from app.db.models import IdempotencyKey
+from app.repositories.base_repo import BaseRepository
+
+
+class IdempotencyRepository(BaseRepository[IdempotencyKey]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, IdempotencyKey)
+
+    async def claim_key(
+            self,
+            user_id: int,
+            key: str,
+            request_hash: bytes,
+            ttl: float,
+            lock_timeout: float
+    ) -> bool:
+        """
+            Takes the key for this request in one statement: inserts it, or takes over a row
+            whose response expired or whose holder stopped without finishing (locked for
+            longer than `lock_timeout`). Returns False while another request holds the key
+            or its response is still valid.
+        """
+        now: datetime = datetime.now(timezone.utc)
+        table = IdempotencyKey.__table__
+
+        stmt = insert(IdempotencyKey).values(
+            user_id=user_id,
+            key=key,
+            request_hash=request_hash,
+            locked_at=now,
+            expires_at=now + timedelta(seconds=ttl),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[IdempotencyKey.user_id, IdempotencyKey.key],
+            set_={
+                "request_hash": stmt.excluded.request_hash,
+                "response": None,
+                "locked_at": stmt.excluded.locked_at,
+                "expires_at": stmt.excluded.expires_at,
+            },
+            where=or_(
+                table.c.expires_at < now,
+                and_(
+                    table.c.response.is_(None),
+                    table.c.locked_at < now - timedelta(seconds=lock_timeout),
+                ),
+            ),
+        ).returning(IdempotencyKey.id)
+
+        try:
+            result = await self.session.execute(stmt)
+            claimed: bool = result.scalar_one_or_none() is not None
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+        return claimed
+
+    async def read_key(
+            self,
+            user_id: int,
+            key: str,
+            polling: bool = False
+    ) -> Optional[IdempotencyKey]:
+        stmt = (
+            select(IdempotencyKey)
+            .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+            .execution_options(populate_existing=True)
+        )
+        if polling:
+            # Re-reads while waiting on another request are not this route's query cost.
+            stmt = stmt.execution_options(**{SKIP_QUERY_BUDGET: True})
+
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def complete_key(
+            self,
+            user_id: int,
+            key: str,
+            response: bytes
+    ) -> None:
+        try:
+            await self.session.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+                .values(response=response)
+                .execution_options(synchronize_session=False)
+            )
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+    async def release_key(
+            self,
+            user_id: int,
+            key: str
+    ) -> None:
+        """Drops an unfinished claim so a retry of a failed request runs again."""
+        try:
+            await self.session.execute(
+                delete(IdempotencyKey)
+                .where(
+                    IdempotencyKey.user_id == user_id,
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.response.is_(None),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+    async def delete_expired_keys(
+            self,
+            batch_size: int
+    ) -> int:
+        """Deletes up to `batch_size` expired keys in one short transaction, skipping locked rows."""
+        expired_ids = (
+            select(IdempotencyKey.id)
+            .where(IdempotencyKey.expires_at < datetime.now(timezone.utc))
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+
+        try:
+            result = await self.session.execute(
+                delete(IdempotencyKey)
+                .where(IdempotencyKey.id.in_(expired_ids.scalar_subquery()))
+                .execution_options(synchronize_session=False)
+            )
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+        return result.rowcount
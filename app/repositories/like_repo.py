@@ -3,12 +3,15 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models import PostLikes
+from app.outbox.events import LIKE_ADDED, LIKE_REMOVED
 from app.repositories.base_repo import BaseRepository
+from app.repositories.outbox_repo import OutboxRepository
 
 
 class LikeRepository(BaseRepository):
     def __init__(self, session: AsyncSession,):
         super().__init__(session, PostLikes)
+        self.outbox_repo = OutboxRepository(session)
 
     async def post_like(
             self,
@@ -18,6 +21,8 @@ class LikeRepository(BaseRepository):
         try:
             new_post_like = PostLikes(post_id=post_id, user_id=user_id)
             self.session.add(new_post_like)
+            await self.session.flush()
+            self.outbox_repo.add_event(LIKE_ADDED, {"post_id": post_id, "user_id": user_id})
             await self.session.commit()
         except IntegrityError:
             await self.session.rollback()
@@ -27,13 +32,16 @@ class LikeRepository(BaseRepository):
             post_id: int,
             user_id: int
     ):
-        await self.session.execute(
+        result = await self.session.execute(
             delete(PostLikes).where(
                 PostLikes.post_id == post_id,
                 PostLikes.user_id == user_id,
             )
         )
 
+        if result.rowcount:
+            self.outbox_repo.add_event(LIKE_REMOVED, {"post_id": post_id, "user_id": user_id})
+
         await self.session.commit()
 
     async def get_likes_count(
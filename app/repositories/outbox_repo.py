@@ -0,0 +1,63 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import OutboxEvent
+from app.repositories.base_repo import BaseRepository
+
+
+class OutboxRepository(BaseRepository[OutboxEvent]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, OutboxEvent)
+
+    def add_event(
+            self,
+            event_type: str,
+            payload: Dict[str, Any]
+    ) -> None:
+        """
+            Stages an event in the caller's transaction, without flushing or committing: it is
+            inserted by the same commit as the write it describes, or not at all.
+        """
+        self.session.add(OutboxEvent(event_type=event_type, payload=payload))
+
+    async def lock_pending_events(
+            self,
+            batch_size: int
+    ) -> List[OutboxEvent]:
+        """
+            Oldest due events, row-locked until `finish_events` commits. Rows locked by another
+            worker are skipped, so several workers drain the outbox without overlapping.
+        """
+        stmt = (
+            select(OutboxEvent)
+            .where(
+                OutboxEvent.failed_at.is_(None),
+                OutboxEvent.available_at <= datetime.now(timezone.utc),
+            )
+            .order_by(OutboxEvent.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def finish_events(
+            self,
+            done_ids: Sequence[int]
+    ) -> None:
+        """Deletes handled events and commits the retry state set on the failed ones."""
+        try:
+            if done_ids:
+                await self.session.execute(
+                    delete(OutboxEvent)
+                    .where(OutboxEvent.id.in_(done_ids))
+                    .execution_options(synchronize_session=False)
+                )
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
@@ -1,30 +1,49 @@
 from datetime import datetime
-from typing import Optional, Sequence, List
+from typing import Dict, Optional, Sequence, List
 
-from sqlalchemy import select, func, update
+from sqlalchemy import select, func, update, values, column, Row, Integer, BigInteger, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models import Post
+from app.db.models import Post, User
 from app.db.models.post_likes import PostLikes
+from app.outbox.events import POST_CREATED, POST_DELETED, POST_UPDATED
 from app.post.exceptions import PostDoesNotExist
-from app.post.schemas import PostDTO, AuthorDTO
+from app.post.schemas import PostRow, AuthorRow
 from app.repositories.base_repo import BaseRepository
+from app.repositories.outbox_repo import OutboxRepository
+from app.repositories.tag_repo import TagRepository
 
 
 class PostRepository(BaseRepository[Post]):
     def __init__(self, session: AsyncSession):
         super().__init__(session, Post)
+        self.outbox_repo = OutboxRepository(session)
+        self.tag_repo = TagRepository(session)
+
+    @staticmethod
+    def _likes_count():
+        return (
+            select(func.count())
+            .select_from(PostLikes)
+            .where(PostLikes.post_id == Post.id)
+            .scalar_subquery()
+        )
 
     async def create_post(
             self,
             title: str,
             content: str,
-            user_id: int
+            user_id: int,
+            tags: Sequence[str] = ()
     ) -> Post:
         try:
             new_post: Post = Post(title=title, content=content, user_id=user_id)
             self.session.add(new_post)
+            await self.session.flush()
 
+            await self.tag_repo.add_post_tags(post_id=new_post.id, created_at=new_post.created_at, tags=tags)
+            self.outbox_repo.add_event(POST_CREATED, {"post_id": new_post.id, "user_id": user_id})
             await self.session.commit()
             await self.session.refresh(new_post)
 
@@ -38,37 +57,136 @@ class PostRepository(BaseRepository[Post]):
             limit: int,
             offset: int,
             user_id: Optional[int] = None,
-    ) -> List[PostDTO]:
-
-        stmt = select(Post).where(Post.deleted_at == None)
+    ) -> List[PostRow]:
+        stmt = (
+            select(
+                Post.id,
+                Post.title,
+                Post.content,
+                Post.user_id,
+                self._likes_count().label("likes_count"),
+                Post.views,
+            )
+            .where(Post.deleted_at == None)
+        )
 
         if user_id is not None:
             stmt = stmt.where(Post.user_id == user_id)
 
-        likes_count_sq = (
-            select(func.count(PostLikes.id))
-            .where(PostLikes.post_id == Post.id)
-            .scalar_subquery()
+        stmt = stmt.order_by(Post.id).offset(offset).limit(limit)
+
+        rows: Sequence[Row] = await self.fetch_rows(stmt)
+        return [
+            PostRow(
+                id=post_id,
+                title=title,
+                content=content,
+                author=AuthorRow(id=author_id),
+                likes_count=int(likes_count),
+                views=views,
+            )
+            for post_id, title, content, author_id, likes_count, views in rows
+        ]
+
+    async def get_posts_by_ids(
+            self,
+            ids: List[int],
+    ) -> List[PostRow]:
+        """
+            Live posts with author email and likes count in one round trip,
+            returned in the order of `ids` (missing and deleted posts are skipped).
+        """
+        stmt = (
+            select(
+                Post.id,
+                Post.title,
+                Post.content,
+                Post.user_id,
+                User.email,
+                self._likes_count().label("likes_count"),
+                Post.views,
+            )
+            .join(User, User.id == Post.user_id)
+            .where(
+                Post.id == any_(bindparam("ids", ids, type_=ARRAY(Integer))),
+                Post.deleted_at == None,
+            )
         )
 
+        rows: Sequence[Row] = await self.fetch_rows(stmt)
+        posts: dict[int, PostRow] = {
+            post_id: PostRow(
+                id=post_id,
+                title=title,
+                content=content,
+                author=AuthorRow(id=author_id, email=email),
+                likes_count=int(likes_count),
+                views=views,
+            )
+            for post_id, title, content, author_id, email, likes_count, views in rows
+        }
+
+        return [posts[post_id] for post_id in dict.fromkeys(ids) if post_id in posts]
+
+    async def get_post_version(
+            self,
+            post_id: int
+    ) -> Optional[tuple[int, int]]:
+        """(version, likes_count) of a live post: what its ETag is made of."""
         stmt = (
-            stmt.add_columns(likes_count_sq.label("likes_count"))
-            .offset(offset)
-            .limit(limit)
+            select(Post.version, self._likes_count())
+            .where(Post.id == post_id, Post.deleted_at == None)
         )
+        result = await self.session.execute(stmt)
+        row: Optional[Row] = result.one_or_none()
+        return (row[0], int(row[1])) if row is not None else None
+
+    async def get_posts_versions(
+            self,
+            limit: int,
+            offset: int,
+            user_id: Optional[int] = None,
+    ) -> List[tuple[int, int, int]]:
+        """(id, version, likes_count) of each post on the page: what the page ETag is made of."""
+        stmt = select(Post.id, Post.version, self._likes_count()).where(Post.deleted_at == None)
+
+        if user_id is not None:
+            stmt = stmt.where(Post.user_id == user_id)
+
+        stmt = stmt.order_by(Post.id).offset(offset).limit(limit)
 
         result = await self.session.execute(stmt)
+        return list(result.tuples().all())
 
-        rows: Sequence[tuple[Post, int]] = result.tuples().all()
-        return [
-            PostDTO(
-                title=post.title,
-                content=post.content,
-                author=AuthorDTO(id=post.user_id),
-                likes_count=int(likes_count),
+    async def add_views(
+            self,
+            deltas: Dict[int, int]
+    ) -> None:
+        """
+            Adds aggregated view counts in one statement:
+            UPDATE post SET views = post.views + v.delta FROM (VALUES ...) AS v(id, delta).
+            Rows are listed in id order so concurrent flushes from other workers lock alike.
+        """
+        if not deltas:
+            return
+
+        view_deltas = values(
+            column("id", Integer),
+            column("delta", BigInteger),
+            name="v",
+        ).data(sorted(deltas.items()))
+
+        try:
+            await self.session.execute(
+                update(Post)
+                .where(Post.id == view_deltas.c.id)
+                .values(views=Post.views + view_deltas.c.delta)
+                .execution_options(synchronize_session=False)
             )
-            for post, likes_count in rows
-        ]
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
 
     async def update_post(
             self,
@@ -76,13 +194,19 @@ class PostRepository(BaseRepository[Post]):
             title: str = None,
             content: str = None,
             deleted_at: datetime = None,
+            tags: Optional[Sequence[str]] = None,
     ) -> Post:
+        """`tags`: the hashtags of the new content, synced into post_tags; None leaves them as they are."""
         update_post: Post = post
 
         if not update_post:
             raise PostDoesNotExist()
 
-        update_stmt = update(table=Post).where(Post.id == update_post.id)
+        update_stmt = (
+            update(table=Post)
+            .where(Post.id == update_post.id, Post.deleted_at == None)
+            .values(version=Post.version + 1)
+        )
 
         if title:
             update_stmt = update_stmt.values(title=title)
@@ -93,9 +217,28 @@ class PostRepository(BaseRepository[Post]):
         if deleted_at:
             update_stmt = update_stmt.values(deleted_at=deleted_at)
 
-        await self.session.execute(statement=update_stmt)
+        # RETURNING refreshes the loaded instance in the same round trip (no SELECT after commit).
+        updated: Optional[Post] = (await self.session.execute(
+            statement=update_stmt.returning(Post),
+            execution_options={"populate_existing": True},
+        )).scalar_one_or_none()
+
+        # Deleted by a concurrent request since it was loaded.
+        if updated is None:
+            await self.session.rollback()
+            raise PostDoesNotExist()
+
+        if deleted_at:
+            await self.tag_repo.remove_post_tags(post_id=update_post.id)
+        elif tags is not None:
+            await self.tag_repo.remove_post_tags(post_id=update_post.id, keep=tags)
+            await self.tag_repo.add_post_tags(post_id=update_post.id, created_at=update_post.created_at, tags=tags)
+
+        self.outbox_repo.add_event(
+            POST_DELETED if deleted_at else POST_UPDATED,
+            {"post_id": update_post.id, "user_id": update_post.user_id},
+        )
         await self.session.commit()
-        await self.session.refresh(instance=update_post)
 
         return update_post
 
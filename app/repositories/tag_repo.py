@@ -0,0 +1,106 @@
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, select, tuple_, update, Row
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import PostTag, TagCount
+from app.repositories.base_repo import BaseRepository
+
+
+class TagRepository(BaseRepository[PostTag]):
+    """
+        post_tags is the inverted index (tag -> posts) and tag_counts its maintained per-tag
+        totals. The write methods only execute statements: they run inside the post write's
+        transaction and its repository commits.
+    """
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, PostTag)
+
+    async def add_post_tags(
+            self,
+            post_id: int,
+            created_at: datetime,
+            tags: Sequence[str]
+    ) -> None:
+        if not tags:
+            return
+
+        result = await self.session.execute(
+            insert(PostTag)
+            .values([{"tag": tag, "post_id": post_id, "created_at": created_at} for tag in sorted(tags)])
+            .on_conflict_do_nothing(index_elements=[PostTag.tag, PostTag.post_id])
+            .returning(PostTag.tag)
+        )
+        added: List[str] = list(result.scalars().all())
+        if not added:
+            return
+
+        # Sorted, so concurrent writers lock shared count rows in the same order.
+        upsert = insert(TagCount).values([{"tag": tag, "post_count": 1} for tag in sorted(added)])
+        await self.session.execute(
+            upsert.on_conflict_do_update(
+                index_elements=[TagCount.tag],
+                set_={"post_count": TagCount.post_count + 1},
+            )
+        )
+
+    async def remove_post_tags(
+            self,
+            post_id: int,
+            keep: Sequence[str] = ()
+    ) -> None:
+        """Removes the post's tags except `keep` (all of them by default) and decrements their counts."""
+        stmt = delete(PostTag).where(PostTag.post_id == post_id)
+        if keep:
+            stmt = stmt.where(PostTag.tag.not_in(keep))
+
+        result = await self.session.execute(
+            stmt.returning(PostTag.tag).execution_options(synchronize_session=False)
+        )
+        removed: List[str] = sorted(result.scalars().all())
+        if not removed:
+            return
+
+        await self.session.execute(
+            update(TagCount)
+            .where(TagCount.tag.in_(removed))
+            .values(post_count=TagCount.post_count - 1)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def get_tag_page(
+            self,
+            tag: str,
+            limit: int,
+            before: Optional[Tuple[datetime, int]] = None
+    ) -> List[Tuple[datetime, int]]:
+        """
+            (created_at, post_id) of the tag's newest posts, older than `before` when given.
+            Keyset pagination on ix_post_tags_tag_created_at_post_id: cost does not grow with depth.
+        """
+        stmt = select(PostTag.created_at, PostTag.post_id).where(PostTag.tag == tag)
+
+        if before is not None:
+            stmt = stmt.where(tuple_(PostTag.created_at, PostTag.post_id) < tuple_(*before))
+
+        stmt = stmt.order_by(PostTag.created_at.desc(), PostTag.post_id.desc()).limit(limit)
+
+        rows: Sequence[Row] = await self.fetch_rows(stmt)
+        return [(created_at, post_id) for created_at, post_id in rows]
+
+    async def get_top_tags(
+            self,
+            limit: int
+    ) -> List[Tuple[str, int]]:
+        stmt = (
+            select(TagCount.tag, TagCount.post_count)
+            .where(TagCount.post_count > 0)
+            .order_by(TagCount.post_count.desc(), TagCount.tag)
+            .limit(limit)
+        )
+
+        rows: Sequence[Row] = await self.fetch_rows(stmt)
+        return [(tag, post_count) for tag, post_count in rows]
@@ -2,7 +2,7 @@ from datetime import datetime, timezone
 from sqlite3 import IntegrityError
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import select, delete, update, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.exceptions import UserAlreadyExist
@@ -40,13 +40,39 @@ class AuthenticationRepository(BaseRepository[User]):
         user = result.scalar_one_or_none()
         return user
 
-    async def read_active_session_by_user_id(
+    async def replace_password(
             self,
+            user_id: int,
+            current_password: bytes,
+            password: bytes
+    ) -> bool:
+        """
+            Swaps the stored hash only while it is still `current_password`, so a concurrent
+            password change is never overwritten. Returns whether a row was updated.
+        """
+        try:
+            result = await self.session.execute(
+                update(User)
+                .where(User.id == user_id, User.password == current_password)
+                .values(password=password)
+                .execution_options(synchronize_session=False)
+            )
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+        return result.rowcount == 1
+
+    async def read_active_session(
+            self,
+            session_id: int,
             user_id: int
     ) -> Optional[UserSession]:
         stmt = (
             select(UserSession)
             .where(
+                UserSession.id == session_id,
                 UserSession.user_id == user_id,
                 UserSession.revoked_at.is_(None),
                 UserSession.expires_at > datetime.now(timezone.utc),
@@ -56,29 +82,123 @@ class AuthenticationRepository(BaseRepository[User]):
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
-    async def create_user_session(
+    async def open_user_session(
             self,
-            data: UserSessionSchema
-    ) -> None:
+            user_id: int
+    ) -> UserSession:
+        """
+            Inserts a session row without committing, so its id can go into the tokens
+            (`sid`) before the token hash is known. Finished by `activate_user_session`.
+        """
         try:
             new_user_session = UserSession(
-                user_id=data.user_id,
-                token_hash=data.token_hash,
-                expires_at=data.expires_at
+                user_id=user_id,
+                token_hash=b"",
             )
             self.session.add(new_user_session)
-            await self.session.commit()
+            await self.session.flush()
         except Exception:
             await self.session.rollback()
             raise
 
+        return new_user_session
 
-    async def revoke_session(
+    async def activate_user_session(
             self,
-            user_session: UserSession
+            user_session: UserSession,
+            data: UserSessionSchema,
+            max_sessions: int
     ) -> None:
-        if user_session.revoked_at is not None:
-            return
+        """
+            Stores the refresh token hash and expiry, then revokes the user's active sessions
+            beyond the newest `max_sessions` in one statement. Refresh tokens share a lifetime,
+            so the earliest expiry is the oldest signin.
+        """
+        now: datetime = datetime.now(timezone.utc)
+        over_cap = (
+            select(UserSession.id)
+            .where(
+                UserSession.user_id == data.user_id,
+                UserSession.revoked_at.is_(None),
+                UserSession.expires_at > now,
+            )
+            .order_by(UserSession.expires_at.desc())
+            .offset(max_sessions)
+        )
+
+        try:
+            user_session.token_hash = data.token_hash
+            user_session.expires_at = data.expires_at
+            await self.session.flush()
+
+            await self.session.execute(
+                update(UserSession)
+                .where(UserSession.id.in_(over_cap.scalar_subquery()))
+                .values(revoked_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+    async def revoke_sessions(
+            self,
+            user_id: int,
+            session_id: Optional[int] = None
+    ) -> int:
+        """
+            Revokes one active session of the user, or all of them when `session_id` is None.
+            Returns the number of revoked sessions.
+        """
+        stmt = (
+            update(UserSession)
+            .where(
+                UserSession.user_id == user_id,
+                UserSession.revoked_at.is_(None),
+            )
+            .values(revoked_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        if session_id is not None:
+            stmt = stmt.where(UserSession.id == session_id)
+
+        try:
+            result = await self.session.execute(stmt)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+        return result.rowcount
+
+    async def delete_stale_sessions(
+            self,
+            batch_size: int
+    ) -> int:
+        """
+            Deletes up to `batch_size` revoked or expired sessions in one short transaction.
+            Rows locked by a concurrent revoke (or another worker's cleanup) are skipped.
+        """
+        stale_ids = (
+            select(UserSession.id)
+            .where(or_(
+                UserSession.revoked_at.is_not(None),
+                UserSession.expires_at < datetime.now(timezone.utc),
+            ))
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+
+        try:
+            result = await self.session.execute(
+                delete(UserSession)
+                .where(UserSession.id.in_(stale_ids.scalar_subquery()))
+                .execution_options(synchronize_session=False)
+            )
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
 
-        user_session.revoked_at = datetime.now(timezone.utc)
-        await self.session.commit()
\ No newline at end of file
+        return result.rowcount
\ No newline at end of file
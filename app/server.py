@@ -0,0 +1,147 @@
+"""
+    Production entrypoint: python -m app.server
+
+    - Worker count: WEB_CONCURRENCY, otherwise the container CPU quota (cgroup v2/v1),
+      otherwise the CPUs this process may run on.
+    - Event loop / HTTP parser: uvloop and httptools when installed, asyncio/h11 otherwise.
+    - DB_CONNECTION_BUDGET (max connections Postgres grants this deployment) is split across
+      workers and exported as DB_POOL_SIZE / DB_MAX_OVERFLOW before workers start, so
+      workers * (pool_size + max_overflow) never exceeds it.
+    - Graceful restarts: the supervisor always runs (even for one worker); SIGHUP restarts
+      workers one by one on the shared socket, SIGTERM drains in-flight requests for up to
+      GRACEFUL_TIMEOUT seconds.
+    - X-Forwarded-For is trusted only from FORWARDED_ALLOW_IPS (default 127.0.0.1). Behind a
+      proxy on another address, set it to that proxy, otherwise every client is seen as the
+      proxy and shares one per-IP rate limit.
+    - /metrics sums all workers: they share snapshots through METRICS_MULTIPROC_DIR (a fresh
+      temporary directory unless set), so any worker can answer a scrape of the shared port.
+
+    Other in-process state (/admin buffers, single-flight) is per worker.
+    On a 1-vCPU host extra workers add no throughput, only tail latency; scaling on more cores is
+    not measured yet (benchmarks/README.md).
+"""
+import importlib.util
+import logging
+import math
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Optional, Tuple
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+from app.config import Settings
+
+logger = logging.getLogger(__name__)
+
+CGROUP_V2_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+CGROUP_V1_QUOTA = Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+CGROUP_V1_PERIOD = Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+
+
+def _cgroup_cpu_quota() -> Optional[float]:
+    try:
+        quota, period = CGROUP_V2_CPU_MAX.read_text().split()
+        if quota != "max":
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+
+    try:
+        quota_us: int = int(CGROUP_V1_QUOTA.read_text())
+        period_us: int = int(CGROUP_V1_PERIOD.read_text())
+    except (OSError, ValueError):
+        return None
+
+    return quota_us / period_us if quota_us > 0 else None
+
+
+def available_cpus() -> int:
+    try:
+        cpus: int = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    quota: Optional[float] = _cgroup_cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, max(1, math.ceil(quota)))
+
+    return cpus
+
+
+def worker_count(settings: Settings) -> int:
+    if settings.WEB_CONCURRENCY:
+        return settings.WEB_CONCURRENCY
+
+    return available_cpus()
+
+
+def split_connection_budget(budget: int, workers: int) -> Tuple[int, int]:
+    """(pool_size, max_overflow) per worker; half of each worker's share stays warm."""
+    per_worker: int = max(1, budget // workers)
+    pool_size: int = max(1, math.ceil(per_worker / 2))
+    return pool_size, per_worker - pool_size
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def main() -> None:
+    settings = Settings()
+    logging.basicConfig(level=settings.LOG_LEVEL)
+
+    workers: int = worker_count(settings)
+
+    if settings.DB_CONNECTION_BUDGET:
+        if settings.DB_CONNECTION_BUDGET < workers:
+            logger.warning(
+                "DB_CONNECTION_BUDGET=%s is below the worker count, reducing workers to match",
+                settings.DB_CONNECTION_BUDGET,
+            )
+            workers = settings.DB_CONNECTION_BUDGET
+
+        pool_size, max_overflow = split_connection_budget(settings.DB_CONNECTION_BUDGET, workers)
+        # Workers are spawned processes that build their own Settings from the environment.
+        os.environ["DB_POOL_SIZE"] = str(pool_size)
+        os.environ["DB_MAX_OVERFLOW"] = str(max_overflow)
+    else:
+        pool_size, max_overflow = settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+
+    owns_metrics_dir: bool = not settings.METRICS_MULTIPROC_DIR
+    metrics_dir: str = settings.METRICS_MULTIPROC_DIR or tempfile.mkdtemp(prefix="app-metrics-")
+    os.environ["METRICS_MULTIPROC_DIR"] = metrics_dir
+
+    loop: str = "uvloop" if _installed("uvloop") else "asyncio"
+    http: str = "httptools" if _installed("httptools") else "h11"
+
+    logger.info(
+        "starting %s workers (loop=%s, http=%s, pool_size=%s, max_overflow=%s per worker)",
+        workers, loop, http, pool_size, max_overflow,
+    )
+
+    config = uvicorn.Config(
+        "app.main:app",
+        host=settings.HOST,
+        port=settings.PORT,
+        workers=workers,
+        loop=loop,
+        http=http,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.FORWARDED_ALLOW_IPS,
+        timeout_graceful_shutdown=settings.GRACEFUL_TIMEOUT,
+        log_level=settings.LOG_LEVEL.lower(),
+    )
+    server = uvicorn.Server(config)
+    try:
+        Multiprocess(config, target=server.run, sockets=[config.bind_socket()]).run()
+    finally:
+        if owns_metrics_dir:
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from app.core.admission import admission_exempt
+from app.core.metrics_multiprocess import render_metrics
+
+
+system_router = APIRouter(tags=['system'])
+
+
+@system_router.get(path="/metrics", response_class=PlainTextResponse, include_in_schema=False)
+@admission_exempt
+async def metrics() -> PlainTextResponse:
+    """
+        Prometheus metrics (text exposition format 0.0.4).
+
+        Returns:
+        - 200: Route latency/status, DB pool, auth crypto and single-flight metrics, summed
+          over all workers when served by app.server.
+    """
+    return PlainTextResponse(
+        content=render_metrics(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+health_router = APIRouter(prefix="/health", tags=['system'])
+
+
+@health_router.get(path="/live", include_in_schema=False)
+@admission_exempt
+async def live() -> dict:
+    """
+        Liveness: the worker's event loop is serving requests.
+
+        Returns:
+        - 200: Always.
+    """
+    return {"status": "ok"}
+
+
+@health_router.get(path="/ready", include_in_schema=False)
+@admission_exempt
+async def ready(request: Request) -> JSONResponse:
+    """
+        Readiness: startup warm-up (pool, prepared statements, serializers) has finished
+        and the worker is not shutting down.
+
+        Returns:
+        - 200: Ready, with the warm-up duration.
+        - 503: Still starting or draining.
+    """
+    state = request.app.state
+    if not getattr(state, "ready", False):
+        return JSONResponse(status_code=503, content={"status": "starting"})
+
+    return JSONResponse(content={"status": "ok", "warmup_ms": state.warmup_ms})
@@ -0,0 +1,6 @@
+from app.core.base_exception import AppError
+
+
+class InvalidCursor(AppError):
+    status_code = 400
+    detail = "Invalid pagination cursor"
@@ -0,0 +1,20 @@
+import re
+from typing import List
+
+MAX_TAG_LENGTH = 64
+MAX_TAGS_PER_POST = 20
+
+# "#" not preceded by a word character, then 1-64 word characters (Unicode letters, digits, _).
+HASHTAG_RE = re.compile(rf"(?<!\w)#(\w{{1,{MAX_TAG_LENGTH}}})")
+
+
+def normalize_tag(tag: str) -> str:
+    # Cut after lower(): some letters grow when lowered ("İ" becomes "i" + a combining dot),
+    # and post_tags.tag is String(MAX_TAG_LENGTH).
+    return tag.lstrip("#").lower()[:MAX_TAG_LENGTH]
+
+
+def extract_tags(text: str) -> List[str]:
+    """Distinct normalized hashtags of `text` in order of appearance, at most MAX_TAGS_PER_POST."""
+    tags = dict.fromkeys(normalize_tag(match) for match in HASHTAG_RE.findall(text))
+    return list(tags)[:MAX_TAGS_PER_POST]
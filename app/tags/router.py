@@ -0,0 +1,71 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, Path, Response
+from sqlalchemy.ext.asyncio.session import AsyncSession
+
+from app.core.deadline import time_budget
+from app.core.query_budget import query_budget
+from app.core.serialization import json_response
+from app.db.session import get_db
+from app.schemas import ApiResponse
+from app.tags.parsing import MAX_TAG_LENGTH
+from app.tags.schemas import TagFeedRequestSchema, TopTagsRequestSchema, TagFeedPage, TagCountRow
+from app.tags.tag_service import TagService
+
+
+tag_router = APIRouter(prefix="/tags", tags=['tags'])
+
+TagFeedResponse = ApiResponse[TagFeedPage]
+TopTagsResponse = ApiResponse[List[TagCountRow]]
+
+
+@tag_router.get(path="/top", response_model=TopTagsResponse, status_code=200)
+@query_budget(1)
+@time_budget(1.0)
+async def get_top_tags(
+        params: TopTagsRequestSchema = Depends(),
+        session: AsyncSession = Depends(get_db)
+) -> Response:
+    """
+        Most used hashtags, from the maintained per-tag counts.
+
+        Args:
+        - params: limit (1-100, default 10).
+        - session: Async database session.
+
+        Returns:
+        - 200: Tags with their live post counts, most used first.
+
+        Errors:
+        - 400: Validation error (e.g., limit out of range).
+    """
+    tags: List[TagCountRow] = await TagService(session=session).get_top_tags(limit=params.limit)
+
+    return json_response(type_=TopTagsResponse, value=TopTagsResponse(data=tags))
+
+
+@tag_router.get(path="/{tag}/posts", response_model=TagFeedResponse, status_code=200)
+@query_budget(2)
+@time_budget(2.0)
+async def get_tag_posts(
+        tag: str = Path(min_length=1, max_length=MAX_TAG_LENGTH + 1),
+        params: TagFeedRequestSchema = Depends(),
+        session: AsyncSession = Depends(get_db)
+) -> Response:
+    """
+        Posts with a hashtag, newest first.
+
+        Args:
+        - tag: Hashtag, with or without the leading "#" (case-insensitive).
+        - params: limit (1-100, default 20), cursor (next_cursor of the previous page).
+        - session: Async database session.
+
+        Returns:
+        - 200: Posts and next_cursor (null on the last page).
+
+        Errors:
+        - 400: Validation error or invalid cursor.
+    """
+    page: TagFeedPage = await TagService(session=session).get_tag_feed(tag=tag, data=params)
+
+    return json_response(type_=TagFeedResponse, value=TagFeedResponse(data=page))
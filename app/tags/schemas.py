@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.post.schemas import PostRow
+
+
+class TagFeedRequestSchema(BaseModel):
+    limit: int = Field(default=20, gt=0, le=100)
+    cursor: Optional[str] = Field(default=None, max_length=128)
+
+
+class TopTagsRequestSchema(BaseModel):
+    limit: int = Field(default=10, gt=0, le=100)
+
+
+@dataclass(slots=True)
+class TagFeedPage:
+    """One page of a tag feed; `next_cursor` is None on the last page."""
+    posts: List[PostRow]
+    next_cursor: Optional[str] = None
+
+
+@dataclass(slots=True)
+class TagCountRow:
+    tag: str
+    post_count: int
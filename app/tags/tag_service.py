@@ -0,0 +1,60 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio.session import AsyncSession
+
+from app.core.base_service import BaseService
+from app.post.schemas import MAX_POST_ID, PostRow
+from app.repositories.post_repo import PostRepository
+from app.repositories.tag_repo import TagRepository
+from app.tags.exceptions import InvalidCursor
+from app.tags.parsing import normalize_tag
+from app.tags.schemas import TagFeedPage, TagFeedRequestSchema, TagCountRow
+
+
+def encode_cursor(created_at: datetime, post_id: int) -> str:
+    raw: bytes = f"{created_at.isoformat()}|{post_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw_created_at, raw_post_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|")
+        created_at, post_id = datetime.fromisoformat(raw_created_at), int(raw_post_id)
+    except (binascii.Error, UnicodeError, ValueError):
+        raise InvalidCursor()
+
+    # Cursors are client input: keep forged values out of the timestamptz / integer keyset comparison.
+    if created_at.tzinfo is None or not 0 < post_id <= MAX_POST_ID:
+        raise InvalidCursor()
+    return created_at, post_id
+
+
+class TagService(BaseService):
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session=session)
+        self.tag_repo = TagRepository(session=self.session)
+        self.post_repo = PostRepository(session=self.session)
+
+    async def get_tag_feed(self, tag: str, data: TagFeedRequestSchema) -> TagFeedPage:
+        before: Optional[Tuple[datetime, int]] = decode_cursor(data.cursor) if data.cursor else None
+
+        page: List[Tuple[datetime, int]] = await self.tag_repo.get_tag_page(
+            tag=normalize_tag(tag),
+            limit=data.limit,
+            before=before,
+        )
+        if not page:
+            return TagFeedPage(posts=[])
+
+        posts: List[PostRow] = await self.post_repo.get_posts_by_ids(ids=[post_id for _, post_id in page])
+        next_cursor: Optional[str] = encode_cursor(*page[-1]) if len(page) == data.limit else None
+
+        return TagFeedPage(posts=posts, next_cursor=next_cursor)
+
+    async def get_top_tags(self, limit: int) -> List[TagCountRow]:
+        rows: List[Tuple[str, int]] = await self.tag_repo.get_top_tags(limit=limit)
+
+        return [TagCountRow(tag=tag, post_count=post_count) for tag, post_count in rows]
@@ -0,0 +1,40 @@
+"""
+    Compare two load-test result files endpoint by endpoint.
+
+    Run: python -m benchmarks.compare results/base.json results/run.json
+"""
+import argparse
+import json
+from pathlib import Path
+
+METRICS = ("throughput_rps", "p50_ms", "p95_ms", "p99_ms", "queries_per_request")
+
+
+def _change(base: float, new: float) -> str:
+    if not base:
+        return "   n/a"
+    return f"{(new - base) / base * 100:+6.1f}%"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("base", type=Path)
+    parser.add_argument("new", type=Path)
+    args = parser.parse_args()
+
+    base: dict = json.loads(args.base.read_text())
+    new: dict = json.loads(args.new.read_text())
+
+    print(f"base: {base['meta'].get('git_revision')}  new: {new['meta'].get('git_revision')}")
+    for name in sorted(set(base["endpoints"]) | set(new["endpoints"])):
+        before: dict = base["endpoints"].get(name, {})
+        after: dict = new["endpoints"].get(name, {})
+        print(name)
+        for metric in METRICS:
+            old_value: float = before.get(metric) or 0.0
+            new_value: float = after.get(metric) or 0.0
+            print(f"  {metric:20} {old_value:10.2f} -> {new_value:10.2f}  {_change(old_value, new_value)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+    Bulk data generator: millions of users, posts and likes loaded with COPY.
+
+    Rows are generated lazily and streamed in chunks through asyncpg's
+    copy_records_to_table, all in one transaction. Ids are assigned here (continuing
+    after the current max id) so foreign keys are valid without reading anything back,
+    and likes are sampled per post without replacement so (post_id, user_id) stays
+    unique. The same --seed always produces the same data.
+
+    Run: python -m benchmarks.datagen --users 1000000 --posts 20000000 --likes 50000000 [--defer-indexes]
+"""
+import argparse
+import asyncio
+import math
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Sequence
+
+import asyncpg
+
+from app.auth.utils import hash_secret
+from app.config import Settings
+from benchmarks.seed import BENCH_PASSWORD
+
+CHUNK_SIZE = 50_000
+STARTED_AT = datetime(2025, 1, 1, tzinfo=timezone.utc)
+# Multiplier of the post-index -> popularity-rank permutation; coprime with any post count it is used for.
+RANK_PRIME = 2_147_483_647
+
+_WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua ut enim ad minim veniam quis nostrud"
+).split()
+
+
+def _chunks(records: Iterator[tuple], size: int = CHUNK_SIZE) -> Iterator[List[tuple]]:
+    chunk: List[tuple] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def generate_users(first_id: int, count: int, password: bytes) -> Iterator[tuple]:
+    for offset in range(count):
+        user_id: int = first_id + offset
+        yield user_id, f"gen-user-{user_id}@example.com", password, STARTED_AT
+
+
+def generate_posts(rng: random.Random, first_id: int, count: int, user_ids: range) -> Iterator[tuple]:
+    for offset in range(count):
+        content: str = " ".join(rng.choices(_WORDS, k=rng.randint(10, 80)))
+        yield (
+            first_id + offset,
+            rng.choice(user_ids),
+            f"Generated post {first_id + offset}",
+            content,
+            STARTED_AT + timedelta(seconds=offset),
+        )
+
+
+def generate_likes(
+        rng: random.Random,
+        post_ids: range,
+        user_ids: range,
+        total: int,
+        skew: float,
+) -> Iterator[tuple]:
+    """
+        Zipf-like likes per post: the post with popularity rank r gets ~ total / (H * r^skew)
+        likes, capped at the number of users. Users are sampled without replacement per post.
+    """
+    post_count: int = len(post_ids)
+    harmonic: float = sum(1.0 / (rank ** skew) for rank in range(1, post_count + 1))
+
+    for index, post_id in enumerate(post_ids):
+        rank: int = (index * RANK_PRIME) % post_count + 1
+        expected: float = total / (harmonic * rank ** skew)
+        count: int = min(len(user_ids), int(expected) + (rng.random() < expected % 1))
+        created_at: datetime = STARTED_AT + timedelta(seconds=index)
+
+        for user_id in sorted(rng.sample(user_ids, count)):
+            yield post_id, user_id, created_at
+
+
+async def _copy(connection: asyncpg.Connection, table: str, columns: Sequence[str], records: Iterator[tuple]) -> int:
+    loaded: int = 0
+    for chunk in _chunks(records):
+        await connection.copy_records_to_table(table, records=chunk, columns=columns)
+        loaded += len(chunk)
+        print(f"\r{table}: {loaded:,}", end="", flush=True)
+    print()
+    return loaded
+
+
+async def _next_id(connection: asyncpg.Connection, table: str) -> int:
+    return await connection.fetchval(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}")
+
+
+async def _drop_secondary_indexes(connection: asyncpg.Connection, tables: Sequence[str]) -> List[str]:
+    """Drop indexes that do not back a constraint and return their definitions."""
+    rows = await connection.fetch(
+        """
+        SELECT i.indexname, i.indexdef
+        FROM pg_indexes i
+        WHERE i.schemaname = current_schema()
+          AND i.tablename = ANY($1::text[])
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conname = i.indexname)
+        """,
+        list(tables),
+    )
+    for row in rows:
+        await connection.execute(f'DROP INDEX "{row["indexname"]}"')
+    return [row["indexdef"] for row in rows]
+
+
+async def generate(
+        users: int,
+        posts: int,
+        likes: int,
+        skew: float,
+        seed_value: int,
+        defer_indexes: bool,
+) -> None:
+    settings = Settings()
+    rng = random.Random(seed_value)
+    password: bytes = hash_secret(BENCH_PASSWORD)
+
+    connection: asyncpg.Connection = await asyncpg.connect(
+        host=settings.DB_HOST,
+        port=settings.DB_PORT,
+        user=settings.DB_USER,
+        password=settings.DB_PASSWORD,
+        database=settings.DB_NAME,
+    )
+    try:
+        async with connection.transaction():
+            deferred: List[str] = []
+            if defer_indexes:
+                deferred = await _drop_secondary_indexes(connection, ("user_account", "post", "post_likes"))
+
+            first_user: int = await _next_id(connection, "user_account")
+            first_post: int = await _next_id(connection, "post")
+            user_ids = range(first_user, first_user + users)
+            post_ids = range(first_post, first_post + posts)
+
+            await _copy(connection, "user_account", ("id", "email", "password", "created_at"),
+                        generate_users(first_id=first_user, count=users, password=password))
+            await _copy(connection, "post", ("id", "user_id", "title", "content", "created_at"),
+                        generate_posts(rng=rng, first_id=first_post, count=posts, user_ids=user_ids))
+            await _copy(connection, "post_likes", ("post_id", "user_id", "created_at"),
+                        generate_likes(rng=rng, post_ids=post_ids, user_ids=user_ids, total=likes, skew=skew))
+
+            for table in ("user_account", "post"):
+                await connection.execute(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))"
+                )
+
+            for index_definition in deferred:
+                started: float = time.perf_counter()
+                await connection.execute(index_definition)
+                print(f"{index_definition} ({time.perf_counter() - started:.1f}s)")
+
+        await connection.execute("ANALYZE user_account, post, post_likes")
+    finally:
+        await connection.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--likes", type=int, default=10_000_000, help="approximate total")
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of likes per post")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--defer-indexes", action="store_true",
+                        help="drop secondary indexes before loading and rebuild them after")
+    args = parser.parse_args()
+
+    if math.gcd(RANK_PRIME, args.posts) != 1:
+        parser.error(f"--posts must not be a multiple of {RANK_PRIME}")
+
+    started: float = time.perf_counter()
+    asyncio.run(generate(
+        users=args.users,
+        posts=args.posts,
+        likes=args.likes,
+        skew=args.skew,
+        seed_value=args.seed,
+        defer_indexes=args.defer_indexes,
+    ))
+    print(f"took {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
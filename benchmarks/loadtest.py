@@ -0,0 +1,298 @@
+"""
+    Closed-loop load test against the ASGI app (in process, no network) on a seeded database.
+
+    Each virtual user signs in as a random seeded user, then issues requests picked from the
+    endpoint mix until the duration runs out. Detail/like targets follow the same Zipf skew as
+    the seeded likes, so hot posts stay hot. Reports p50/p95/p99 latency, throughput and SQL
+    queries per request for every endpoint and writes them to a JSON file.
+
+    In process, rate limiting is turned off: every ASGITransport client has the same address, so
+    the per-IP limits would answer most requests with 429. With --base-url the requests go over
+    HTTP to a running server instead (e.g. the multi-worker `python -m app.server`, started with
+    RATE_LIMIT_ENABLED=false); SQL queries per request are then not measured.
+
+    Run: python -m benchmarks.seed --truncate
+         python -m benchmarks.loadtest [--concurrency 32] [--duration 30] [--output results/run.json]
+         python -m benchmarks.loadtest --base-url http://127.0.0.1:8000
+         python -m benchmarks.compare results/base.json results/run.json
+"""
+import argparse
+import asyncio
+import contextvars
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+from sqlalchemy import event, select, func
+
+from app.core.rate_limit import install_rate_limiting
+from app.db.models import User, Post
+from app.db.session import engine
+from app.main import app
+from benchmarks.seed import BENCH_EMAIL, BENCH_PASSWORD, zipf_choice, zipf_cum_weights
+
+DEFAULT_MIX = "list=50,detail=30,like=8,unlike=7,signin=5"
+RESULTS_DIR = Path(__file__).parent / "results"
+
+_queries: contextvars.ContextVar[Optional[List[int]]] = contextvars.ContextVar("bench_queries", default=None)
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    counter: Optional[List[int]] = _queries.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+class Dataset:
+    def __init__(self, user_count: int, post_ids: List[int], skew: float) -> None:
+        self.user_count = user_count
+        self.post_ids = post_ids
+        self.cum_weights: List[float] = zipf_cum_weights(len(post_ids), skew)
+
+    def hot_post(self, rng: random.Random) -> int:
+        return zipf_choice(rng, self.post_ids, self.cum_weights)
+
+
+async def load_dataset(skew: float) -> Dataset:
+    async with engine.connect() as connection:
+        user_count: int = (await connection.execute(
+            select(func.count()).select_from(User).where(User.email.like(BENCH_EMAIL.format("%")))
+        )).scalar_one()
+        post_ids: List[int] = list((await connection.execute(
+            select(Post.id).where(Post.deleted_at == None).order_by(Post.id)
+        )).scalars())
+
+    if not user_count or not post_ids:
+        raise SystemExit("no benchmark data, run `python -m benchmarks.seed` first")
+
+    return Dataset(user_count=user_count, post_ids=post_ids, skew=skew)
+
+
+class Recorder:
+    def __init__(self, count_queries: bool) -> None:
+        self.count_queries = count_queries
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.queries: Dict[str, List[int]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    async def call(self, name: str, request: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        counter: List[int] = [0]
+        token = _queries.set(counter)
+        started: float = time.perf_counter()
+        try:
+            response: httpx.Response = await request()
+        finally:
+            elapsed: float = time.perf_counter() - started
+            _queries.reset(token)
+
+        self.latencies[name].append(elapsed)
+        if self.count_queries:
+            self.queries[name].append(counter[0])
+        self.statuses[name][response.status_code] += 1
+        return response
+
+    def report(self, wall_seconds: float) -> Dict[str, dict]:
+        return {
+            name: _summary(latencies, self.queries[name], self.statuses[name], wall_seconds)
+            for name, latencies in sorted(self.latencies.items())
+        }
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    index: int = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _summary(latencies: List[float], queries: List[int], statuses: Dict[int, int], wall_seconds: float) -> dict:
+    ordered: List[float] = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "throughput_rps": len(ordered) / wall_seconds,
+        "p50_ms": _percentile(ordered, 0.50) * 1000,
+        "p95_ms": _percentile(ordered, 0.95) * 1000,
+        "p99_ms": _percentile(ordered, 0.99) * 1000,
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "queries_per_request": statistics.fmean(queries) if queries else None,
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+    }
+
+
+async def _signin(client: httpx.AsyncClient, recorder: Recorder, rng: random.Random, dataset: Dataset) -> None:
+    email: str = BENCH_EMAIL.format(rng.randrange(dataset.user_count))
+    response: httpx.Response = await recorder.call("signin", lambda: client.post(
+        "/auth/signin", json={"email": email, "password": BENCH_PASSWORD}
+    ))
+    # The auth cookies are Secure, so httpx never sends them to a plain-http --base-url: pass the token by hand.
+    if client.base_url.scheme == "http" and "at" in response.cookies:
+        client.headers["Cookie"] = f"at={response.cookies['at']}"
+
+
+async def virtual_user(
+        index: int,
+        deadline: float,
+        mix: Dict[str, int],
+        dataset: Dataset,
+        recorder: Recorder,
+        seed: int,
+        base_url: Optional[str],
+) -> None:
+    rng = random.Random(seed * 10_000 + index)
+    names: List[str] = list(mix)
+    weights: List[int] = list(mix.values())
+    client_options: dict = (
+        {"base_url": base_url, "timeout": 30.0} if base_url
+        else {"transport": httpx.ASGITransport(app=app), "base_url": "https://bench"}
+    )
+
+    async with httpx.AsyncClient(**client_options) as client:
+        await _signin(client, recorder, rng, dataset)
+
+        while time.perf_counter() < deadline:
+            name: str = rng.choices(names, weights)[0]
+
+            if name == "signin":
+                await _signin(client, recorder, rng, dataset)
+            elif name == "list":
+                offset: int = rng.randrange(0, max(1, min(len(dataset.post_ids) - 20, 1000)))
+                await recorder.call(name, lambda: client.get("/posts", params={"limit": 20, "offset": offset}))
+            elif name == "detail":
+                post_id: int = dataset.hot_post(rng)
+                await recorder.call(name, lambda: client.get(f"/post/{post_id}"))
+            elif name == "like":
+                post_id = dataset.hot_post(rng)
+                await recorder.call(name, lambda: client.post(f"/like/{post_id}"))
+            elif name == "unlike":
+                post_id = dataset.hot_post(rng)
+                await recorder.call(name, lambda: client.delete(f"/like/{post_id}"))
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    mix: Dict[str, int] = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = int(weight)
+
+    unknown = set(mix) - {"signin", "list", "detail", "like", "unlike"}
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown endpoints in mix: {', '.join(sorted(unknown))}")
+    return mix
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(
+        concurrency: int,
+        duration: float,
+        mix: Dict[str, int],
+        skew: float,
+        seed: int,
+        base_url: Optional[str] = None,
+) -> dict:
+    dataset: Dataset = await load_dataset(skew=skew)
+    recorder = Recorder(count_queries=base_url is None)
+    if base_url is None:
+        install_rate_limiting(None)
+
+    started: float = time.perf_counter()
+    await asyncio.gather(*(
+        virtual_user(
+            index=index,
+            deadline=started + duration,
+            mix=mix,
+            dataset=dataset,
+            recorder=recorder,
+            seed=seed,
+            base_url=base_url,
+        )
+        for index in range(concurrency)
+    ))
+    wall_seconds: float = time.perf_counter() - started
+    await engine.dispose()
+
+    endpoints: Dict[str, dict] = recorder.report(wall_seconds=wall_seconds)
+    total_requests: int = sum(stats["requests"] for stats in endpoints.values())
+
+    return {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "git_revision": _git_revision(),
+            "target": base_url or "asgi",
+            "python": platform.python_version(),
+            "concurrency": concurrency,
+            "duration_s": duration,
+            "mix": mix,
+            "skew": skew,
+            "seed": seed,
+            "users": dataset.user_count,
+            "posts": len(dataset.post_ids),
+        },
+        "total": {
+            "requests": total_requests,
+            "throughput_rps": total_requests / wall_seconds,
+            "wall_s": wall_seconds,
+        },
+        "endpoints": endpoints,
+    }
+
+
+def _format_queries(value: Optional[float]) -> str:
+    return f"{value:6.2f}" if value is not None else f"{'-':>6}"
+
+
+def print_report(result: dict) -> None:
+    print(f"{'endpoint':10} {'reqs':>7} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'q/req':>6}")
+    for name, stats in result["endpoints"].items():
+        print(
+            f"{name:10} {stats['requests']:7d} {stats['throughput_rps']:8.1f} {stats['p50_ms']:8.2f} "
+            f"{stats['p95_ms']:8.2f} {stats['p99_ms']:8.2f} {_format_queries(stats['queries_per_request'])}"
+        )
+    total: dict = result["total"]
+    print(f"{'total':10} {total['requests']:7d} {total['throughput_rps']:8.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX))
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of detail/like targets")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--base-url", default=None, help="load a running server over HTTP instead of in process")
+    parser.add_argument("--output", type=Path, default=None, help="JSON file (default: results/<timestamp>.json)")
+    args = parser.parse_args()
+
+    engine.echo = False
+    result: dict = asyncio.run(run(
+        concurrency=args.concurrency,
+        duration=args.duration,
+        mix=args.mix,
+        skew=args.skew,
+        seed=args.seed,
+        base_url=args.base_url,
+    ))
+    print_report(result)
+
+    output: Path = args.output or RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2))
+    print(f"saved {output}")
+
+
+if __name__ == "__main__":
+    main()
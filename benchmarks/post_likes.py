@@ -0,0 +1,166 @@
+"""
+    post_likes layout benchmark: loads the same synthetic likes into the old layout (surrogate
+    id, unique (post_id, user_id), post_id index) and the HASH (post_id)-partitioned one
+    (composite primary key), then times the app's two hot statements on each, interleaved:
+    the single-row like insert and the per-post likes count.
+
+    Post popularity is skewed, so counts hit a few hot posts as well as the long tail.
+    Everything runs in one transaction that is rolled back; the scratch tables never commit.
+    Run it against production-like hardware and settings, since the timings are only as
+    good as the host they were measured on.
+
+    Run: python -m benchmarks.post_likes [--rows 2000000] [--posts 100000] [--partitions 16] [--samples 2000]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.db.session import engine
+
+PLAIN = "bench_post_likes_plain"
+HASHED = "bench_post_likes_hash"
+
+
+def skewed_post_id(posts: int) -> int:
+    # Same skew as the generated data: a few posts hold most of the likes.
+    return 1 + int(posts * random.random() ** 3)
+
+
+async def create_tables(conn: AsyncConnection, rows: int, posts: int, partitions: int) -> None:
+    await conn.execute(text(
+        f"""
+        CREATE TABLE {PLAIN} (
+            id serial PRIMARY KEY,
+            post_id integer NOT NULL,
+            user_id integer NOT NULL,
+            created_at timestamptz NOT NULL,
+            UNIQUE (post_id, user_id)
+        )
+        """
+    ))
+    await conn.execute(text(f"CREATE INDEX ON {PLAIN} (post_id)"))
+    await conn.execute(text(
+        f"""
+        CREATE TABLE {HASHED} (
+            post_id integer NOT NULL,
+            user_id integer NOT NULL,
+            created_at timestamptz NOT NULL,
+            PRIMARY KEY (post_id, user_id)
+        ) PARTITION BY HASH (post_id)
+        """
+    ))
+    for remainder in range(partitions):
+        await conn.execute(text(
+            f"CREATE TABLE {HASHED}_p{remainder} PARTITION OF {HASHED} "
+            f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+        ))
+
+    # user_id is the row number, so every (post_id, user_id) pair is unique.
+    await conn.execute(text(
+        f"""
+        INSERT INTO {PLAIN} (post_id, user_id, created_at)
+        SELECT 1 + floor(CAST(:posts AS integer) * random() ^ 3), g, now() - g * interval '1 second'
+        FROM generate_series(1, :rows) AS g
+        """
+    ), {"posts": posts, "rows": rows})
+    await conn.execute(text(
+        f"INSERT INTO {HASHED} (post_id, user_id, created_at) SELECT post_id, user_id, created_at FROM {PLAIN}"
+    ))
+    await conn.execute(text(f"ANALYZE {PLAIN}"))
+    await conn.execute(text(f"ANALYZE {HASHED}"))
+
+
+async def table_sizes(conn: AsyncConnection) -> Dict[str, Dict[str, int]]:
+    """Heap + index bytes per layout; for the partitioned one, summed over its partitions."""
+    sizes: Dict[str, Dict[str, int]] = {}
+    for table in (PLAIN, HASHED):
+        # pg_partition_tree() returns no rows for a plain table, so add the table itself.
+        row = (await conn.execute(text(
+            """
+            SELECT sum(pg_table_size(relid)), sum(pg_indexes_size(relid))
+            FROM (
+                SELECT relid FROM pg_partition_tree(CAST(:table AS regclass))
+                UNION
+                SELECT CAST(:table AS regclass)
+            ) AS tree
+            """
+        ), {"table": table})).one()
+        sizes[table] = {"table": int(row[0]), "indexes": int(row[1])}
+    return sizes
+
+
+async def timed(conn: AsyncConnection, statement: str, params: Dict[str, int]) -> float:
+    started: float = time.perf_counter()
+    await conn.execute(text(statement), params)
+    return (time.perf_counter() - started) * 1000
+
+
+async def measure(conn: AsyncConnection, rows: int, posts: int, samples: int) -> Dict[str, Dict[str, List[float]]]:
+    """Per layout and statement, the latency of each sample in milliseconds."""
+    timings: Dict[str, Dict[str, List[float]]] = {table: {"insert": [], "count": []} for table in (PLAIN, HASHED)}
+
+    for sample in range(samples):
+        like: Dict[str, int] = {"post_id": skewed_post_id(posts), "user_id": rows + 1 + sample}
+        post: Dict[str, int] = {"post_id": skewed_post_id(posts)}
+        # Alternate which layout goes first, so neither one always gets the warmer cache.
+        tables = (PLAIN, HASHED) if sample % 2 == 0 else (HASHED, PLAIN)
+        for table in tables:
+            timings[table]["insert"].append(await timed(
+                conn,
+                f"INSERT INTO {table} (post_id, user_id, created_at) VALUES (:post_id, :user_id, now()) "
+                f"ON CONFLICT DO NOTHING",
+                like,
+            ))
+            timings[table]["count"].append(await timed(
+                conn,
+                f"SELECT count(*) FROM {table} WHERE post_id = :post_id",
+                post,
+            ))
+    return timings
+
+
+async def run(rows: int, posts: int, partitions: int, samples: int) -> None:
+    try:
+        async with engine.connect() as conn:
+            trans = await conn.begin()
+            try:
+                print(f"loading {rows} likes over {posts} posts into both layouts...")
+                await create_tables(conn, rows=rows, posts=posts, partitions=partitions)
+                sizes = await table_sizes(conn)
+                timings = await measure(conn, rows=rows, posts=posts, samples=samples)
+            finally:
+                await trans.rollback()
+    finally:
+        await engine.dispose()
+
+    labels: Dict[str, str] = {PLAIN: "plain", HASHED: f"hash/{partitions}"}
+    print(f"\n{'layout':<9} {'statement':<9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for statement in ("insert", "count"):
+        for table in (PLAIN, HASHED):
+            cuts: List[float] = statistics.quantiles(timings[table][statement], n=100)
+            print(f"{labels[table]:<9} {statement:<9} {cuts[49]:>8.3f} {cuts[94]:>8.3f} {cuts[98]:>8.3f}")
+
+    print(f"\n{'layout':<9} {'table MB':>9} {'index MB':>9}")
+    for table in (PLAIN, HASHED):
+        print(f"{labels[table]:<9} {sizes[table]['table'] / 2 ** 20:>9.1f} {sizes[table]['indexes'] / 2 ** 20:>9.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2_000_000, help="likes loaded into each layout")
+    parser.add_argument("--posts", type=int, default=100_000)
+    parser.add_argument("--partitions", type=int, default=16)
+    parser.add_argument("--samples", type=int, default=2000, help="timed statements per layout")
+    args = parser.parse_args()
+
+    asyncio.run(run(rows=args.rows, posts=args.posts, partitions=args.partitions, samples=args.samples))
+
+
+if __name__ == "__main__":
+    main()
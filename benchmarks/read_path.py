@@ -0,0 +1,113 @@
+"""
+    Benchmark: one `/posts` page through the ORM path vs the Core row path.
+
+    orm:  select(Post) + likes subquery -> Post instances in the identity map -> PostDTO.
+    core: PostRepository.get_posts (explicit columns, Row tuples -> PostRow slots dataclasses).
+
+    Reports client-side CPU time and tracemalloc peak per page. Needs a database
+    (settings from .env) with at least --rows live posts.
+
+    Run: python -m benchmarks.read_path [--rows 100] [--repeat 200]
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+from typing import Awaitable, Callable, List
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Post, PostLikes
+from app.db.session import AsyncSessionLocal, engine
+from app.post.schemas import PostDTO, AuthorDTO
+from app.repositories.post_repo import PostRepository
+
+
+async def orm_page(session: AsyncSession, rows: int) -> list:
+    likes_count_sq = (
+        select(func.count())
+        .select_from(PostLikes)
+        .where(PostLikes.post_id == Post.id)
+        .scalar_subquery()
+    )
+    stmt = (
+        select(Post)
+        .where(Post.deleted_at == None)
+        .add_columns(likes_count_sq.label("likes_count"))
+        .order_by(Post.id)
+        .limit(rows)
+    )
+    result = await session.execute(stmt)
+    return [
+        PostDTO(
+            id=post.id,
+            title=post.title,
+            content=post.content,
+            author=AuthorDTO(id=post.user_id),
+            likes_count=int(likes_count),
+            views=post.views,
+        )
+        for post, likes_count in result.tuples().all()
+    ]
+
+
+async def core_page(session: AsyncSession, rows: int) -> list:
+    return await PostRepository(session=session).get_posts(limit=rows, offset=0)
+
+
+async def _measure(
+        page: Callable[[AsyncSession, int], Awaitable[list]],
+        rows: int,
+        repeat: int,
+) -> dict:
+    cpu_total: float = 0.0
+    peak_total: int = 0
+
+    for _ in range(repeat):
+        async with AsyncSessionLocal() as session:
+            await session.connection()
+
+            tracemalloc.start()
+            started: float = time.process_time()
+            result: list = await page(session, rows)
+            cpu_total += time.process_time() - started
+            peak_total += tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            assert len(result) == rows, f"expected {rows} posts, got {len(result)}; seed more data"
+
+    return {
+        "cpu_us_per_page": cpu_total / repeat * 1e6,
+        "peak_kib_per_page": peak_total / repeat / 1024,
+    }
+
+
+async def _run(rows: int, repeat: int) -> None:
+    engine.echo = False
+
+    await _measure(orm_page, rows, 5)
+    await _measure(core_page, rows, 5)
+
+    results: List[tuple[str, dict]] = [
+        ("orm", await _measure(orm_page, rows, repeat)),
+        ("core", await _measure(core_page, rows, repeat)),
+    ]
+    await engine.dispose()
+
+    print(f"rows={rows} repeat={repeat}")
+    for name, stats in results:
+        print(f"{name:5} cpu {stats['cpu_us_per_page']:9.1f} us/page   peak {stats['peak_kib_per_page']:8.1f} KiB/page")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(_run(rows=args.rows, repeat=args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+    Seed a reproducible benchmark dataset: users, posts and a Zipf-skewed like distribution.
+
+    All seeded users share the password BENCH_PASSWORD, so the load test can sign in as any
+    of them. The same --seed always produces the same rows.
+
+    Run: python -m benchmarks.seed [--users 1000] [--posts 20000] [--likes 200000] [--truncate]
+"""
+import argparse
+import asyncio
+import bisect
+import itertools
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Sequence
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.auth.utils import hash_secret
+from app.db.models import User, Post, PostLikes
+from app.db.session import engine
+
+BENCH_PASSWORD = "bench-password"
+BENCH_EMAIL = "bench-user-{}@example.com"
+BATCH_SIZE = 5000
+
+
+def zipf_cum_weights(count: int, skew: float) -> List[float]:
+    return list(itertools.accumulate(1.0 / (rank ** skew) for rank in range(1, count + 1)))
+
+
+def zipf_choice(rng: random.Random, items: Sequence[int], cum_weights: List[float]) -> int:
+    index: int = bisect.bisect_left(cum_weights, rng.random() * cum_weights[-1])
+    return items[min(index, len(items) - 1)]
+
+
+def _batches(rows: Iterator[dict], size: int = BATCH_SIZE) -> Iterator[List[dict]]:
+    while batch := list(itertools.islice(rows, size)):
+        yield batch
+
+
+async def _insert(connection: AsyncConnection, model, rows: Iterator[dict]) -> None:
+    for batch in _batches(rows):
+        await connection.execute(insert(model), batch)
+
+
+async def seed(users: int, posts: int, likes: int, skew: float, seed_value: int, truncate: bool) -> None:
+    rng = random.Random(seed_value)
+    password: bytes = hash_secret(BENCH_PASSWORD)
+    started_at: datetime = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    async with engine.begin() as connection:
+        if truncate:
+            await connection.execute(text(
+                "TRUNCATE post_tags, tag_counts, post_likes, post, user_sessions, user_account RESTART IDENTITY CASCADE"
+            ))
+
+        await _insert(connection, User, (
+            {"email": BENCH_EMAIL.format(i), "password": password, "created_at": started_at}
+            for i in range(users)
+        ))
+        user_ids: List[int] = list((await connection.execute(
+            select(User.id).where(User.email.like(BENCH_EMAIL.format("%"))).order_by(User.id)
+        )).scalars())
+
+        await _insert(connection, Post, (
+            {
+                "user_id": rng.choice(user_ids),
+                "title": f"Benchmark post {i}",
+                "content": " ".join(rng.choices(_WORDS, k=rng.randint(10, 80))),
+                "created_at": started_at + timedelta(seconds=i),
+            }
+            for i in range(posts)
+        ))
+        post_ids: List[int] = list((await connection.execute(
+            select(Post.id).where(Post.title.like("Benchmark post %")).order_by(Post.id)
+        )).scalars())
+
+        cum_weights: List[float] = zipf_cum_weights(len(post_ids), skew)
+        pairs: set[tuple[int, int]] = set()
+        attempts: int = 0
+        while len(pairs) < likes and attempts < likes * 10:
+            pairs.add((zipf_choice(rng, post_ids, cum_weights), rng.choice(user_ids)))
+            attempts += 1
+
+        await _insert(connection, PostLikes, (
+            {"post_id": post_id, "user_id": user_id, "created_at": started_at}
+            for post_id, user_id in sorted(pairs)
+        ))
+
+        await connection.execute(text("ANALYZE user_account, post, post_likes"))
+
+    await engine.dispose()
+    print(f"seeded users={len(user_ids)} posts={len(post_ids)} likes={len(pairs)}")
+
+
+_WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua ut enim ad minim veniam quis nostrud"
+).split()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--posts", type=int, default=20000)
+    parser.add_argument("--likes", type=int, default=200000)
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of likes per post")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--truncate", action="store_true", help="wipe all app tables first")
+    args = parser.parse_args()
+
+    engine.echo = False
+    started: float = time.perf_counter()
+    asyncio.run(seed(
+        users=args.users,
+        posts=args.posts,
+        likes=args.likes,
+        skew=args.skew,
+        seed_value=args.seed,
+        truncate=args.truncate,
+    ))
+    print(f"took {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
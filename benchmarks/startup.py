@@ -0,0 +1,126 @@
+"""
+    Startup cost: import time of app.main and time to first request of a fresh server.
+
+    import:  fresh interpreter per run, wall time of `import app.main` (median of --runs).
+    startup: spawns `python -m app.server` with one worker, then measures spawn -> /health/ready,
+             the first GET /posts and the median of the following requests, once with the
+             lifespan warm-up (WARMUP_ENABLED=true) and once without.
+
+    Needs the same database/.env as the API (the warm-up and /posts hit PostgreSQL).
+
+    Run: python -m benchmarks.startup [--runs 5] [--port 8765] [--importtime]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+
+IMPORT_SNIPPET = (
+    "import time; started = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - started)"
+)
+
+
+def measure_import(runs: int) -> float:
+    timings: List[float] = []
+    for _ in range(runs):
+        output: str = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET], capture_output=True, text=True, check=True
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(timings)
+
+
+def print_importtime(top: int) -> None:
+    """Slowest modules by cumulative import time (python -X importtime)."""
+    stderr: str = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"], capture_output=True, text=True, check=True
+    ).stderr
+
+    modules: List[tuple[int, str]] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        modules.append((int(cumulative), name))
+
+    for cumulative_us, name in sorted(modules, reverse=True)[:top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+
+def _wait_ready(client: httpx.Client, started: float, timeout: float) -> float:
+    while time.perf_counter() - started < timeout:
+        try:
+            if client.get("/health/ready").status_code == 200:
+                return time.perf_counter() - started
+        except httpx.TransportError:
+            pass
+        time.sleep(0.01)
+    raise SystemExit("server did not become ready in time")
+
+
+def _timed_get(client: httpx.Client, path: str) -> float:
+    started: float = time.perf_counter()
+    response: httpx.Response = client.get(path)
+    response.raise_for_status()
+    return time.perf_counter() - started
+
+
+def measure_startup(port: int, warmup: bool, requests: int) -> Dict[str, float]:
+    env: Dict[str, str] = {
+        **os.environ,
+        "PORT": str(port),
+        "WEB_CONCURRENCY": "1",
+        "WARMUP_ENABLED": "true" if warmup else "false",
+        "LOG_LEVEL": "WARNING",
+    }
+
+    started: float = time.perf_counter()
+    server = subprocess.Popen([sys.executable, "-m", "app.server"], env=env)
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=30.0) as client:
+            ready_s: float = _wait_ready(client, started, timeout=60.0)
+            first_s: float = _timed_get(client, "/posts?limit=20")
+            steady: List[float] = [_timed_get(client, "/posts?limit=20") for _ in range(requests)]
+    finally:
+        server.terminate()
+        server.wait()
+
+    return {
+        "ready_ms": ready_s * 1000,
+        "first_request_ms": first_s * 1000,
+        "steady_p50_ms": statistics.median(steady) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--requests", type=int, default=20, help="requests after the first one")
+    parser.add_argument("--importtime", action="store_true", help="also list the slowest imports")
+    args = parser.parse_args()
+
+    print(f"import app.main: {measure_import(args.runs) * 1000:.1f} ms (median of {args.runs})")
+    if args.importtime:
+        print_importtime(top=15)
+
+    print(f"{'mode':10} {'ready ms':>10} {'1st req ms':>11} {'p50 ms':>8}")
+    for warmup in (False, True):
+        runs: List[Dict[str, float]] = [
+            measure_startup(port=args.port, warmup=warmup, requests=args.requests) for _ in range(args.runs)
+        ]
+        summary: Dict[str, float] = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+        print(
+            f"{'warm' if warmup else 'cold':10} {summary['ready_ms']:10.1f} "
+            f"{summary['first_request_ms']:11.2f} {summary['steady_p50_ms']:8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
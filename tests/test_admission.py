@@ -0,0 +1,82 @@
+import asyncio
+import random
+from typing import List
+
+import pytest
+
+from app.core.admission import _Gate
+
+pytestmark = pytest.mark.anyio
+
+LIMIT = 4
+
+
+async def request(gate: _Gate, rng: random.Random) -> bool:
+    if not await gate.acquire(timeout=rng.uniform(0.0, 0.004)):
+        return False
+    try:
+        await asyncio.sleep(rng.uniform(0.0, 0.004))
+    finally:
+        gate.release()
+    return True
+
+
+def assert_idle(gate: _Gate) -> None:
+    assert gate._semaphore._value == LIMIT
+    assert gate.in_flight == 0
+    assert gate.waiting == 0
+
+
+async def test_permits_are_restored_after_timeouts_under_contention() -> None:
+    gate = _Gate(limit=LIMIT)
+    rng = random.Random(7)
+
+    results: List[bool] = await asyncio.gather(*(request(gate, rng) for _ in range(500)))
+
+    assert True in results and False in results
+    assert_idle(gate)
+
+
+async def test_permits_are_restored_when_waiters_are_cancelled() -> None:
+    gate = _Gate(limit=LIMIT)
+    rng = random.Random(11)
+
+    tasks = [asyncio.create_task(request(gate, rng)) for _ in range(200)]
+    for task in tasks[::3]:
+        asyncio.get_running_loop().call_later(rng.uniform(0.0, 0.004), task.cancel)
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert_idle(gate)
+
+
+async def test_queue_is_capped_at_the_limit() -> None:
+    gate = _Gate(limit=1)
+    assert await gate.acquire(timeout=1.0)
+
+    waiter = asyncio.create_task(gate.acquire(timeout=1.0))
+    await asyncio.sleep(0)
+
+    assert gate.waiting == 1
+    assert not await gate.acquire(timeout=1.0)
+
+    gate.release()
+    assert await waiter
+    gate.release()
+    assert gate._semaphore._value == 1
+
+
+async def test_permit_granted_in_the_same_tick_as_a_cancel_is_not_kept() -> None:
+    gate = _Gate(limit=1)
+    assert await gate.acquire(timeout=1.0)
+    waiter = asyncio.create_task(gate.acquire(timeout=1.0))
+    await asyncio.sleep(0)
+
+    # Wake the waiter and cancel it before it gets to run.
+    gate.release()
+    waiter.cancel()
+    [result] = await asyncio.gather(waiter, return_exceptions=True)
+
+    assert isinstance(result, asyncio.CancelledError)
+    assert gate._semaphore._value == 1
+    assert gate.waiting == 0
+    assert gate.in_flight == 0
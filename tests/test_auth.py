@@ -0,0 +1,63 @@
+import bcrypt
+import httpx
+import pytest
+from sqlalchemy import select
+
+from app.auth.utils import bcrypt_rounds, hash_secret, needs_rehash, verify_secret
+from app.core.dependencies import get_settings
+from app.db.models import User
+from app.db.session import AsyncSessionLocal
+
+PASSWORD = "secret-1"
+
+
+def test_bcrypt_rounds() -> None:
+    assert bcrypt_rounds(bcrypt.hashpw(b"x", bcrypt.gensalt(rounds=5))) == 5
+
+
+@pytest.mark.parametrize("hashed_rounds, rounds, expected", [(4, 4, False), (4, 5, True), (6, 5, True)])
+def test_needs_rehash(hashed_rounds: int, rounds: int, expected: bool) -> None:
+    hashed: bytes = bcrypt.hashpw(b"x", bcrypt.gensalt(rounds=hashed_rounds))
+
+    assert needs_rehash(hashed_value=hashed, rounds=rounds) is expected
+
+
+def test_needs_rehash_defaults_to_configured_rounds() -> None:
+    rounds: int = get_settings().BCRYPT_ROUNDS
+
+    assert not needs_rehash(hashed_value=hash_secret(PASSWORD))
+    assert needs_rehash(hashed_value=bcrypt.hashpw(b"x", bcrypt.gensalt(rounds=rounds + 1)))
+
+
+async def stored_password(email: str) -> bytes:
+    async with AsyncSessionLocal() as session:
+        return (await session.execute(select(User.password).where(User.email == email))).scalar_one()
+
+
+@pytest.mark.anyio
+async def test_signin_rehashes_to_configured_cost(
+        client: httpx.AsyncClient,
+        make_user,
+        monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    await make_user("old-cost@example.com", hash_secret(PASSWORD, rounds=4))
+    monkeypatch.setattr(get_settings(), "BCRYPT_ROUNDS", 5)
+
+    # The rehash is a BackgroundTask; ASGITransport returns once it finished.
+    response = await client.post("/auth/signin", json={"email": "old-cost@example.com", "password": PASSWORD})
+
+    assert response.status_code == 200, response.text
+    password: bytes = await stored_password("old-cost@example.com")
+    assert bcrypt_rounds(password) == 5
+    assert verify_secret(hashed_value=password, value=PASSWORD)
+
+
+@pytest.mark.anyio
+async def test_signin_keeps_hash_at_configured_cost(client: httpx.AsyncClient, make_user) -> None:
+    hashed: bytes = hash_secret(PASSWORD)
+    await make_user("same-cost@example.com", hashed)
+
+    response = await client.post("/auth/signin", json={"email": "same-cost@example.com", "password": PASSWORD})
+
+    assert response.status_code == 200, response.text
+    assert await stored_password("same-cost@example.com") == hashed
@@ -0,0 +1,136 @@
+import asyncio
+from time import monotonic
+from typing import Dict, List
+
+import httpx
+import pytest
+from fastapi import BackgroundTasks, FastAPI, Request
+from sqlalchemy import text
+
+from app.config import Settings
+from app.core.deadline import Deadline, DeadlineMiddleware, _current, time_budget
+from app.core.query_budget import QueryLog
+from app.db.session import AsyncSessionLocal
+
+pytestmark = pytest.mark.anyio
+
+
+def make_app(events: List[str]) -> FastAPI:
+    app = FastAPI()
+
+    async def after_response(seconds: float) -> None:
+        events.append(f"deadline={_current.get()}")
+        try:
+            await asyncio.sleep(seconds)
+        except asyncio.CancelledError:
+            events.append("cancelled")
+            raise
+        events.append("done")
+
+    @app.post("/background")
+    @time_budget(0.2)
+    async def background(background_tasks: BackgroundTasks, seconds: float = 0.0) -> Dict[str, str]:
+        background_tasks.add_task(after_response, seconds)
+        return {"status": "ok"}
+
+    @app.post("/body")
+    @time_budget(0.5)
+    async def body(request: Request) -> Dict[str, int]:
+        # Awaits first, like a dependency querying the DB, so the body is read after the
+        # middleware started watching for a disconnect.
+        await asyncio.sleep(0.01)
+        return {"size": len(await request.body())}
+
+    @app.get("/slow")
+    @time_budget(0.1)
+    async def slow() -> Dict[str, str]:
+        await asyncio.sleep(5)
+        return {"status": "ok"}
+
+    app.add_middleware(DeadlineMiddleware, router=app.router, default_seconds=1.0, default_lock_timeout_ms=100)
+    return app
+
+
+@pytest.fixture
+def events() -> List[str]:
+    return []
+
+
+@pytest.fixture
+async def client(events: List[str]):
+    # Like uvicorn, ASGITransport answers receive() with http.disconnect once the response is sent.
+    transport = httpx.ASGITransport(app=make_app(events))
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        yield client
+
+
+async def test_background_task_is_not_cancelled_after_response(client: httpx.AsyncClient, events: List[str]) -> None:
+    response = await client.post("/background", params={"seconds": 0.01})
+
+    assert response.status_code == 200
+    assert events == ["deadline=None", "done"]
+
+
+async def test_background_task_may_outlive_the_time_budget(client: httpx.AsyncClient, events: List[str]) -> None:
+    response = await client.post("/background", params={"seconds": 0.5})
+
+    assert response.status_code == 200
+    assert events == ["deadline=None", "done"]
+
+
+@pytest.mark.parametrize("content", [b"", b'{"a": 1}'])
+async def test_request_body_reaches_the_app(client: httpx.AsyncClient, content: bytes) -> None:
+    response = await client.post("/body", content=content)
+
+    assert response.status_code == 200
+    assert response.json() == {"size": len(content)}
+
+
+async def test_handler_over_budget_gets_504(client: httpx.AsyncClient) -> None:
+    response = await client.get("/slow")
+
+    assert response.status_code == 504
+
+
+async def test_deadline_is_set_while_handling() -> None:
+    seen: List[int] = []
+    app = FastAPI()
+
+    @app.get("/deadline")
+    @time_budget(0.5, lock_timeout_ms=50)
+    async def deadline() -> Dict[str, str]:
+        seen.append(_current.get().lock_timeout_ms)
+        return {"status": "ok"}
+
+    app.add_middleware(DeadlineMiddleware, router=app.router, default_seconds=1.0, default_lock_timeout_ms=100)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+        response = await client.get("/deadline")
+
+    assert response.status_code == 200
+    assert seen == [50]
+
+
+async def show_lock_timeout(lock_timeout_ms: int) -> str:
+    token = _current.set(Deadline(expires_at=monotonic() + 1.0, lock_timeout_ms=lock_timeout_ms))
+    try:
+        async with AsyncSessionLocal() as session:
+            return await session.scalar(text("SHOW lock_timeout"))
+    finally:
+        _current.reset(token)
+
+
+@pytest.mark.postgres
+async def test_default_lock_timeout_costs_no_query(db: None, query_counter: QueryLog) -> None:
+    lock_timeout: str = await show_lock_timeout(Settings().DB_LOCK_TIMEOUT_MS)
+
+    assert lock_timeout == "2s"
+    assert query_counter.statements == ["SHOW lock_timeout"]
+
+
+@pytest.mark.postgres
+async def test_route_lock_timeout_is_set_and_counted(db: None, query_counter: QueryLog) -> None:
+    lock_timeout: str = await show_lock_timeout(50)
+
+    assert lock_timeout == "50ms"
+    assert query_counter.count == 2
+    assert "set_config" in query_counter.statements[0]
@@ -0,0 +1,46 @@
+import pytest
+
+from app.core.etag import etag_matches, make_list_etag, make_post_etag
+
+ETAG = make_post_etag(post_id=1, version=3, likes_count=0)
+
+
+@pytest.mark.parametrize(
+    ("if_none_match", "expected"),
+    [
+        (None, False),
+        ("", False),
+        ('W/"p1-v3-l0"', True),
+        ('"p1-v3-l0"', True),
+        ('  W/"p1-v3-l0"  ', True),
+        ('W/"p1-v2-l0"', False),
+        ('W/"p2-v3-l0"', False),
+        ("*", True),
+        (" * ", True),
+        ('W/"p1-v1-l0", W/"p1-v3-l0"', True),
+        ('"p1-v1-l0","p1-v3-l0"', True),
+        ('W/"p1-v1-l0", W/"p1-v2-l0"', False),
+    ],
+)
+def test_etag_matches(if_none_match, expected: bool) -> None:
+    assert etag_matches(if_none_match=if_none_match, etag=ETAG) is expected
+
+
+def test_strong_etag_matches_weak_header() -> None:
+    assert etag_matches(if_none_match='W/"p1-v3-l0"', etag='"p1-v3-l0"')
+
+
+def test_post_etag_is_weak_and_changes_with_version_and_likes() -> None:
+    assert ETAG == 'W/"p1-v3-l0"'
+    assert make_post_etag(post_id=1, version=4, likes_count=0) != ETAG
+    assert make_post_etag(post_id=1, version=3, likes_count=1) != ETAG
+
+
+def test_list_etag_depends_on_ids_versions_likes_and_order() -> None:
+    page = make_list_etag([(1, 1, 0), (2, 1, 5)])
+
+    assert page.startswith('W/"l')
+    assert make_list_etag([(1, 1, 0), (2, 1, 5)]) == page
+    assert make_list_etag([(1, 1, 0), (2, 2, 5)]) != page
+    assert make_list_etag([(1, 1, 0), (2, 1, 6)]) != page
+    assert make_list_etag([(2, 1, 5), (1, 1, 0)]) != page
@@ -0,0 +1,60 @@
+from time import monotonic
+
+import pytest
+
+from app.core.deadline import Deadline, _current
+from app.db.session import AsyncSessionLocal
+from app.idempotency.exceptions import IdempotencyKeyInUse
+from app.idempotency.schemas import IdempotencyKeyDTO
+from app.idempotency.service import IdempotencyService
+from app.repositories.idempotency_repo import IdempotencyRepository
+
+pytestmark = pytest.mark.anyio
+
+KEY = IdempotencyKeyDTO(key="key-1", request_hash=b"hash")
+
+
+async def hold_key(user_id: int) -> None:
+    """Claims KEY as a first request that is still running."""
+    async with AsyncSessionLocal() as session:
+        assert await IdempotencyRepository(session).claim_key(
+            user_id=user_id, key=KEY.key, request_hash=KEY.request_hash, ttl=60, lock_timeout=10,
+        )
+
+
+async def run_duplicate(user_id: int) -> None:
+    async def action() -> int:
+        raise AssertionError("the duplicate must not run the action")
+
+    async with AsyncSessionLocal() as session:
+        await IdempotencyService(session=session).run(user_id=user_id, idempotency_key=KEY, type_=int, action=action)
+
+
+async def test_duplicate_gives_up_before_its_deadline(user) -> None:
+    await hold_key(user_id=user.id)
+
+    started: float = monotonic()
+    token = _current.set(Deadline(expires_at=started + 0.5, lock_timeout_ms=100))
+    try:
+        with pytest.raises(IdempotencyKeyInUse):
+            await run_duplicate(user_id=user.id)
+    finally:
+        _current.reset(token)
+
+    assert monotonic() - started < 0.5
+
+
+async def test_duplicate_replays_the_stored_response(user) -> None:
+    await hold_key(user_id=user.id)
+    async with AsyncSessionLocal() as session:
+        await IdempotencyRepository(session).complete_key(user_id=user.id, key=KEY.key, response=b"42")
+
+    async def action() -> int:
+        raise AssertionError("a replay must not run the action")
+
+    async with AsyncSessionLocal() as session:
+        result = await IdempotencyService(session=session).run(
+            user_id=user.id, idempotency_key=KEY, type_=int, action=action,
+        )
+
+    assert result == (42, True)
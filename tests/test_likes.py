@@ -0,0 +1,43 @@
+import httpx
+import pytest
+
+from app.core.query_budget import QueryLog
+from app.db.models import Post
+from app.db.session import AsyncSessionLocal
+
+pytestmark = pytest.mark.anyio
+
+
+async def post_version(post_id: int) -> int:
+    async with AsyncSessionLocal() as session:
+        return (await session.get(Post, post_id)).version
+
+
+def post_writes(query_counter: QueryLog) -> list:
+    return [s for s in query_counter.statements if s.lstrip().upper().startswith("UPDATE POST ")]
+
+
+async def test_like_and_unlike_do_not_write_the_post_row(
+        auth_client: httpx.AsyncClient, user, make_post, query_counter: QueryLog,
+) -> None:
+    post = await make_post(user_id=user.id)
+
+    query_counter.clear()
+    assert (await auth_client.post(f"/like/{post.id}")).status_code == 200
+    assert (await auth_client.delete(f"/like/{post.id}")).status_code == 200
+
+    assert post_writes(query_counter) == []
+    assert await post_version(post.id) == post.version
+
+
+async def test_likes_change_the_page_etag(auth_client: httpx.AsyncClient, user, make_post) -> None:
+    post = await make_post(user_id=user.id)
+    params = {"limit": 10, "offset": 0}
+    before: str = (await auth_client.get("/posts", params=params)).headers["ETag"]
+
+    await auth_client.post(f"/like/{post.id}")
+    liked = await auth_client.get("/posts", params=params, headers={"If-None-Match": before})
+
+    assert liked.status_code == 200
+    assert liked.json()["data"][0]["likes_count"] == 1
+    assert liked.headers["ETag"] != before
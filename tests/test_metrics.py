@@ -0,0 +1,73 @@
+import subprocess
+import sys
+from pathlib import Path
+from typing import List
+
+import httpx
+import pytest
+
+from app.core.metrics import CallbackMetric, Counter, Histogram, Registry
+from app.core.metrics_multiprocess import MultiprocessMetrics
+from app.db.session import engine
+
+pytestmark = pytest.mark.anyio
+
+
+def make_registry(requests: int, latencies: List[float], idle: int) -> Registry:
+    registry = Registry()
+    counter: Counter = registry.register(Counter("requests_total", "Requests.", ("route",)))
+    histogram: Histogram = registry.register(Histogram("latency_seconds", "Latency.", buckets=(0.1,)))
+    registry.register(CallbackMetric("pool", "Pool.", lambda: iter(((("idle",), idle),)), ("state",)))
+    counter.inc("/posts", amount=requests)
+    for latency in latencies:
+        histogram.observe(latency)
+    return registry
+
+
+def dead_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def test_scrape_sums_the_snapshots_of_live_workers(tmp_path: Path) -> None:
+    other = MultiprocessMetrics(tmp_path, make_registry(2, [0.05], idle=1), pid=1)  # pid 1 is always alive
+    gone = MultiprocessMetrics(tmp_path, make_registry(100, [], idle=100), pid=dead_pid())
+    other.write()
+    gone.write()
+
+    lines = MultiprocessMetrics(tmp_path, make_registry(3, [0.05, 0.5], idle=2)).render().splitlines()
+
+    assert 'requests_total{route="/posts"} 5.0' in lines
+    assert 'latency_seconds_bucket{le="0.1"} 2.0' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 3.0' in lines
+    assert 'latency_seconds_count 3.0' in lines
+    assert 'pool{state="idle"} 3.0' in lines
+    assert lines.count("# TYPE requests_total counter") == 1
+    assert not gone.path.exists()
+
+
+def test_samples_have_no_worker_label(tmp_path: Path) -> None:
+    text = MultiprocessMetrics(tmp_path, make_registry(1, [0.05], idle=1)).render()
+
+    assert "worker=" not in text
+
+
+def test_worker_removes_its_snapshot(tmp_path: Path) -> None:
+    exporter = MultiprocessMetrics(tmp_path, make_registry(1, [], idle=0))
+    exporter.write()
+
+    exporter.remove()
+
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_pool_metrics_follow_the_current_pool(client: httpx.AsyncClient) -> None:
+    # dispose() swaps in a new pool object; the metrics must report that one.
+    await engine.dispose()
+
+    async with engine.connect():
+        response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert 'db_pool_connections{state="checked_out"} 1' in response.text.splitlines()
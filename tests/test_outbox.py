@@ -0,0 +1,116 @@
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import httpx
+import pytest
+from sqlalchemy import select, update
+
+from app.db.models import OutboxEvent
+from app.db.session import AsyncSessionLocal
+from app.outbox import registry
+from app.outbox.events import POST_CREATED, OutboxEventDTO
+from app.outbox.registry import outbox_handler
+from app.outbox.service import OutboxService
+from app.repositories.outbox_repo import OutboxRepository
+
+pytestmark = pytest.mark.anyio
+
+EVENT = "test.event"
+
+
+@pytest.fixture(autouse=True)
+def handlers(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(registry, "_handlers", defaultdict(list))
+
+
+async def stage_event() -> None:
+    async with AsyncSessionLocal() as session:
+        OutboxRepository(session).add_event(EVENT, {"post_id": 1})
+        await session.commit()
+
+
+async def process_batch(max_attempts: int = 3) -> int:
+    async with AsyncSessionLocal() as session:
+        return await OutboxService(
+            session=session, max_attempts=max_attempts, backoff_base=1.0, backoff_max=300.0,
+        ).process_batch(batch_size=10)
+
+
+async def stored_events() -> List[OutboxEvent]:
+    async with AsyncSessionLocal() as session:
+        return list((await session.execute(select(OutboxEvent))).scalars().all())
+
+
+async def make_due() -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(update(OutboxEvent).values(available_at=datetime(2000, 1, 1)))
+        await session.commit()
+
+
+async def test_post_write_commits_its_outbox_row(auth_client: httpx.AsyncClient) -> None:
+    response = await auth_client.post("/post", json={"title": "title", "content": "content"})
+    post_id: int = response.json()["data"]["id"]
+
+    assert [(event.event_type, event.payload["post_id"]) for event in await stored_events()] == [
+        (POST_CREATED, post_id),
+    ]
+
+
+async def test_events_without_handlers_are_staged_then_skipped(db: None) -> None:
+    await stage_event()
+    assert len(await stored_events()) == 1
+
+    assert await process_batch() == 1
+    assert await stored_events() == []
+
+
+async def test_handled_event_is_deleted(db: None) -> None:
+    seen: List[OutboxEventDTO] = []
+
+    @outbox_handler(EVENT)
+    async def handler(event: OutboxEventDTO) -> None:
+        seen.append(event)
+
+    await stage_event()
+
+    assert await process_batch() == 1
+    assert [(event.event_type, event.payload, event.attempts) for event in seen] == [(EVENT, {"post_id": 1}, 0)]
+    assert await stored_events() == []
+
+
+async def test_failed_event_is_retried_with_backoff_then_parked(db: None) -> None:
+    @outbox_handler(EVENT)
+    async def handler(event: OutboxEventDTO) -> None:
+        raise RuntimeError("downstream is down")
+
+    await stage_event()
+    started: datetime = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    assert await process_batch(max_attempts=2) == 1
+    [event] = await stored_events()
+    assert event.attempts == 1
+    assert event.failed_at is None
+    assert "downstream is down" in event.last_error
+    # First retry after backoff_base seconds.
+    assert event.available_at.replace(tzinfo=None) - started >= timedelta(seconds=1)
+
+    # Not due yet.
+    assert await process_batch(max_attempts=2) == 0
+
+    await make_due()
+    assert await process_batch(max_attempts=2) == 1
+    [event] = await stored_events()
+    assert event.attempts == 2
+    assert event.failed_at is not None
+
+    # Parked events are kept but never picked up again.
+    await make_due()
+    assert await process_batch(max_attempts=2) == 0
+
+
+@pytest.mark.parametrize(("attempts", "seconds"), [(1, 1), (2, 2), (3, 4), (4, 8), (5, 10), (20, 10)])
+def test_backoff_doubles_up_to_the_cap(attempts: int, seconds: float) -> None:
+    service = OutboxService(session=None, max_attempts=30, backoff_base=1.0, backoff_max=10.0)
+
+    assert service._backoff(attempts=attempts) == timedelta(seconds=seconds)
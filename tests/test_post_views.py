@@ -0,0 +1,97 @@
+from typing import Dict, Iterator, List
+
+import httpx
+import pytest
+from sqlalchemy import select
+
+from app.core.query_budget import QueryLog
+from app.db.models import Post
+from app.db.session import AsyncSessionLocal
+from app.post import views
+from app.post.post_service import PostService
+from app.post.views import flush_post_views, post_views
+
+pytestmark = [pytest.mark.anyio, pytest.mark.postgres]
+
+
+@pytest.fixture(autouse=True)
+def counter() -> Iterator[None]:
+    post_views.enabled = True
+    post_views.drain()
+    yield
+    post_views.drain()
+
+
+async def stored_views() -> Dict[int, int]:
+    async with AsyncSessionLocal() as session:
+        return dict((await session.execute(select(Post.id, Post.views))).all())
+
+
+async def test_recorded_views_reach_the_post_after_a_flush(client: httpx.AsyncClient, user, make_post) -> None:
+    post = await make_post(user_id=user.id)
+    for _ in range(3):
+        assert (await client.get(f"/post/{post.id}")).status_code == 200
+
+    assert (await stored_views())[post.id] == 0
+    assert await flush_post_views() == 1
+    assert (await stored_views())[post.id] == 3
+    assert await flush_post_views() == 0
+
+
+async def test_failed_flush_keeps_the_deltas(user, make_post, monkeypatch: pytest.MonkeyPatch) -> None:
+    post = await make_post(user_id=user.id)
+    post_views.record(post.id)
+    post_views.record(post.id)
+
+    async def fail(self, deltas: Dict[int, int]) -> None:
+        raise ConnectionError("database is down")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(PostService, "add_views", fail)
+        with pytest.raises(ConnectionError):
+            await flush_post_views()
+
+    post_views.record(post.id)
+    assert await flush_post_views() == 1
+    assert (await stored_views())[post.id] == 3
+
+
+async def test_flush_writes_one_update_per_chunk(
+        user, make_post, query_counter: QueryLog, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(views, "FLUSH_CHUNK_SIZE", 2)
+    posts: List[Post] = [await make_post(user_id=user.id) for _ in range(5)]
+    for views_count, post in enumerate(posts, start=1):
+        for _ in range(views_count):
+            post_views.record(post.id)
+    query_counter.clear()
+
+    assert await flush_post_views() == 5
+
+    assert len([s for s in query_counter.statements if s.startswith("UPDATE post")]) == 3
+    assert await stored_views() == {post.id: views_count for views_count, post in enumerate(posts, start=1)}
+
+
+async def test_failed_chunk_keeps_only_the_unwritten_deltas(
+        user, make_post, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(views, "FLUSH_CHUNK_SIZE", 2)
+    posts: List[Post] = [await make_post(user_id=user.id) for _ in range(4)]
+    for post in posts:
+        post_views.record(post.id)
+    add_views = PostService.add_views
+    calls: List[int] = []
+
+    async def fail_second_chunk(self, deltas: Dict[int, int]) -> None:
+        calls.append(len(deltas))
+        if len(calls) == 2:
+            raise ConnectionError("database is down")
+        await add_views(self, deltas)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(PostService, "add_views", fail_second_chunk)
+        with pytest.raises(ConnectionError):
+            await flush_post_views()
+
+    assert [(await stored_views())[post.id] for post in posts] == [1, 1, 0, 0]
+    assert post_views.drain() == {posts[2].id: 1, posts[3].id: 1}
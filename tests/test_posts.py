@@ -0,0 +1,66 @@
+from typing import List
+
+import httpx
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def top_tags(client: httpx.AsyncClient) -> List[dict]:
+    response: httpx.Response = await client.get("/tags/top")
+    assert response.status_code == 200, response.text
+    return response.json()["data"]
+
+
+async def create_deleted_post(client: httpx.AsyncClient) -> int:
+    created: httpx.Response = await client.post("/post", json={"title": "title", "content": "about #python"})
+    post_id: int = created.json()["data"]["id"]
+    assert (await client.delete(f"/post/{post_id}")).status_code == 204
+    return post_id
+
+
+async def test_deleted_post_cannot_be_updated(auth_client: httpx.AsyncClient) -> None:
+    post_id: int = await create_deleted_post(auth_client)
+
+    response = await auth_client.patch(f"/post/{post_id}", json={"title": "title", "content": "back to #python"})
+
+    assert response.status_code == 404
+    assert await top_tags(auth_client) == []
+
+
+async def test_deleted_post_cannot_be_deleted_again(auth_client: httpx.AsyncClient) -> None:
+    await auth_client.post("/post", json={"title": "other", "content": "also #python"})
+    post_id: int = await create_deleted_post(auth_client)
+
+    response = await auth_client.delete(f"/post/{post_id}")
+
+    assert response.status_code == 404
+    assert [(row["tag"], row["post_count"]) for row in await top_tags(auth_client)] == [("python", 1)]
+
+
+async def test_deleted_post_cannot_be_liked(auth_client: httpx.AsyncClient) -> None:
+    post_id: int = await create_deleted_post(auth_client)
+
+    response = await auth_client.post(f"/like/{post_id}")
+
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("post_id", [0, -1, 2 ** 31])
+async def test_lookup_rejects_ids_out_of_range(client: httpx.AsyncClient, post_id: int) -> None:
+    response = await client.post("/posts/lookup", json={"ids": [1, post_id]})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("post_id", [0, 2 ** 31])
+@pytest.mark.parametrize(
+    ("method", "path"),
+    [("GET", "/post/{}"), ("PATCH", "/post/{}"), ("DELETE", "/post/{}"), ("POST", "/like/{}"), ("DELETE", "/like/{}")],
+)
+async def test_post_id_out_of_range_is_rejected(auth_client: httpx.AsyncClient, method: str, path: str, post_id: int) -> None:
+    json = {"title": "title", "content": "content"} if method == "PATCH" else None
+
+    response = await auth_client.request(method, path.format(post_id), json=json)
+
+    assert response.status_code == 400
@@ -0,0 +1,193 @@
+"""Each route stays within its @query_budget and runs no statement twice (N+1)."""
+import httpx
+import pytest
+
+from app.auth.router import change_token, logout, logout_all, signin, signup
+from app.auth.utils import hash_secret
+from app.core.query_budget import QueryLog
+from app.likes.router import like, unlike
+from app.post.router import delete_post, get_posts, lookup_posts, read_post, update_post, write_post
+from app.tags.router import get_tag_posts, get_top_tags
+
+pytestmark = pytest.mark.anyio
+
+
+def assert_within_budget(query_counter: QueryLog, endpoint) -> None:
+    query_counter.assert_within_budget(endpoint)
+    query_counter.assert_no_duplicates()
+
+
+async def test_signup(client: httpx.AsyncClient, query_counter: QueryLog) -> None:
+    query_counter.clear()
+    response = await client.post("/auth/signup", json={"email": "new@example.com", "password": "secret-1"})
+
+    assert response.status_code == 201, response.text
+    assert_within_budget(query_counter, signup)
+
+
+async def test_signin(client: httpx.AsyncClient, make_user, query_counter: QueryLog) -> None:
+    await make_user("signin@example.com", hash_secret("secret-1"))
+
+    query_counter.clear()
+    response = await client.post("/auth/signin", json={"email": "signin@example.com", "password": "secret-1"})
+
+    assert response.status_code == 200, response.text
+    assert_within_budget(query_counter, signin)
+
+
+async def test_refresh(auth_client: httpx.AsyncClient, query_counter: QueryLog) -> None:
+    query_counter.clear()
+    response = await auth_client.post("/auth/refresh")
+
+    assert response.status_code == 200, response.text
+    assert_within_budget(query_counter, change_token)
+
+
+async def test_logout(auth_client: httpx.AsyncClient, query_counter: QueryLog) -> None:
+    query_counter.clear()
+    response = await auth_client.post("/auth/logout")
+
+    assert response.status_code == 200, response.text
+    assert_within_budget(query_counter, logout)
+
+
+async def test_logout_all(auth_client: httpx.AsyncClient, query_counter: QueryLog) -> None:
+    query_counter.clear()
+    response = await auth_client.post("/auth/logout-all")
+
+    assert response.status_code == 200, response.text
+    assert_within_budget(query_counter, logout_all)
+
+
+async def test_get_posts(client: httpx.AsyncClient, user, make_post, query_counter: QueryLog) -> None:
+    for number in range(5):
+        await make_post(user_id=user.id, title=f"post {number}")
+
+    query_counter.clear()
+    response = await client.get("/posts", params={"limit": 5, "offset": 0})
+
+    assert response.status_code == 200, response.text
+    assert len(response.json()["data"]) == 5
+    assert_within_budget(query_counter, get_posts)
+
+
+async def test_get_posts_not_modified(client: httpx.AsyncClient, user, make_post, query_counter: QueryLog) -> None:
+    await make_post(user_id=user.id)
+    etag: str = (await client.get("/posts", params={"limit": 10, "offset": 0})).headers["ETag"]
+
+    query_counter.clear()
+    response = await client.get("/posts", params={"limit": 10, "offset": 0}, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert_within_budget(query_counter, get_posts)
+
+
+@pytest.mark.postgres
+async def test_read_post(client: httpx.AsyncClient, user, make_post, query_counter: QueryLog) -> None:
+    post = await make_post(user_id=user.id)
+
+    query_counter.clear()
+    response = await client.get(f"/post/{post.id}")
+
+    assert response.status_code == 200, response.text
+    assert_within_budget(query_counter, read_post)
+
+
+@pytest.mark.postgres
+async def test_lookup_posts(client: httpx.AsyncClient, user, make_post, query_counter: QueryLog) -> None:
+    posts = [await make_post(user_id=user.id) for _ in range(3)]
+
+    query_counter.clear()
+    response = await client.post("/posts/lookup", json={"ids": [post.id for post in reversed(posts)]})
+
+    assert response.status_code == 200, response.text
+    assert_within_budget(query_counter, lookup_posts)
+
+
+@pytest.mark.parametrize("idempotency_key", [None, "write-post-1"])
+async def test_write_post(auth_client: httpx.AsyncClient, query_counter: QueryLog, idempotency_key) -> None:
+    headers = {"Idempotency-Key": idempotency_key} if idempotency_key else {}
+
+    query_counter.clear()
+    response = await auth_client.post(
+        "/post",
+        json={"title": "title", "content": "about #python and #sql"},
+        headers=headers,
+    )
+
+    assert response.status_code == 201, response.text
+    assert_within_budget(query_counter, write_post)
+
+
+async def test_update_post(auth_client: httpx.AsyncClient, query_counter: QueryLog) -> None:
+    created = await auth_client.post("/post", json={"title": "title", "content": "about #python and #sql"})
+    post_id: int = created.json()["data"]["id"]
+
+    query_counter.clear()
+    response = await auth_client.patch(
+        f"/post/{post_id}",
+        json={"title": "title", "content": "now about #python and #rust"},
+    )
+
+    assert response.status_code == 200, response.text
+    assert_within_budget(query_counter, update_post)
+
+
+async def test_delete_post(auth_client: httpx.AsyncClient, query_counter: QueryLog) -> None:
+    created = await auth_client.post("/post", json={"title": "title", "content": "about #python"})
+    post_id: int = created.json()["data"]["id"]
+
+    query_counter.clear()
+    response = await auth_client.delete(f"/post/{post_id}")
+
+    assert response.status_code == 204, response.text
+    assert_within_budget(query_counter, delete_post)
+
+
+@pytest.mark.parametrize("idempotency_key", [None, "like-1"])
+async def test_like(auth_client: httpx.AsyncClient, user, make_post, query_counter: QueryLog, idempotency_key) -> None:
+    post = await make_post(user_id=user.id)
+    headers = {"Idempotency-Key": idempotency_key} if idempotency_key else {}
+
+    query_counter.clear()
+    response = await auth_client.post(f"/like/{post.id}", headers=headers)
+
+    assert response.status_code == 200, response.text
+    assert_within_budget(query_counter, like)
+
+
+@pytest.mark.parametrize("idempotency_key", [None, "unlike-1"])
+async def test_unlike(auth_client: httpx.AsyncClient, user, make_post, query_counter: QueryLog, idempotency_key) -> None:
+    post = await make_post(user_id=user.id)
+    await auth_client.post(f"/like/{post.id}")
+    headers = {"Idempotency-Key": idempotency_key} if idempotency_key else {}
+
+    query_counter.clear()
+    response = await auth_client.delete(f"/like/{post.id}", headers=headers)
+
+    assert response.status_code == 200, response.text
+    assert_within_budget(query_counter, unlike)
+
+
+async def test_top_tags(auth_client: httpx.AsyncClient, query_counter: QueryLog) -> None:
+    await auth_client.post("/post", json={"title": "title", "content": "about #python and #sql"})
+
+    query_counter.clear()
+    response = await auth_client.get("/tags/top")
+
+    assert response.status_code == 200, response.text
+    assert [row["tag"] for row in response.json()["data"]] == ["python", "sql"]
+    assert_within_budget(query_counter, get_top_tags)
+
+
+@pytest.mark.postgres
+async def test_tag_posts(auth_client: httpx.AsyncClient, query_counter: QueryLog) -> None:
+    for number in range(3):
+        await auth_client.post("/post", json={"title": f"post {number}", "content": "about #python"})
+
+    query_counter.clear()
+    response = await auth_client.get("/tags/python/posts", params={"limit": 2})
+
+    assert response.status_code == 200, response.text
+    assert len(response.json()["data"]["posts"]) == 2
+    assert_within_budget(query_counter, get_tag_posts)
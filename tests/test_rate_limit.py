@@ -0,0 +1,114 @@
+from typing import Dict, List
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+
+from app.core import rate_limit as rate_limit_module
+from app.core.rate_limit import MemoryRateLimitBackend, Rate, install_rate_limiting, rate_limit
+
+pytestmark = pytest.mark.anyio
+
+# 2 requests per 10 s: a token every 5 s.
+RATE = Rate(limit=2, period=10)
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(rate_limit_module, "monotonic", clock)
+    return clock
+
+
+async def drain(backend: MemoryRateLimitBackend, key: str) -> None:
+    for _ in range(RATE.limit):
+        assert await backend.hit(key, RATE) == 0
+
+
+async def test_allows_a_burst_up_to_the_limit(clock: Clock) -> None:
+    backend = MemoryRateLimitBackend(max_keys=10)
+
+    await drain(backend, "a")
+
+    assert await backend.hit("a", RATE) == pytest.approx(5.0)
+
+
+async def test_retry_after_is_the_time_until_the_next_token(clock: Clock) -> None:
+    backend = MemoryRateLimitBackend(max_keys=10)
+    await drain(backend, "a")
+
+    clock.now += 2.0
+
+    assert await backend.hit("a", RATE) == pytest.approx(3.0)
+
+
+async def test_tokens_refill_over_time(clock: Clock) -> None:
+    backend = MemoryRateLimitBackend(max_keys=10)
+    await drain(backend, "a")
+
+    clock.now += 5.0
+
+    assert await backend.hit("a", RATE) == 0
+    assert await backend.hit("a", RATE) > 0
+
+
+async def test_refill_is_capped_at_the_limit(clock: Clock) -> None:
+    backend = MemoryRateLimitBackend(max_keys=10)
+    await drain(backend, "a")
+
+    clock.now += 3600.0
+
+    await drain(backend, "a")
+    assert await backend.hit("a", RATE) > 0
+
+
+async def test_keys_have_separate_buckets(clock: Clock) -> None:
+    backend = MemoryRateLimitBackend(max_keys=10)
+    await drain(backend, "a")
+
+    assert await backend.hit("b", RATE) == 0
+
+
+async def test_least_recently_used_key_is_evicted(clock: Clock) -> None:
+    backend = MemoryRateLimitBackend(max_keys=2)
+    await drain(backend, "a")
+    await drain(backend, "b")
+    await backend.hit("a", RATE)  # a is now the most recently used
+
+    await backend.hit("c", RATE)
+
+    # a kept its empty bucket; b was evicted and starts again with a full one.
+    assert await backend.hit("a", RATE) > 0
+    assert await backend.hit("b", RATE) == 0
+
+
+async def test_rejected_request_gets_429_with_retry_after(clock: Clock) -> None:
+    calls: List[str] = []
+    app = FastAPI()
+
+    @app.post("/limited", dependencies=[Depends(rate_limit("test:ip", RATE))])
+    async def limited() -> Dict[str, str]:
+        calls.append("called")
+        return {"status": "ok"}
+
+    install_rate_limiting(MemoryRateLimitBackend(max_keys=10))
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            statuses: List[int] = [(await client.post("/limited")).status_code for _ in range(RATE.limit)]
+            clock.now += 1.0
+            rejected: httpx.Response = await client.post("/limited")
+    finally:
+        install_rate_limiting(None)
+
+    assert statuses == [200, 200]
+    assert rejected.status_code == 429
+    assert rejected.headers["Retry-After"] == "4"
+    assert len(calls) == RATE.limit
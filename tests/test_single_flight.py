@@ -0,0 +1,104 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from app.core.deadline import QueryTimeout
+from app.core.single_flight import SingleFlight
+
+pytestmark = pytest.mark.anyio
+
+
+class Loader:
+    """Counts calls; each call waits for `release` and then returns or raises the next outcome."""
+
+    def __init__(self, *outcomes) -> None:
+        self.outcomes: List = list(outcomes)
+        self.calls: int = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        await self.release.wait()
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+async def settle() -> None:
+    """Lets every task reach its await (the leader in fn, the followers on the shared future)."""
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+async def test_concurrent_callers_share_one_load() -> None:
+    group = SingleFlight(name="test")
+    load = Loader("row")
+
+    tasks = [asyncio.create_task(group.do("key", load)) for _ in range(10)]
+    await settle()
+    load.release.set()
+
+    assert await asyncio.gather(*tasks) == ["row"] * 10
+    assert load.calls == 1
+    assert (group.leaders, group.coalesced, group.in_flight) == (1, 9, 0)
+
+
+async def test_follower_loads_again_when_the_leader_is_cancelled() -> None:
+    group = SingleFlight(name="test")
+    load = Loader("first", "second")
+
+    leader = asyncio.create_task(group.do("key", load))
+    await settle()
+    follower = asyncio.create_task(group.do("key", load))
+    await settle()
+
+    leader.cancel()
+    await settle()
+    load.release.set()
+
+    assert await follower == "second"
+    assert leader.cancelled()
+    assert load.calls == 2
+
+
+async def test_followers_get_the_leaders_error() -> None:
+    group = SingleFlight(name="test")
+    load = Loader(ValueError("broken row"))
+
+    tasks = [asyncio.create_task(group.do("key", load)) for _ in range(3)]
+    await settle()
+    load.release.set()
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert [type(result) for result in results] == [ValueError] * 3
+    assert load.calls == 1
+    assert group.in_flight == 0
+
+
+@pytest.mark.parametrize("error", [QueryTimeout(), asyncio.TimeoutError()])
+async def test_followers_do_not_inherit_the_leaders_deadline(error: BaseException) -> None:
+    group = SingleFlight(name="test")
+    load = Loader(error, "own", "own")
+
+    tasks = [asyncio.create_task(group.do("key", load)) for _ in range(3)]
+    await settle()
+    load.release.set()
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert type(results[0]) is type(error)
+    assert results[1:] == ["own", "own"]
+    assert load.calls == 3
+
+
+async def test_keys_are_independent() -> None:
+    group = SingleFlight(name="test")
+    load = Loader("a", "b")
+
+    tasks = [asyncio.create_task(group.do(key, load)) for key in ("a", "b")]
+    await settle()
+    load.release.set()
+
+    assert await asyncio.gather(*tasks) == ["a", "b"]
+    assert load.calls == 2
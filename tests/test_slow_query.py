@@ -0,0 +1,76 @@
+from typing import AsyncIterator
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core.query_budget import SKIP_QUERY_BUDGET
+from app.db.slow_query import REDACTED, SlowQueryRecorder, _explainable
+
+pytestmark = pytest.mark.anyio
+
+
+class Context:
+    def __init__(self, **execution_options) -> None:
+        self.execution_options = execution_options
+
+
+@pytest.fixture
+async def engine() -> AsyncIterator[AsyncEngine]:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.parametrize(
+    ("statement", "expected"),
+    [
+        ("SELECT * FROM post WHERE id = $1", True),
+        ("  select count(*) FROM post_likes", True),
+        ("SELECT * FROM idempotency_keys WHERE key = $1 FOR UPDATE", False),
+        ("SELECT * FROM outbox_events LIMIT $1 FOR UPDATE SKIP LOCKED", False),
+        ("SELECT * FROM post WHERE id = $1 for no key update", False),
+        ("SELECT * FROM post WHERE id = $1 FOR SHARE", False),
+        ("SELECT * FROM post WHERE id = $1 FOR KEY SHARE NOWAIT", False),
+        ("UPDATE post SET views = views + 1", False),
+        ("WITH x AS (DELETE FROM post RETURNING id) SELECT * FROM x", False),
+    ],
+)
+def test_explainable(statement: str, expected: bool) -> None:
+    assert _explainable(statement, Context()) is expected
+
+
+def test_bookkeeping_statements_are_not_explained() -> None:
+    statement = "SELECT set_config('lock_timeout', $1, true)"
+
+    assert _explainable(statement, None)
+    assert not _explainable(statement, Context(**{SKIP_QUERY_BUDGET: True}))
+
+
+@pytest.mark.parametrize(("log_parameters", "expected"), [(False, REDACTED), (True, "('secret@example.com',)")])
+async def test_parameters_are_redacted_unless_enabled(engine: AsyncEngine, log_parameters: bool, expected: str) -> None:
+    recorder = SlowQueryRecorder(
+        engine, threshold_ms=0, explain_sample_rate=0.0, buffer_size=10, log_parameters=log_parameters,
+    )
+    recorder.install()
+
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT :email"), {"email": "secret@example.com"})
+
+    [entry] = recorder.snapshot()
+    assert entry["parameters"] == expected
+
+
+async def test_failed_statement_leaves_nothing_behind(engine: AsyncEngine) -> None:
+    recorder = SlowQueryRecorder(engine, threshold_ms=0, explain_sample_rate=0.0, buffer_size=10)
+    recorder.install()
+
+    async with engine.connect() as connection:
+        with pytest.raises(DBAPIError):
+            await connection.execute(text("SELECT * FROM missing_table"))
+        await connection.execute(text("SELECT 1"))
+        info: dict = dict(connection.sync_connection.info)
+
+    assert [entry["statement"] for entry in recorder.snapshot()] == ["SELECT 1"]
+    assert info == {}
@@ -0,0 +1,80 @@
+import base64
+from typing import List, Optional
+
+import httpx
+import pytest
+
+from app.tags.parsing import MAX_TAG_LENGTH, extract_tags, normalize_tag
+
+pytestmark = pytest.mark.anyio
+
+
+def forge_cursor(raw: str) -> str:
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def test_normalized_tag_fits_the_column() -> None:
+    # "İ".lower() is two code points.
+    tag: str = normalize_tag("#" + "İ" * MAX_TAG_LENGTH)
+
+    assert len(tag) == MAX_TAG_LENGTH
+    assert extract_tags("#" + "İ" * MAX_TAG_LENGTH) == [tag]
+
+
+async def test_post_with_an_expanding_tag_is_indexed(auth_client: httpx.AsyncClient) -> None:
+    response = await auth_client.post("/post", json={"title": "title", "content": "#" + "İ" * MAX_TAG_LENGTH})
+    assert response.status_code == 201, response.text
+
+    response = await auth_client.get("/tags/top")
+
+    assert [len(row["tag"]) for row in response.json()["data"]] == [MAX_TAG_LENGTH]
+
+
+async def test_edit_adding_and_removing_tags_keeps_counts(auth_client: httpx.AsyncClient) -> None:
+    response = await auth_client.post("/post", json={"title": "first", "content": "#python #sql"})
+    post_id: int = response.json()["data"]["id"]
+    await auth_client.post("/post", json={"title": "second", "content": "#sql"})
+
+    response = await auth_client.patch(f"/post/{post_id}", json={"title": "first", "content": "#sql #rust"})
+    assert response.status_code == 200, response.text
+    response = await auth_client.get("/tags/top")
+
+    assert response.json()["data"] == [{"tag": "sql", "post_count": 2}, {"tag": "rust", "post_count": 1}]
+
+
+@pytest.mark.postgres
+async def test_tag_feed_pages_by_keyset(auth_client: httpx.AsyncClient) -> None:
+    created: List[int] = []
+    for number in range(5):
+        response = await auth_client.post("/post", json={"title": f"post {number}", "content": "about #Python"})
+        created.append(response.json()["data"]["id"])
+    await auth_client.post("/post", json={"title": "other", "content": "about #rust"})
+
+    seen: List[int] = []
+    cursor: Optional[str] = None
+    for _ in range(3):
+        params = {"limit": 2} if cursor is None else {"limit": 2, "cursor": cursor}
+        response = await auth_client.get("/tags/%23python/posts", params=params)
+        assert response.status_code == 200, response.text
+        page = response.json()["data"]
+        seen.extend(post["id"] for post in page["posts"])
+        cursor = page["next_cursor"]
+
+    assert seen == created[::-1]
+    assert cursor is None
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    "äöü",
+    forge_cursor("garbage"),
+    forge_cursor("2026-01-01T00:00:00+00:00|1|2"),
+    forge_cursor("2026-01-01T00:00:00+00:00|abc"),
+    forge_cursor("2026-01-01T00:00:00|1"),
+    forge_cursor("2026-01-01T00:00:00+00:00|0"),
+    forge_cursor(f"2026-01-01T00:00:00+00:00|{2 ** 31}"),
+])
+async def test_bad_cursor_is_rejected(auth_client: httpx.AsyncClient, cursor: str) -> None:
+    response = await auth_client.get("/tags/python/posts", params={"cursor": cursor})
+
+    assert response.status_code == 400, response.text
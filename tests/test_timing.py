@@ -0,0 +1,36 @@
+from time import perf_counter
+from typing import AsyncIterator
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core.timing import RequestTimings, _current, install_timing_hooks
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def engine() -> AsyncIterator[AsyncEngine]:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    install_timing_hooks(engine)
+    yield engine
+    await engine.dispose()
+
+
+async def test_failed_statement_is_not_counted_and_leaves_nothing_behind(engine: AsyncEngine) -> None:
+    timings = RequestTimings(started=perf_counter())
+    token = _current.set(timings)
+    try:
+        async with engine.connect() as connection:
+            with pytest.raises(DBAPIError):
+                await connection.execute(text("SELECT * FROM missing_table"))
+            await connection.execute(text("SELECT 1"))
+            info: dict = dict(connection.sync_connection.info)
+    finally:
+        _current.reset(token)
+
+    assert timings.db_queries == 1
+    assert timings.db_seconds > 0
+    assert info == {}